@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import os
 import re
 from datetime import date
+from functools import partial
 import dateparser
 from typing import Any, Text, Dict, List, Optional
 
@@ -40,7 +42,8 @@ try:
     # Initialize the connection pool when the action server starts.
     # minconn=1 ensures at least one connection is ready.
     # maxconn=10 limits the number of concurrent connections.
-    db_pool = pool.SimpleConnectionPool(
+    # ThreadedConnectionPool is safe to share between concurrently running actions.
+    db_pool = pool.ThreadedConnectionPool(
         minconn=1,
         maxconn=10,
         host="db",
@@ -59,6 +62,8 @@ if db_pool:
     # In a real app, schema migrations would be handled by a tool like Alembic.
     # This is for demonstration purposes.
     db_client.initialize_schema()
+    # Load every city's airports up front so city validation doesn't wait on the database.
+    db_client.prewarm_airports()
 
 def _build_summary_sentence(tracker: Tracker) -> str:
     """Builds a natural language summary of the booking details from the tracker."""
@@ -173,9 +178,9 @@ class ActionStorePreference(Action):
         if not db_client.pool:
             dispatcher.utter_message(text="I'm sorry, I'm having trouble accessing my memory right now. Please try again later.")
             return []
-        success = db_client.store_user_preference(user_id, "seat_preference", seat_pref)
-        if success:
-            dispatcher.utter_message(text=f"Great! I've saved your preference for a {seat_pref} seat for future bookings.")
+        stored_pref = db_client.store_user_preference(user_id, "seat_preference", seat_pref)
+        if stored_pref:
+            dispatcher.utter_message(text=f"Great! I've saved your preference for a {stored_pref} seat for future bookings.")
         else:
             dispatcher.utter_message(text="I couldn't save your preference due to a technical issue.")
 
@@ -646,7 +651,7 @@ class ActionSearchFlights(Action):
     def name(self) -> Text:
         return "action_search_flights"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: DomainDict) -> List[Dict[Text, Any]]:
 
@@ -678,10 +683,14 @@ class ActionSearchFlights(Action):
         # --- Retrieve user preference from DB ---
         # This will supplement information not gathered in the current form.
         if db_client.pool:
-            seat_pref = db_client.get_user_preference(user_id, "seat_preference")
+            # Fetch every preference this search can use in a single query, off the event loop like the search itself.
+            saved_prefs = await asyncio.get_running_loop().run_in_executor(
+                None, db_client.get_user_preferences, user_id, ["seat_preference", "preferred_airline"]
+            )
+            seat_pref = saved_prefs.get("seat_preference")
             # If an airline wasn't specified in this conversation, check for a saved one.
             if not preferred_airline:
-                saved_airline = db_client.get_user_preference(user_id, "preferred_airline")
+                saved_airline = saved_prefs.get("preferred_airline")
                 if saved_airline:
                     preferred_airline = saved_airline # Use the saved preference for the API call
                     dispatcher.utter_message(text=f"Just so you know, I'm using your saved preference to search for flights on {saved_airline}.")
@@ -699,8 +708,10 @@ class ActionSearchFlights(Action):
         )
 
         # --- API CALL LOGIC IS NOW IN THE CLIENT ---
+        # The provider call blocks, so run it off the event loop to keep other conversations responsive.
         flight_api = get_api_client()
-        flight_options = flight_api.search(
+        flight_options = await asyncio.get_running_loop().run_in_executor(None, partial(
+            flight_api.search,
             departure_city=dep_city_iata,
             destination_city=dest_city_iata,
             departure_date=dep_date,
@@ -711,7 +722,7 @@ class ActionSearchFlights(Action):
             seat_preference=seat_pref,
             travel_class=tracker.get_slot("travel_class"), # Pass the new slot
             destinations=destinations_iata,
-        )
+        ))
         
         # Handle the case where the API call failed
         if flight_options is None:
@@ -1219,7 +1230,7 @@ class ActionSearchCars(Action):
     def name(self) -> Text:
         return "action_search_cars"
 
-    def run(self, dispatcher: CollectingDispatcher,
+    async def run(self, dispatcher: CollectingDispatcher,
             tracker: Tracker,
             domain: Dict[Text, Any]) -> List[Dict[Text, Any]]:
 
@@ -1233,12 +1244,13 @@ class ActionSearchCars(Action):
         )
 
         car_rental_api = get_car_rental_api_client()
-        car_options = car_rental_api.search(
+        car_options = await asyncio.get_running_loop().run_in_executor(None, partial(
+            car_rental_api.search,
             location=pickup_location,
             pickup_date=pickup_date,
             dropoff_date=dropoff_date,
             car_type=car_type
-        )
+        ))
 
         if car_options is None:
             dispatcher.utter_message(text="I'm sorry, I'm having trouble searching for cars right now. Please try again later.")
@@ -1250,9 +1262,9 @@ class ActionSearchCars(Action):
 
         buttons = []
         for car in car_options:
-            title = f"{car['provider']} {car['model']} - ${car['price_per_day']}/day"
+            title = f"{car.provider} {car.model} - ${car.price_per_day}/day"
             # A real implementation would need a 'select_car' intent and action
-            payload = f"/inform{{\"selected_car_id\": \"{car['id']}\"}}"
+            payload = f"/inform{{\"selected_car_id\": \"{car.id}\"}}"
             buttons.append({"title": title, "payload": payload})
         dispatcher.utter_message(text="Here are some rental cars I found:", buttons=buttons)
 
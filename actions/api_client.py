@@ -1,68 +1,434 @@
 import base64
-import json
 import logging
 import os
+import re
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
+from typing import List, Dict, Any, Callable, Optional, Tuple
 
+import orjson
 import redis
-import dateparser
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
 from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# OAuth access tokens shared by every client instance, keyed by (provider, client_id).
+# Clients are also constructed directly (e.g. by the all-providers client and in tests),
+# so a per-instance token would cost an extra token round-trip for each new client.
+_TOKEN_CACHE: Dict[Tuple[str, Optional[str]], Tuple[str, float]] = {}
+_TOKEN_LOCK = threading.Lock()
+# One lock per token key, held while fetching, so concurrent searches on an expired
+# token wait for a single auth request instead of each sending their own.
+_TOKEN_FETCH_LOCKS: Dict[Tuple[str, Optional[str]], threading.Lock] = {}
+
+
+def _cached_token(token_key: Tuple[str, Optional[str]]) -> Optional[str]:
+    """Returns the cached access token for `token_key`, or None if there is none or it has expired."""
+    with _TOKEN_LOCK:
+        cached_token = _TOKEN_CACHE.get(token_key)
+    if cached_token and time.time() < cached_token[1]:
+        return cached_token[0]
+    return None
+
+
+def _token_fetch_lock(token_key: Tuple[str, Optional[str]]) -> threading.Lock:
+    """Returns the lock that serializes token fetches for `token_key`."""
+    with _TOKEN_LOCK:
+        return _TOKEN_FETCH_LOCKS.setdefault(token_key, threading.Lock())
+
+# Expected number of concurrent searches against a single provider host; sizes the keep-alive pools.
+MAX_SEARCH_WORKERS = 8
+
+# The bot only ever shows a handful of options, so no provider result set is transformed beyond this.
+MAX_RESULTS = 5
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Cached values may use non-string keys (e.g. results indexed by passenger count), which
+# stdlib json coerced to strings but orjson rejects unless told otherwise.
+CACHE_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+@lru_cache(maxsize=None)
+def get_redis_pool(host: str, port: int, db: int) -> redis.ConnectionPool:
+    """
+    Returns the process-wide connection pool for a Redis database.
+    Every RedisCache pointing at the same database borrows sockets from this one pool.
+    """
+    # Add a connection timeout to prevent the action server from hanging.
+    # Values are left as raw bytes: orjson.loads accepts bytes directly, so
+    # letting redis-py decode them to str first would be a wasted pass.
+    return redis.ConnectionPool(
+        host=host, port=port, db=db, max_connections=32, decode_responses=False, socket_connect_timeout=2
+    )
+
+
 class RedisCache:
     """
     A Redis-based cache that mimics the interface of cachetools.TTLCache with robust error handling.
     It handles serialization/deserialization and gracefully degrades if Redis is unavailable.
+
+    Hot entries are also kept in a small in-process near cache so repeated identical
+    lookups from the same process skip the Redis round-trip. Near-cache entries expire
+    after `local_ttl` seconds (never longer than `ttl`), which bounds how stale they can be.
+
+    Empty results are only kept for `negative_ttl` seconds: a search that found nothing is
+    often a transient provider gap, and should not hide new availability for a full TTL.
     """
-    def __init__(self, host='localhost', port=6379, db=0, ttl=60):
+    def __init__(self, host='localhost', port=6379, db=0, ttl=60, local_maxsize=1024, local_ttl=10, negative_ttl=30):
+        self.ttl = ttl
+        self.negative_ttl = min(ttl, negative_ttl)
+        self._local = TTLCache(maxsize=local_maxsize, ttl=min(ttl, local_ttl))
+        self._local_lock = threading.RLock()
         try:
-            # Add a connection timeout to prevent the action server from hanging.
-            self.redis_pool = redis.ConnectionPool(
-                host=host, port=port, db=db, decode_responses=True, socket_connect_timeout=2
-            )
+            self.redis_pool = get_redis_pool(host, port, db)
             self.redis = redis.Redis(connection_pool=self.redis_pool)
-            self.ttl = ttl
             self.redis.ping() # Check connection
-            logger.info(f"Successfully connected to Redis cache at {host}:{port}")
+            logger.info("Successfully connected to Redis cache at %s:%s", host, port)
         except (redis.exceptions.ConnectionError, redis.exceptions.TimeoutError) as e:
-            logger.error(f"Could not connect to Redis at {host}:{port}. Caching will be disabled. Error: {e}")
+            logger.error("Could not connect to Redis at %s:%s. Caching will be disabled. Error: %s", host, port, e)
             self.redis = None
 
+    def _ttl_for(self, value: Any, ttl: Optional[int]) -> int:
+        """Returns the TTL to store `value` with: the negative TTL for empty results, else `ttl` or the cache's own."""
+        ttl = ttl or self.ttl
+        if isinstance(value, (list, dict)) and not value:
+            return min(ttl, self.negative_ttl)
+        return ttl
+
+    def _get_local(self, key: str) -> Any:
+        with self._local_lock:
+            return self._local.get(key)
+
+    def _set_local(self, key: str, value: Any):
+        with self._local_lock:
+            self._local[key] = value
+
     def __contains__(self, key: Any) -> bool:
         if not self.redis: return False
+        if self._get_local(str(key)) is not None:
+            return True
         try:
             return self.redis.exists(str(key))
         except redis.exceptions.RedisError as e:
-            logger.error(f"Redis cache 'exists' check failed. Caching for this request will be skipped. Error: {e}")
+            logger.error("Redis cache 'exists' check failed. Caching for this request will be skipped. Error: %s", e)
             return False
 
     def __getitem__(self, key: Any) -> Any:
         if not self.redis: return None
+        local_value = self._get_local(str(key))
+        if local_value is not None:
+            return local_value
         try:
             cached_value = self.redis.get(str(key))
             if not cached_value:
                 return None
-            return json.loads(cached_value)
-        except json.JSONDecodeError as e:
-            logger.error(f"Failed to decode JSON from Redis cache for key '{key}'. The cache entry may be corrupt. Error: {e}")
+            value = orjson.loads(cached_value)
+            self._set_local(str(key), value)
+            return value
+        except orjson.JSONDecodeError as e:
+            logger.error("Failed to decode JSON from Redis cache for key '%s'. The cache entry may be corrupt. Error: %s", key, e)
+            return None
+        except redis.exceptions.RedisError as e:
+            logger.error("Redis cache 'get' operation failed. Caching for this request will be skipped. Error: %s", e)
+            return None
+
+    def get_and_touch(self, key: Any, ttl: Optional[int] = None) -> Any:
+        """
+        Returns the cached value for `key`, or None on a miss, in a single GETEX round-trip.
+        A hit also resets the entry's TTL (`ttl`, or the cache's own), so frequently
+        searched keys stay cached. Empty results are cut back to the negative TTL.
+        """
+        if not self.redis: return None
+        local_value = self._get_local(str(key))
+        if local_value is not None:
+            return local_value
+        try:
+            cached_value = self.redis.getex(str(key), ex=ttl or self.ttl)
+            if not cached_value:
+                return None
+            value = orjson.loads(cached_value)
+            if not value:
+                self.redis.expire(str(key), self._ttl_for(value, ttl))
+            self._set_local(str(key), value)
+            return value
+        except orjson.JSONDecodeError as e:
+            logger.error("Failed to decode JSON from Redis cache for key '%s'. The cache entry may be corrupt. Error: %s", key, e)
             return None
         except redis.exceptions.RedisError as e:
-            logger.error(f"Redis cache 'get' operation failed. Caching for this request will be skipped. Error: {e}")
+            logger.error("Redis cache 'getex' operation failed. Caching for this request will be skipped. Error: %s", e)
             return None
 
+    def get_many(self, keys: List[Any]) -> List[Any]:
+        """
+        Fetches several keys with a single MGET round-trip.
+        Returns a list aligned with `keys`, holding None for every miss.
+        """
+        if not self.redis: return [None] * len(keys)
+        str_keys = [str(key) for key in keys]
+        results = [self._get_local(key) for key in str_keys]
+        missing = [i for i, value in enumerate(results) if value is None]
+        if not missing:
+            return results
+
+        try:
+            cached_values = self.redis.mget([str_keys[i] for i in missing])
+        except redis.exceptions.RedisError as e:
+            logger.error("Redis cache 'mget' operation failed. Caching for this request will be skipped. Error: %s", e)
+            return results
+
+        for i, cached_value in zip(missing, cached_values):
+            if not cached_value:
+                continue
+            try:
+                value = orjson.loads(cached_value)
+            except orjson.JSONDecodeError as e:
+                logger.error("Failed to decode JSON from Redis cache for key '%s'. The cache entry may be corrupt. Error: %s", str_keys[i], e)
+                continue
+            self._set_local(str_keys[i], value)
+            results[i] = value
+        return results
+
     def __setitem__(self, key: Any, value: Any):
+        self.set(key, value)
+
+    def set(self, key: Any, value: Any, ttl: Optional[int] = None):
+        """
+        Stores `value` under `key` for `ttl` seconds, defaulting to the cache's own TTL.
+        Empty results are stored for the negative TTL at most.
+        """
         if not self.redis: return
         try:
-            serialized_value = json.dumps(value)
-            self.redis.setex(str(key), self.ttl, serialized_value)
+            serialized_value = orjson.dumps(value, option=CACHE_DUMPS_OPTIONS)
+            self.redis.setex(str(key), self._ttl_for(value, ttl), serialized_value)
+            # Keep the same decoded JSON shape a Redis read returns (e.g. dataclasses become dicts),
+            # so callers see identical values whether a hit comes from Redis or the near cache.
+            self._set_local(str(key), orjson.loads(serialized_value))
         except TypeError as e:
-            logger.error(f"Failed to serialize value to JSON for Redis cache key '{key}'. The value will not be cached. Error: {e}")
+            logger.error("Failed to serialize value to JSON for Redis cache key '%s'. The value will not be cached. Error: %s", key, e)
         except redis.exceptions.RedisError as e:
-            logger.error(f"Redis cache 'set' operation failed. The value will not be cached. Error: {e}")
+            logger.error("Redis cache 'set' operation failed. The value will not be cached. Error: %s", e)
+
+
+# Transient provider failures are retried on the pooled connection with exponential backoff.
+# Once retries run out the last response is returned, so raise_for_status still reports it.
+HTTP_RETRY = Retry(
+    total=3,
+    backoff_factor=0.3,
+    status_forcelist=(429, 502, 503, 504),
+    allowed_methods=frozenset({"GET", "POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+_http_adapter: Optional[HTTPAdapter] = None
+_http_adapter_lock = threading.Lock()
+
+def _get_http_adapter() -> HTTPAdapter:
+    """
+    Returns the connection-pooling adapter shared by every client session in this process.
+    Sharing the pool lets every client, flight or otherwise, reuse live keep-alive
+    connections to a provider host instead of opening a fresh TLS session.
+    """
+    global _http_adapter
+    with _http_adapter_lock:
+        if _http_adapter is None:
+            # One pool per provider/auth host; each pool keeps enough sockets for a full fan-out.
+            _http_adapter = HTTPAdapter(
+                pool_connections=16,
+                pool_maxsize=2 * MAX_SEARCH_WORKERS,
+                max_retries=HTTP_RETRY,
+            )
+        return _http_adapter
+
+
+# OAuth token requests run while holding a per-provider fetch lock that other searches queue
+# behind, so they get one short attempt instead of the retrying adapter's backoff.
+TOKEN_REQUEST_TIMEOUT = (3.05, 5)
+
+_token_adapter: Optional[HTTPAdapter] = None
+
+def _get_token_adapter() -> HTTPAdapter:
+    """Returns the shared, non-retrying connection pool used for OAuth token requests."""
+    global _token_adapter
+    with _http_adapter_lock:
+        if _token_adapter is None:
+            # Token fetches are serialized per provider, so a few sockets per auth host suffice.
+            _token_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=0)
+        return _token_adapter
+
+
+def create_http_session(adapter: Optional[HTTPAdapter] = None) -> requests.Session:
+    """
+    Creates a requests.Session backed by the shared keep-alive connection pool, or by `adapter`.
+    Headers stay per session, so provider credentials are never shared between clients.
+    """
+    session = requests.Session()
+    adapter = adapter or _get_http_adapter()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def parse_json_response(response: requests.Response) -> Any:
+    """Decodes a provider response body with orjson, which is far faster than json on large payloads."""
+    try:
+        return orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        # Keep surfacing malformed bodies as a RequestException, as response.json() did.
+        raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into a single call.
+    While one caller is running `fn` for a key, every other caller with that key waits
+    for and receives the same result (or exception) instead of repeating the work.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            future = self._inflight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = self._inflight[key] = Future()
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+
+def _path(*keys: Any) -> Callable[[Any], Any]:
+    """
+    Builds a getter that follows a nested key/index path, e.g. _path("route", 0, "airline").
+    Each step is a C-implemented operator.itemgetter, built once when the spec is defined.
+    """
+    if len(keys) == 1:
+        return itemgetter(keys[0])
+    getters = tuple(itemgetter(key) for key in keys)
+
+    def get(obj: Any) -> Any:
+        for getter in getters:
+            obj = getter(obj)
+        return obj
+    return get
+
+
+_HHMM_RE = re.compile(r"\d\d:\d\d")
+
+def _format_hhmm(timestamp: str) -> str:
+    """
+    Returns the HH:MM part of an ISO-8601 timestamp such as "2024-06-10T08:15:00".
+    Providers send fixed-shape ISO strings, so slicing is enough; anything else
+    falls back to datetime.fromisoformat (with "Z" normalised for Python 3.8).
+    """
+    hhmm = timestamp[11:16]
+    if _HHMM_RE.fullmatch(hhmm):
+        return hhmm
+    if timestamp.endswith("Z"):
+        timestamp = timestamp[:-1] + "+00:00"
+    return datetime.fromisoformat(timestamp).strftime("%H:%M")
+
+
+def _to_day_month_year(iso_date: str) -> str:
+    """Reformats a YYYY-MM-DD date as DD/MM/YYYY without parsing it."""
+    return f"{iso_date[8:10]}/{iso_date[5:7]}/{iso_date[0:4]}"
+
+
+def _to_date_parts(iso_date: str) -> Dict[str, int]:
+    """Splits a YYYY-MM-DD date into the year/month/day object some providers expect."""
+    return {"year": int(iso_date[0:4]), "month": int(iso_date[5:7]), "day": int(iso_date[8:10])}
+
+
+def _hhmm(getter: Callable[[Any], Any]) -> Callable[[Any], str]:
+    """Wraps a timestamp getter so it returns the departure time formatted as HH:MM."""
+    return lambda row: _format_hhmm(getter(row))
+
+
+# While Redis is unreachable, the shared caches try to reconnect at most this often, so
+# searches don't each wait out a connection timeout.
+CACHE_RECONNECT_INTERVAL_SECONDS = 30
+
+_flight_cache: Optional[RedisCache] = None
+_flight_cache_attempted_at = 0.0
+_flight_cache_lock = threading.Lock()
+
+def get_flight_cache() -> RedisCache:
+    """
+    Returns the flight results cache shared by every flight client in this process.
+    Sharing it keeps the bounded near cache warm across client instances and provider
+    switches. The connection is retried every CACHE_RECONNECT_INTERVAL_SECONDS while
+    Redis is unavailable.
+    """
+    global _flight_cache, _flight_cache_attempted_at
+    cache = _flight_cache
+    if cache is not None and cache.redis is not None:
+        return cache
+    with _flight_cache_lock:
+        if _flight_cache is None or (
+            _flight_cache.redis is None
+            and time.monotonic() - _flight_cache_attempted_at >= CACHE_RECONNECT_INTERVAL_SECONDS
+        ):
+            _flight_cache_attempted_at = time.monotonic()
+            # Connection details are pulled from environment variables.
+            _flight_cache = RedisCache(
+                host=os.environ.get("REDIS_HOST", "redis"),
+                port=int(os.environ.get("REDIS_PORT", 6379)),
+                db=int(os.environ.get("REDIS_DB", 1)), # Use a different DB than the tracker store
+                ttl=int(os.environ.get("CACHE_TTL_SECONDS", 60)),
+                negative_ttl=int(os.environ.get("NEGATIVE_CACHE_TTL_SECONDS", 30)),
+            )
+        return _flight_cache
+
+
+# A transform spec maps each field of our standard flight format to a getter on a raw row.
+TransformSpec = Dict[str, Callable[[Any], Any]]
+
+# The fields of our standard flight format, in the order every transform emits them.
+FLIGHT_FIELDS = ("airline", "time", "price", "flight_id")
+
+
+def _compile_transform(spec: TransformSpec) -> Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]:
+    """
+    Compiles a transform spec once into a function that transforms a list of raw provider rows.
+    The getters are bound to locals and each row is built with a fixed dict display, so the
+    per-row work is just the getter calls, with no loop over the spec's fields.
+    """
+    if set(spec) != set(FLIGHT_FIELDS):
+        raise ValueError(f"A transform spec must define exactly the fields {FLIGHT_FIELDS}, got {tuple(spec)}.")
+    airline, time_, price, flight_id = (spec[field] for field in FLIGHT_FIELDS)
+
+    def transform(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [
+            {"airline": airline(row), "time": time_(row), "price": price(row), "flight_id": flight_id(row)}
+            for row in rows
+        ]
+    return transform
+
+# One leg of a multi-leg itinerary: (origin IATA, destination IATA, YYYY-MM-DD departure date).
+Leg = Tuple[str, str, str]
+
 
 class BaseFlightApiClient(ABC):
     """
@@ -70,14 +436,24 @@ class BaseFlightApiClient(ABC):
     Defines the common interface for searching flights.
     """
     def __init__(self):
-        # Initialize a single cache instance for all clients.
-        # Connection details are pulled from environment variables.
-        self.cache = RedisCache(
-            host=os.environ.get("REDIS_HOST", "redis"),
-            port=int(os.environ.get("REDIS_PORT", 6379)),
-            db=int(os.environ.get("REDIS_DB", 1)), # Use a different DB than the tracker store
-            ttl=int(os.environ.get("CACHE_TTL_SECONDS", 60))
-        )
+        # None means the shared process-wide cache; see the `cache` property.
+        self._cache: Optional[RedisCache] = None
+        # A pooled session per client so repeated searches and token refreshes
+        # against the same provider host reuse their connections.
+        self.session = create_http_session()
+
+    @property
+    def cache(self) -> RedisCache:
+        """
+        The results cache, looked up on every use rather than bound once, so a long-lived
+        client starts caching as soon as Redis becomes reachable after it was built.
+        Assigning a cache (e.g. in tests) replaces the shared one for this client.
+        """
+        return self._cache if self._cache is not None else get_flight_cache()
+
+    @cache.setter
+    def cache(self, cache: RedisCache):
+        self._cache = cache
 
     def _get_env_var(self, var_name: str, default: Optional[str] = None) -> Optional[str]:
         """
@@ -85,9 +461,34 @@ class BaseFlightApiClient(ABC):
         """
         value = os.environ.get(var_name, default)
         if value is None:
-            logger.warning(f"Environment variable '{var_name}' not set and no default provided.")
+            logger.warning("Environment variable '%s' not set and no default provided.", var_name)
         return value
 
+    def _cache_key(
+        self,
+        departure_city: str,
+        destination_city: Optional[str],
+        departure_date: str,
+        return_date: Optional[str] = None,
+        passengers: int = 1,
+        travel_class: Optional[str] = None,
+    ) -> str:
+        """
+        Builds a stable cache key from the search criteria that determine a provider's results.
+        The client class name is included so providers sharing a Redis DB never collide.
+        The key is built once as a flat string, so the cache never has to re-stringify it.
+        """
+        return f"{type(self).__name__}|{departure_city}|{destination_city}|{departure_date}|{return_date}|{passengers}|{travel_class}"
+
+    @staticmethod
+    def _json(response: requests.Response) -> Any:
+        """Decodes a provider response body with orjson."""
+        return parse_json_response(response)
+
+    def _post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None, **kwargs: Any) -> requests.Response:
+        """POSTs a JSON payload serialized once by orjson rather than by requests."""
+        return self.session.post(url, data=orjson.dumps(payload), headers={**JSON_HEADERS, **(headers or {})}, **kwargs)
+
     @abstractmethod
     def search(
         self,
@@ -110,6 +511,13 @@ class BaseFlightApiClient(ABC):
         raise NotImplementedError
 
 
+# Canned results served by the mock client, built once at import.
+MOCK_FLIGHT_RESULTS = (
+    {"airline": "AwesomeAirlines", "time": "08:00", "price": 350, "flight_id": "AA123"},
+    {"airline": "FlyHigh", "time": "11:30", "price": 320, "flight_id": "FH456"},
+    {"airline": "SkyJet", "time": "15:00", "price": 380, "flight_id": "SJ789"},
+)
+
 class MockApiClient(BaseFlightApiClient):
     """A mock client that returns static data for development and testing."""
 
@@ -126,25 +534,23 @@ class MockApiClient(BaseFlightApiClient):
         destinations: Optional[List[str]] = None,
         travel_class: Optional[str] = None, # New parameter
     ) -> List[Dict[str, Any]]:
-        logger.info(f"MockApiClient searching with parameters: { {
-            "departure_city": departure_city,
-            "departure_date": departure_date,
-            "destination_city": destination_city,
-            "return_date": return_date,
-            "passengers": passengers,
-            "seat_preference": seat_preference,
-            "preferred_airline": preferred_airline,
-            "frequent_flyer_number": frequent_flyer_number,
-            "destinations": destinations,
-            "travel_class": travel_class,
-        } }")
+        # Only build the parameter dict when it will actually be logged.
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("MockApiClient searching with parameters: %s", {
+                "departure_city": departure_city,
+                "departure_date": departure_date,
+                "destination_city": destination_city,
+                "return_date": return_date,
+                "passengers": passengers,
+                "seat_preference": seat_preference,
+                "preferred_airline": preferred_airline,
+                "frequent_flyer_number": frequent_flyer_number,
+                "destinations": destinations,
+                "travel_class": travel_class,
+            })
         logger.warning("No real API provider configured. Returning mock flight data.")
 
-        return [
-            {"airline": "AwesomeAirlines", "time": "08:00", "price": 350, "flight_id": "AA123"},
-            {"airline": "FlyHigh", "time": "11:30", "price": 320, "flight_id": "FH456"},
-            {"airline": "SkyJet", "time": "15:00", "price": 380, "flight_id": "SJ789"},
-        ]
+        return list(MOCK_FLIGHT_RESULTS)
 
 
 class AmadeusApiClient(BaseFlightApiClient):
@@ -158,8 +564,8 @@ class AmadeusApiClient(BaseFlightApiClient):
         self.client_id = self._get_env_var("AMADEUS_CLIENT_ID")
         self.client_secret = self._get_env_var("AMADEUS_CLIENT_SECRET")
         self.base_url = self._get_env_var("AMADEUS_BASE_URL", "https://test.api.amadeus.com")
-        self._access_token = None
-        self._token_expiry_time = 0
+        self._search_url = f"{self.base_url}/v2/shopping/flight-offers"
+        self._token_session = create_http_session(_get_token_adapter())
 
         if not self.client_id or not self.client_secret:
             logger.warning(
@@ -168,9 +574,17 @@ class AmadeusApiClient(BaseFlightApiClient):
 
     def _get_access_token(self) -> Optional[str]:
         """Fetches a new OAuth2 access token from Amadeus if needed."""
-        if self._access_token and time.time() < self._token_expiry_time:
-            return self._access_token
+        token_key = ("amadeus", self.client_id)
+        access_token = _cached_token(token_key)
+        if access_token:
+            return access_token
 
+        with _token_fetch_lock(token_key):
+            # Another search may have fetched a token while this one waited for the lock.
+            return _cached_token(token_key) or self._fetch_access_token(token_key)
+
+    def _fetch_access_token(self, token_key: Tuple[str, Optional[str]]) -> Optional[str]:
+        """Requests a new access token from Amadeus and caches it until shortly before it expires."""
         auth_url = f"{self.base_url}/v1/security/oauth2/token"
         payload = {
             "grant_type": "client_credentials",
@@ -178,31 +592,31 @@ class AmadeusApiClient(BaseFlightApiClient):
             "client_secret": self.client_secret,
         }
         try:
-            response = requests.post(auth_url, data=payload, timeout=10)
+            response = self._token_session.post(auth_url, data=payload, timeout=TOKEN_REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
-            self._access_token = data["access_token"]
-            self._token_expiry_time = time.time() + data["expires_in"] - 300
+            data = self._json(response)
+            access_token = data["access_token"]
+            with _TOKEN_LOCK:
+                _TOKEN_CACHE[token_key] = (access_token, time.time() + data["expires_in"] - 300)
             logger.info("Successfully retrieved new Amadeus access token.")
-            return self._access_token
+            return access_token
         except RequestException as e:
-            logger.error(f"Failed to get Amadeus access token: {e}")
+            logger.error("Failed to get Amadeus access token: %s", e)
             return None
 
     def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Transforms the complex Amadeus response into the simple format our bot expects."""
-        transformed_results = []
         carriers = response.get("dictionaries", {}).get("carriers", {})
-
-        for offer in response.get("data", []):
-            first_segment = offer["itineraries"][0]["segments"][0]
-            transformed_results.append({
+        return [
+            {
                 "airline": carriers.get(first_segment["carrierCode"], "Unknown Airline"),
-                "time": dateparser.parse(first_segment["departure"]["at"]).strftime("%H:%M"),
+                "time": _format_hhmm(first_segment["departure"]["at"]),
                 "price": float(offer["price"]["total"]),
                 "flight_id": f"{first_segment['carrierCode']}{first_segment['number']}"
-            })
-        return transformed_results
+            }
+            for offer in response.get("data", [])
+            for first_segment in (offer["itineraries"][0]["segments"][0],)
+        ]
 
     def search(
         self,
@@ -235,14 +649,13 @@ class AmadeusApiClient(BaseFlightApiClient):
             "nonStop": "true",
             "currencyCode": "USD",
             "travelClass": travel_class.upper() if travel_class else "ECONOMY",
-            "max": 5,
+            "max": MAX_RESULTS,
         }
         if return_date:
             params["returnDate"] = return_date
 
-        # 2. Create a stable, order-independent cache key from the API parameters.
-        #    A sorted tuple of the dictionary's items is a perfect hashable key.
-        cache_key = tuple(sorted(params.items()))
+        # 2. Build a stable cache key from the search criteria.
+        cache_key = self._cache_key(departure_city, destination_city, departure_date, return_date, passengers, travel_class)
 
         # 3. Check the cache using the new, robust key.
         if cache_key in self.cache:
@@ -253,14 +666,13 @@ class AmadeusApiClient(BaseFlightApiClient):
             "Authorization": f"Bearer {access_token}"
         }
 
-        search_url = f"{self.base_url}/v2/shopping/flight-offers"
-        logger.info(f"Searching Amadeus for flights with params: {params}")
+        logger.info("Searching Amadeus for flights with params: %s", params)
 
         try:
-            response = requests.get(search_url, params=params, headers=headers, timeout=10)
+            response = self.session.get(self._search_url, params=params, headers=headers, timeout=10)
             response.raise_for_status()
-            api_response = response.json()
-            logger.info(f"Successfully received {len(api_response.get('data', []))} flight offers from Amadeus.")
+            api_response = self._json(response)
+            logger.info("Successfully received %s flight offers from Amadeus.", len(api_response.get('data', [])))
 
             # Transform the response and store in the cache
             transformed_response = self._transform_response(api_response)
@@ -268,10 +680,27 @@ class AmadeusApiClient(BaseFlightApiClient):
 
             return transformed_response
         except RequestException as e:
-            logger.error(f"API request failed: {e}")
+            logger.error("API request failed: %s", e)
             return None
 
 
+_duffel_segment = _path("slices", 0, "segments", 0)
+
+def _duffel_flight_id(offer: Dict[str, Any]) -> str:
+    segment = _duffel_segment(offer)
+    return f"{segment['operating_carrier']['iata_code']}{segment['operating_carrier_flight_number']}"
+
+DUFFEL_TRANSFORM_SPEC: TransformSpec = {
+    "airline": _path("slices", 0, "segments", 0, "operating_carrier", "name"),
+    "time": _hhmm(_path("slices", 0, "segments", 0, "departing_at")),
+    "price": lambda offer: float(offer["total_amount"]),
+    "flight_id": _duffel_flight_id,
+}
+_transform_duffel = _compile_transform(DUFFEL_TRANSFORM_SPEC)
+
+
+_DUFFEL_ADULT = {"type": "adult"}
+
 class DuffelApiClient(BaseFlightApiClient):
     """
     A client for the Duffel API.
@@ -281,23 +710,23 @@ class DuffelApiClient(BaseFlightApiClient):
         super().__init__()
         self.api_key = self._get_env_var("DUFFEL_API_KEY")
         self.base_url = self._get_env_var("DUFFEL_BASE_URL", "https://api.duffel.com")
+        self._search_url = f"{self.base_url}/air/offer_requests"
         self.api_version = self._get_env_var("DUFFEL_API_VERSION", "v1")
 
         if not self.api_key:
             logger.warning("Duffel API client is not configured. Please set DUFFEL_API_KEY.")
+        else:
+            # Static auth headers live on the session so they aren't rebuilt per call.
+            self.session.headers.update({
+                "Authorization": f"Bearer {self.api_key}",
+                "Duffel-Version": self.api_version,
+            })
 
     def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Transforms the Duffel response into our standard format."""
-        transformed_results = []
-        for offer in response.get("data", {}).get("offers", []):
-            first_segment = offer["slices"][0]["segments"][0]
-            transformed_results.append({
-                "airline": first_segment["operating_carrier"]["name"],
-                "time": dateparser.parse(first_segment["departing_at"]).strftime("%H:%M"),
-                "price": float(offer["total_amount"]),
-                "flight_id": f"{first_segment['operating_carrier']['iata_code']}{first_segment['operating_carrier_flight_number']}"
-            })
-        return transformed_results
+        # Duffel has no result limit on offer requests, so only the first offers are transformed.
+        offers = response.get("data", {}).get("offers", [])
+        return _transform_duffel(offers[:MAX_RESULTS])
 
     def search(
         self,
@@ -316,68 +745,75 @@ class DuffelApiClient(BaseFlightApiClient):
             logger.error("DUFFEL_API_KEY not set. Cannot search with Duffel.")
             return None
 
-        # 1. Build a dictionary of the core parameters for the cache key.
+        # 1. Build the cache key from the core search criteria.
         #    This is more robust than using the complex final payload.
-        cache_params = {
-            "departure_city": departure_city,
-            "destination_city": destination_city,
-            "departure_date": departure_date,
-            "return_date": return_date,
-            "passengers": passengers,
-            "travel_class": travel_class,
-        }
-        # Filter out None values to ensure consistency
-        cache_params = {k: v for k, v in cache_params.items() if v is not None}
-        cache_key = tuple(sorted(cache_params.items()))
+        cache_key = self._cache_key(departure_city, destination_city, departure_date, return_date, passengers, travel_class)
 
         # 2. Check the cache.
         if cache_key in self.cache:
             logger.info("Returning cached Duffel results.")
             return self.cache[cache_key]
 
-        search_url = f"{self.base_url}/air/offer_requests"
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Duffel-Version": self.api_version,
-        }
-
-        slices = [{
-            "origin": departure_city,
-            "destination": destination_city,
-            "departure_date": departure_date
-        }]
+        legs = [(departure_city, destination_city, departure_date)]
         if return_date:
-            slices.append({
-                "origin": destination_city,
-                "destination": departure_city,
-                "departure_date": return_date,
-            })
+            legs.append((destination_city, departure_city, return_date))
+
+        # 3. Search, then store the transformed response in the cache.
+        transformed_response = self._search_legs(legs, passengers, travel_class)
+        if transformed_response is not None:
+            self.cache[cache_key] = transformed_response
+        return transformed_response
+
+    def _search_legs(
+        self,
+        legs: List[Leg],
+        passengers: int,
+        travel_class: Optional[str],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Sends a single Duffel offer request with one slice per leg."""
+        if not self.api_key:
+            logger.error("DUFFEL_API_KEY not set. Cannot search with Duffel.")
+            return None
 
         payload = {
             "data": {
-                "passengers": [{"type": "adult"} for _ in range(passengers)],
-                "slices": slices,
+                # The payload is only read once when serialized, so every passenger can share one dict.
+                "passengers": [_DUFFEL_ADULT] * passengers,
+                "slices": [
+                    {"origin": origin, "destination": destination, "departure_date": date}
+                    for origin, destination, date in legs
+                ],
                 "cabin_class": travel_class if travel_class else "economy", # Use new parameter
             }
         }
 
-        logger.info(f"Searching Duffel for flights with payload: {payload}")
+        logger.info("Searching Duffel for flights with payload: %s", payload)
         try:
-            response = requests.post(search_url, json=payload, headers=headers, timeout=15)
+            response = self._post_json(self._search_url, payload, timeout=15)
             response.raise_for_status()
-            api_response = response.json()
-            logger.info(f"Successfully received {len(api_response.get('data', {}).get('offers',[]))} flight offers from Duffel.")
-
-            # 3. Transform the response and store in the cache
-            transformed_response = self._transform_response(api_response)
-            self.cache[cache_key] = transformed_response
-
-            return transformed_response
+            api_response = self._json(response)
+            logger.info("Successfully received %s flight offers from Duffel.", len(api_response.get('data', {}).get('offers',[])))
+            return self._transform_response(api_response)
         except RequestException as e:
-            logger.error(f"Duffel API request failed: {e}")
+            logger.error("Duffel API request failed: %s", e)
             return None
 
 
+_kiwi_segment = _path("route", 0)
+
+def _kiwi_flight_id(route: Dict[str, Any]) -> str:
+    segment = _kiwi_segment(route)
+    return f"{segment['airline']}{segment['flight_no']}"
+
+KIWI_TRANSFORM_SPEC: TransformSpec = {
+    "airline": _path("airlines", 0), # Kiwi returns airline codes
+    "time": _hhmm(_path("route", 0, "local_departure")),
+    "price": lambda route: float(route["price"]),
+    "flight_id": _kiwi_flight_id,
+}
+_transform_kiwi = _compile_transform(KIWI_TRANSFORM_SPEC)
+
+
 class KiwiApiClient(BaseFlightApiClient):
     """
     A client for the Kiwi.com (Tequila) API.
@@ -387,23 +823,17 @@ class KiwiApiClient(BaseFlightApiClient):
         super().__init__()
         self.api_key = self._get_env_var("KIWI_API_KEY")
         self.base_url = self._get_env_var("KIWI_BASE_URL", "https://api.tequila.kiwi.com")
+        self._search_url = f"{self.base_url}/v2/search"
         self.partner_id = self._get_env_var("KIWI_PARTNER_ID", "picky")
 
         if not self.api_key:
             logger.warning("Kiwi.com API client is not configured. Please set KIWI_API_KEY.")
+        else:
+            self.session.headers["apikey"] = self.api_key
 
     def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Transforms the Kiwi.com response into our standard format."""
-        transformed_results = []
-        for route in response.get("data", []):
-            first_segment = route["route"][0]
-            transformed_results.append({
-                "airline": route["airlines"][0], # Kiwi returns airline codes
-                "time": dateparser.parse(first_segment["local_departure"]).strftime("%H:%M"),
-                "price": float(route["price"]),
-                "flight_id": f"{first_segment['airline']}{first_segment['flight_no']}"
-            })
-        return transformed_results
+        return _transform_kiwi(response.get("data", []))
 
     def search(
         self,
@@ -422,11 +852,8 @@ class KiwiApiClient(BaseFlightApiClient):
             logger.error("KIWI_API_KEY not set. Cannot search with Kiwi.com.")
             return None
 
-        search_url = f"{self.base_url}/v2/search"
-        headers = {"apikey": self.api_key}
-        
         # Kiwi uses a specific date format
-        parsed_dep_date = dateparser.parse(departure_date).strftime("%d/%m/%Y")
+        parsed_dep_date = _to_day_month_year(departure_date)
 
         params = {
             "fly_from": departure_city,
@@ -435,36 +862,40 @@ class KiwiApiClient(BaseFlightApiClient):
             "date_to": parsed_dep_date,
             "partner": self.partner_id,
             "cabin_class": travel_class if travel_class else "M", # 'M' is Economy for Kiwi
-            "limit": 5,
+            "limit": MAX_RESULTS,
         }
         if return_date:
-            parsed_ret_date = dateparser.parse(return_date).strftime("%d/%m/%Y")
+            parsed_ret_date = _to_day_month_year(return_date)
             params["return_from"] = parsed_ret_date
             params["return_to"] = parsed_ret_date
 
-        # Create a stable cache key from the API parameters.
-        cache_key = tuple(sorted(params.items()))
+        # Create a stable cache key from the search criteria.
+        cache_key = self._cache_key(departure_city, destination_city, departure_date, return_date, passengers, travel_class)
 
         # Check the cache.
         if cache_key in self.cache:
             logger.info("Returning cached Kiwi.com results.")
             return self.cache[cache_key]
 
-        logger.info(f"Searching Kiwi.com for flights with params: {params}")
+        logger.info("Searching Kiwi.com for flights with params: %s", params)
         try:
-            response = requests.get(search_url, params=params, headers=headers, timeout=15)
+            response = self.session.get(self._search_url, params=params, timeout=15)
             response.raise_for_status()
-            api_response = response.json()
-            logger.info(f"Successfully received {len(api_response.get('data', []))} flight offers from Kiwi.com.")
+            api_response = self._json(response)
+            logger.info("Successfully received %s flight offers from Kiwi.com.", len(api_response.get('data', [])))
 
             transformed_response = self._transform_response(api_response)
             self.cache[cache_key] = transformed_response
             return transformed_response
         except RequestException as e:
-            logger.error(f"Kiwi.com API request failed: {e}")
+            logger.error("Kiwi.com API request failed: %s", e)
             return None
 
 
+_sabre_first_segment = _path("AirItinerary", "OriginDestinationOptions", "OriginDestinationOption", 0, "FlightSegment", 0)
+_sabre_total_fare = _path("AirItineraryPricingInfo", "ItinTotalFare", "TotalFare")
+
+
 class SabreApiClient(BaseFlightApiClient):
     """
     A client for the Sabre Bargain Finder Max API.
@@ -475,50 +906,73 @@ class SabreApiClient(BaseFlightApiClient):
         self.client_id = self._get_env_var("SABRE_CLIENT_ID")
         self.client_secret = self._get_env_var("SABRE_CLIENT_SECRET")
         self.base_url = self._get_env_var("SABRE_BASE_URL", "https://api.sabre.com") # Fictional URL
-        self._access_token: Optional[str] = None
-        self._token_expiry_time: float = 0
+        self._search_url = f"{self.base_url}/v4/offers/shop" # Fictional endpoint
+        self._token_session = create_http_session(_get_token_adapter())
+        # Sabre uses a different auth method, typically base64 encoded credentials.
+        # The credentials never change, so the header is encoded once here.
+        self._basic_auth_header = None
         if not self.client_id or not self.client_secret:
             logger.warning("Sabre API client is not configured. Please set SABRE_CLIENT_ID and SABRE_CLIENT_SECRET.")
+        else:
+            encoded_creds = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
+            self._basic_auth_header = f"Basic {encoded_creds}"
 
     def _get_access_token(self) -> Optional[str]:
         """Fetches a new OAuth2 access token from Sabre if needed."""
-        if self._access_token and time.time() < self._token_expiry_time:
-            return self._access_token
+        token_key = ("sabre", self.client_id)
+        access_token = _cached_token(token_key)
+        if access_token:
+            return access_token
 
+        if not self._basic_auth_header:
+            return None
+
+        with _token_fetch_lock(token_key):
+            # Another search may have fetched a token while this one waited for the lock.
+            return _cached_token(token_key) or self._fetch_access_token(token_key)
+
+    def _fetch_access_token(self, token_key: Tuple[str, Optional[str]]) -> Optional[str]:
+        """Requests a new access token from Sabre and caches it until shortly before it expires."""
         # Fictional token endpoint
         auth_url = f"{self.base_url}/v2/auth/token"
-        # Sabre uses a different auth method, typically base64 encoded credentials
-        encoded_creds = base64.b64encode(f"{self.client_id}:{self.client_secret}".encode()).decode()
         headers = {
-            "Authorization": f"Basic {encoded_creds}",
+            "Authorization": self._basic_auth_header,
             "Content-Type": "application/x-www-form-urlencoded",
         }
         payload = {"grant_type": "client_credentials"}
 
         try:
-            response = requests.post(auth_url, headers=headers, data=payload, timeout=10)
+            response = self._token_session.post(auth_url, headers=headers, data=payload, timeout=TOKEN_REQUEST_TIMEOUT)
             response.raise_for_status()
-            data = response.json()
-            self._access_token = data["access_token"]
-            self._token_expiry_time = time.time() + data["expires_in"] - 300
+            data = self._json(response)
+            access_token = data["access_token"]
+            with _TOKEN_LOCK:
+                _TOKEN_CACHE[token_key] = (access_token, time.time() + data["expires_in"] - 300)
             logger.info("Successfully retrieved new Sabre access token.")
-            return self._access_token
+            return access_token
         except RequestException as e:
-            logger.error(f"Failed to get Sabre access token: {e}")
+            logger.error("Failed to get Sabre access token: %s", e)
             return None
 
     def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Transforms the fictional Sabre Bargain Finder Max response."""
         transformed_results = []
         for itinerary in response.get("PricedItineraries", []):
-            air_itinerary = itinerary.get("AirItinerary", {})
-            first_segment = air_itinerary.get("OriginDestinationOptions", {}).get("OriginDestinationOption", [{}])[0].get("FlightSegment", [{}])[0]
-            
+            # Index directly on the happy path instead of chaining .get(..., {}) defaults.
+            try:
+                first_segment = _sabre_first_segment(itinerary)
+                departure_time = first_segment["DepartureDateTime"]
+                total_fare = _sabre_total_fare(itinerary)
+            except (KeyError, IndexError):
+                logger.warning("Skipping Sabre itinerary with missing segment or fare data.")
+                continue
+
+            operating_airline = first_segment.get("OperatingAirline", {})
             transformed_results.append({
-                "airline": first_segment.get("OperatingAirline", {}).get("CompanyShortName", "Unknown Airline"),
-                "time": dateparser.parse(first_segment.get("DepartureDateTime", "")).strftime("%H:%M"),
-                "price": float(itinerary.get("AirItineraryPricingInfo", {}).get("ItinTotalFare", {}).get("TotalFare", {}).get("Amount", 0)),
-                "flight_id": f"{first_segment.get('OperatingAirline', {}).get('Code', 'XX')}{first_segment.get('FlightNumber', '000')}"
+                "airline": operating_airline.get("CompanyShortName", "Unknown Airline"),
+                "time": _format_hhmm(departure_time),
+                "price": float(total_fare.get("Amount", 0)),
+                "flight_id": f"{operating_airline.get('Code', 'XX')}{first_segment.get('FlightNumber', '000')}"
             })
         return transformed_results
 
@@ -535,12 +989,18 @@ class SabreApiClient(BaseFlightApiClient):
         destinations: Optional[List[str]] = None,
         travel_class: Optional[str] = None,
     ) -> Optional[List[Dict[str, Any]]]:
+        # A cache hit needs neither a token nor a request payload, so check it first.
+        cache_key = self._cache_key(departure_city, destination_city, departure_date, return_date, passengers, travel_class)
+
+        if cache_key in self.cache:
+            logger.info("Returning cached Sabre results.")
+            return self.cache[cache_key]
+
         access_token = self._get_access_token()
         if not access_token:
             logger.error("Sabre client not configured or could not get token. Cannot search.")
             return None
 
-        search_url = f"{self.base_url}/v4/offers/shop" # Fictional endpoint
         headers = {"Authorization": f"Bearer {access_token}"}
         
         payload = {
@@ -564,25 +1024,28 @@ class SabreApiClient(BaseFlightApiClient):
                 "DestinationLocation": {"LocationCode": departure_city}
             })
 
-        cache_key = ("sabre", json.dumps(payload, sort_keys=True))
-
-        if cache_key in self.cache:
-            logger.info("Returning cached Sabre results.")
-            return self.cache[cache_key]
-
-        logger.info(f"Searching Sabre for flights with payload: {payload}")
+        logger.info("Searching Sabre for flights with payload: %s", payload)
         try:
-            response = requests.post(search_url, json=payload, headers=headers, timeout=20)
+            response = self._post_json(self._search_url, payload, headers=headers, timeout=20)
             response.raise_for_status()
-            api_response = response.json()
+            api_response = self._json(response)
 
             transformed_response = self._transform_response(api_response)
             self.cache[cache_key] = transformed_response
             return transformed_response
         except RequestException as e:
-            logger.error(f"Sabre API request failed: {e}")
+            logger.error("Sabre API request failed: %s", e)
             return None
 
+AERODATA_TRANSFORM_SPEC: TransformSpec = {
+    "airline": itemgetter("carrier_name"),
+    "time": _hhmm(itemgetter("departure_time_local")),
+    "price": lambda flight: float(flight["price_usd"]),
+    "flight_id": itemgetter("flight_number"),
+}
+_transform_aerodata = _compile_transform(AERODATA_TRANSFORM_SPEC)
+
+
 class AeroDataApiClient(BaseFlightApiClient):
     """
     Example client for a fictional 'AeroData' API.
@@ -592,21 +1055,16 @@ class AeroDataApiClient(BaseFlightApiClient):
         super().__init__()
         self.api_key = self._get_env_var("AERODATA_API_KEY")
         self.base_url = self._get_env_var("AERODATA_BASE_URL", "https://api.aerodata.com")
+        self._search_url = f"{self.base_url}/v1/search"
 
         if not self.api_key:
             logger.warning("AeroData API client is not configured. Please set AERODATA_API_KEY.")
+        else:
+            self.session.headers["X-API-Key"] = self.api_key
 
     def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Transforms the AeroData response into our standard format."""
-        transformed_results = []
-        for flight in response.get("flights", []):
-            transformed_results.append({
-                "airline": flight.get("carrier_name"),
-                "time": dateparser.parse(flight.get("departure_time_local")).strftime("%H:%M"),
-                "price": float(flight.get("price_usd")),
-                "flight_id": flight.get("flight_number")
-            })
-        return transformed_results
+        return _transform_aerodata(response.get("flights", []))
 
     def search(
         self,
@@ -625,24 +1083,38 @@ class AeroDataApiClient(BaseFlightApiClient):
             logger.error("AERODATA_API_KEY not set. Cannot search.")
             return None
 
-        search_url = f"{self.base_url}/v1/search"
-        headers = {"X-API-Key": self.api_key}
+        cache_key = self._cache_key(departure_city, destination_city, departure_date, return_date, passengers, travel_class)
+        if cache_key in self.cache:
+            logger.info("Returning cached AeroData results.")
+            return self.cache[cache_key]
+
         params = {
             "from": departure_city,
             "to": destination_city,
             "date": departure_date,
         }
 
-        logger.info(f"Searching AeroData for flights with params: {params}")
+        logger.info("Searching AeroData for flights with params: %s", params)
         try:
-            response = requests.get(search_url, params=params, headers=headers, timeout=10)
+            response = self.session.get(self._search_url, params=params, timeout=10)
             response.raise_for_status()
-            return self._transform_response(response.json())
+            transformed_response = self._transform_response(self._json(response))
+            self.cache[cache_key] = transformed_response
+            return transformed_response
         except RequestException as e:
-            logger.error(f"AeroData API request failed: {e}")
+            logger.error("AeroData API request failed: %s", e)
             return None
 
 
+FLIGHTSTATS_TRANSFORM_SPEC: TransformSpec = {
+    "airline": itemgetter("carrierFsCode"),
+    "time": _hhmm(itemgetter("departureTime")),
+    "price": lambda flight: 150.00, # Fictional price
+    "flight_id": lambda flight: f"{flight['carrierFsCode']}{flight['flightNumber']}",
+}
+_transform_flightstats = _compile_transform(FLIGHTSTATS_TRANSFORM_SPEC)
+
+
 class FlightStatsApiClient(BaseFlightApiClient):
     """
     Client for the fictional 'FlightStats' API.
@@ -653,6 +1125,9 @@ class FlightStatsApiClient(BaseFlightApiClient):
         # Use the helper method from the base class to safely get API keys
         self.api_key = self._get_env_var("FLIGHTSTATS_API_KEY")
         self.base_url = self._get_env_var("FLIGHTSTATS_BASE_URL", "https://api.flightstats.com")
+        # This is a fictional but plausible endpoint structure for demonstration.
+        # The actual FlightStats API might have a different structure.
+        self._search_url = f"{self.base_url}/v1/schedules/search"
 
         if not self.api_key:
             logger.warning("FlightStats API client is not configured. Please set FLIGHTSTATS_API_KEY.")
@@ -663,15 +1138,7 @@ class FlightStatsApiClient(BaseFlightApiClient):
         # response structure of the FlightStats API into the format your
         # bot expects: a list of dictionaries with 'airline', 'time', 'price', 'flight_id'.
         # This is a crucial step for each new API provider.
-        transformed_results = []
-        for flight in response.get("scheduledFlights", []):
-             transformed_results.append({
-                "airline": flight.get("carrierFsCode"),
-                "time": dateparser.parse(flight.get("departureTime")).strftime("%H:%M"),
-                "price": 150.00, # Fictional price
-                "flight_id": f"{flight.get('carrierFsCode')}{flight.get('flightNumber')}"
-            })
-        return transformed_results
+        return _transform_flightstats(response.get("scheduledFlights", []))
 
     def search(
         self,
@@ -690,10 +1157,6 @@ class FlightStatsApiClient(BaseFlightApiClient):
             logger.error("FLIGHTSTATS_API_KEY not set. Cannot search.")
             return None
 
-        # This is a fictional but plausible endpoint structure for demonstration.
-        # The actual FlightStats API might have a different structure.
-        search_url = f"{self.base_url}/v1/schedules/search"
-
         # Construct parameters for the API call, including the API key
         params = {
             "apiKey": self.api_key,
@@ -706,28 +1169,44 @@ class FlightStatsApiClient(BaseFlightApiClient):
         if return_date:
             params["returnDate"] = return_date
 
-        # Create a stable cache key from the API parameters.
-        cache_key = tuple(sorted(params.items()))
+        # Create a stable cache key from the search criteria.
+        cache_key = self._cache_key(departure_city, destination_city, departure_date, return_date, passengers, travel_class)
 
         # Check the cache.
         if cache_key in self.cache:
             logger.info("Returning cached FlightStats results.")
             return self.cache[cache_key]
 
-        logger.info(f"Searching FlightStats for flights with params: {params}")
+        logger.info("Searching FlightStats for flights with params: %s", params)
         try:
-            response = requests.get(search_url, params=params, timeout=15)
+            response = self.session.get(self._search_url, params=params, timeout=15)
             response.raise_for_status()
-            api_response = response.json()
+            api_response = self._json(response)
 
             transformed_response = self._transform_response(api_response)
             self.cache[cache_key] = transformed_response
             return transformed_response
         except RequestException as e:
-            logger.error(f"FlightStats API request failed: {e}")
+            logger.error("FlightStats API request failed: %s", e)
             return None
 
 
+# Shared read-only fallback for optional nested objects, so lookups don't allocate a dict each time.
+_EMPTY: Dict[str, Any] = {}
+
+_skyscanner_leg = _path("legs", 0)
+
+SKYSCANNER_TRANSFORM_SPEC: TransformSpec = {
+    "airline": lambda itinerary: (_skyscanner_leg(itinerary).get("operatingCarrier") or _EMPTY).get("name", "Unknown Airline"),
+    "time": _hhmm(_path("legs", 0, "departure")),
+    "price": lambda itinerary: float((itinerary["pricingOptions"][0].get("price") or _EMPTY).get("amount", 0)),
+    "flight_id": lambda itinerary: _skyscanner_leg(itinerary).get("id", "SK-UNKNOWN"),
+}
+_transform_skyscanner = _compile_transform(SKYSCANNER_TRANSFORM_SPEC)
+
+# The parts of a Skyscanner query that never change between searches.
+SKYSCANNER_QUERY_DEFAULTS = {"market": "US", "locale": "en-US", "currency": "USD"}
+
 class SkyscannerApiClient(BaseFlightApiClient):
     """
     A client for the Skyscanner API.
@@ -737,25 +1216,23 @@ class SkyscannerApiClient(BaseFlightApiClient):
         super().__init__()
         self.api_key = self._get_env_var("SKYSCRANNER_API_KEY")
         self.base_url = self._get_env_var("SKYSCRANNER_BASE_URL", "https://partners.api.skyscanner.net")
+        self._search_url = f"{self.base_url}/apiservices/v3/flights/live/search/create"
 
         if not self.api_key:
             logger.warning("Skyscanner API client is not configured. Please set SKYSCRANNER_API_KEY.")
+        else:
+            self.session.headers["x-api-key"] = self.api_key
 
     def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Transforms the Skyscanner response into our standard format."""
-        transformed_results = []
         # This structure is fictional and needs to be adapted to the real Skyscanner API response
+        itineraries = []
         for itinerary in response.get("itineraries", []):
-            pricing_option = itinerary.get("pricingOptions", [{}])[0]
-            first_leg = itinerary.get("legs", [{}])[0]
-            
-            transformed_results.append({
-                "airline": first_leg.get("operatingCarrier", {}).get("name", "Unknown Airline"),
-                "time": dateparser.parse(first_leg.get("departure", "")).strftime("%H:%M"),
-                "price": float(pricing_option.get("price", {}).get("amount", 0)),
-                "flight_id": first_leg.get("id", "SK-UNKNOWN")
-            })
-        return transformed_results
+            if itinerary.get("legs") and itinerary.get("pricingOptions"):
+                itineraries.append(itinerary)
+            else:
+                logger.warning("Skipping Skyscanner itinerary with no legs or pricing options.")
+        return _transform_skyscanner(itineraries)
 
     def search(
         self,
@@ -774,36 +1251,123 @@ class SkyscannerApiClient(BaseFlightApiClient):
             logger.error("SKYSCRANNER_API_KEY not set. Cannot search.")
             return None
 
-        search_url = f"{self.base_url}/apiservices/v3/flights/live/search/create"
-        headers = {"x-api-key": self.api_key}
+        cache_key = self._cache_key(departure_city, destination_city, departure_date, return_date, passengers, travel_class)
+        if cache_key in self.cache:
+            logger.info("Returning cached Skyscanner results.")
+            return self.cache[cache_key]
+
+        transformed_response = self._search_legs([(departure_city, destination_city, departure_date)], passengers, travel_class)
+        if transformed_response is not None:
+            self.cache[cache_key] = transformed_response
+        return transformed_response
+
+    def _search_legs(
+        self,
+        legs: List[Leg],
+        passengers: int,
+        travel_class: Optional[str],
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Sends a single Skyscanner live search with one query leg per leg."""
+        if not self.api_key:
+            logger.error("SKYSCRANNER_API_KEY not set. Cannot search.")
+            return None
 
         # Skyscanner API requires a specific payload structure
         payload = {
             "query": {
-                "market": "US",
-                "locale": "en-US",
-                "currency": "USD",
+                **SKYSCANNER_QUERY_DEFAULTS,
                 "queryLegs": [
                     {
-                        "originPlaceId": {"iata": departure_city},
-                        "destinationPlaceId": {"iata": destination_city},
-                        "date": {"year": int(departure_date[:4]), "month": int(departure_date[5:7]), "day": int(departure_date[8:10])}
+                        "originPlaceId": {"iata": origin},
+                        "destinationPlaceId": {"iata": destination},
+                        "date": _to_date_parts(date)
                     }
+                    for origin, destination, date in legs
                 ],
                 "adults": passengers,
                 "cabinClass": travel_class if travel_class else "CABIN_CLASS_ECONOMY"
             }
         }
 
-        logger.info(f"Searching Skyscanner for flights with payload: {payload}")
+        logger.info("Searching Skyscanner for flights with payload: %s", payload)
         try:
-            response = requests.post(search_url, json=payload, headers=headers, timeout=20)
+            response = self._post_json(self._search_url, payload, timeout=20)
             response.raise_for_status()
-            api_response = response.json()
-            return self._transform_response(api_response)
+            return self._transform_response(self._json(response))
         except RequestException as e:
-            logger.error(f"Skyscanner API request failed: {e}")
+            logger.error("Skyscanner API request failed: %s", e)
+            return None
+
+class AllProvidersFlightApiClient(BaseFlightApiClient):
+    """
+    Searches every configured flight provider concurrently and merges their results,
+    so a search takes as long as the slowest provider rather than the sum of all of them.
+    """
+    # (client class, environment variables that must all be set for it to be searched)
+    PROVIDERS = (
+        (AeroDataApiClient, ("AERODATA_API_KEY",)),
+        (SabreApiClient, ("SABRE_CLIENT_ID", "SABRE_CLIENT_SECRET")),
+        (SkyscannerApiClient, ("SKYSCRANNER_API_KEY",)),
+    )
+
+    def __init__(self):
+        super().__init__()
+        # Unconfigured providers are never built, so they don't log their own setup warnings.
+        self.clients = [
+            provider() for provider, env_vars in self.PROVIDERS
+            if all(os.environ.get(env_var) for env_var in env_vars)
+        ]
+        if not self.clients:
+            logger.warning("No flight providers are configured. Please set at least one provider API key.")
+
+    def search(
+        self,
+        departure_city: str,
+        departure_date: str,
+        destination_city: Optional[str] = None,
+        return_date: Optional[str] = None,
+        passengers: int = 1,
+        seat_preference: Optional[str] = None,
+        preferred_airline: Optional[str] = None,
+        frequent_flyer_number: Optional[str] = None,
+        destinations: Optional[List[str]] = None,
+        travel_class: Optional[str] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        if not self.clients:
+            logger.error("No flight providers are configured. Cannot search.")
+            return None
+
+        # Each provider client caches its own results, so the merged list isn't cached again here.
+        with ThreadPoolExecutor(max_workers=len(self.clients)) as executor:
+            futures = [
+                executor.submit(
+                    client.search,
+                    departure_city=departure_city,
+                    departure_date=departure_date,
+                    destination_city=destination_city,
+                    return_date=return_date,
+                    passengers=passengers,
+                    seat_preference=seat_preference,
+                    preferred_airline=preferred_airline,
+                    frequent_flyer_number=frequent_flyer_number,
+                    destinations=destinations,
+                    travel_class=travel_class,
+                )
+                for client in self.clients
+            ]
+        results = []
+        for client, future in zip(self.clients, futures):
+            try:
+                results.append(future.result())
+            except Exception:
+                # e.g. a transform hitting an unexpected response shape; the other providers still count.
+                logger.exception("%s flight search failed.", type(client).__name__)
+
+        # A provider that failed is left out; the search only fails if every provider did.
+        successful_results = [result for result in results if result is not None]
+        if not successful_results:
             return None
+        return [flight for result in successful_results for flight in result]
 
 API_CLIENTS = {
     "amadeus": AmadeusApiClient,
@@ -813,24 +1377,30 @@ API_CLIENTS = {
     "aerodata": AeroDataApiClient, # Register the new client here
     "flightstats": FlightStatsApiClient,
     "skyscanner": SkyscannerApiClient,
+    "all": AllProvidersFlightApiClient,
     "mock": MockApiClient,
 }
 
+@lru_cache(maxsize=None)
 def get_api_client() -> BaseFlightApiClient:
     """
     Factory function to get the appropriate API client based on environment configuration.
     This is the single entry point for actions to get a flight client.
+    The client is built once per process and shared by every action, so its session,
+    connection pool and caches stay warm. Call get_api_client.cache_clear() after
+    changing FLIGHT_API_PROVIDER.
     """
     provider = os.environ.get("FLIGHT_API_PROVIDER", "mock").lower()
     client_class = API_CLIENTS.get(provider)
 
     if client_class:
-        logger.info(f"Using {provider.capitalize()} API client.")
+        logger.info("Using %s API client.", provider.capitalize())
         return client_class()
 
     # If the provider is not in our dictionary, log a warning and default to Mock.
     logger.warning(
-        f"Unknown FLIGHT_API_PROVIDER '{provider}'. "
-        "Defaulting to Mock API client."
+        "Unknown FLIGHT_API_PROVIDER '%s'. "
+        "Defaulting to Mock API client.",
+        provider,
     )
     return MockApiClient()
\ No newline at end of file
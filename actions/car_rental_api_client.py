@@ -1,35 +1,159 @@
+import hashlib
 import logging
 import os
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-import requests
-from requests.exceptions import RequestException
+import orjson
+from requests.exceptions import HTTPError, RequestException
 
-# Reuse the robust RedisCache from the flight API client
-from .api_client import RedisCache
+# Reuse the robust RedisCache and pooled HTTP sessions from the flight API client
+from .api_client import CACHE_RECONNECT_INTERVAL_SECONDS, RedisCache, SingleFlight, create_http_session, parse_json_response
 
 logger = logging.getLogger(__name__)
 
+# (connect, read) timeouts for provider searches. An unreachable provider fails fast on connect
+# instead of holding a fan-out worker for the full read timeout.
+CAR_SEARCH_TIMEOUT = (3.05, 15)
+
+# A provider that fails is skipped for this long, doubling on every failed retry up to the maximum.
+BREAKER_BASE_BACKOFF_SECONDS = 5.0
+BREAKER_MAX_BACKOFF_SECONDS = 60.0
+
+@dataclass(frozen=True)
+class CarOffer:
+    """A rental car offer in the standard format every provider's response is transformed into."""
+    __slots__ = ("provider", "model", "price_per_day", "id")
+
+    provider: str
+    model: str
+    price_per_day: float
+    id: str
+
+
+def _to_offers(cached_offers: List[Dict[str, Any]]) -> List[CarOffer]:
+    """Rebuilds CarOffer objects from their cached JSON form."""
+    return [CarOffer(**offer) for offer in cached_offers]
+
+
+def _make_cache_key(provider: str, search_values: Tuple[Optional[str], ...]) -> str:
+    """
+    Builds a short, provider-namespaced cache key from the positional search values.
+    Each provider passes its values in a fixed order, so they are hashed as-is and the key length is fixed.
+    """
+    digest = hashlib.blake2b(orjson.dumps(search_values), digest_size=16).hexdigest()
+    return f"car:{provider}:{digest}"
+
+
+_car_cache: Optional[RedisCache] = None
+_car_cache_attempted_at = 0.0
+_car_cache_lock = threading.Lock()
+
+def get_car_cache() -> RedisCache:
+    """
+    Returns the car rental results cache shared by every car rental client in this process.
+    The connection is retried every CACHE_RECONNECT_INTERVAL_SECONDS while Redis is unavailable.
+    """
+    global _car_cache, _car_cache_attempted_at
+    cache = _car_cache
+    if cache is not None and cache.redis is not None:
+        return cache
+    with _car_cache_lock:
+        if _car_cache is None or (
+            _car_cache.redis is None
+            and time.monotonic() - _car_cache_attempted_at >= CACHE_RECONNECT_INTERVAL_SECONDS
+        ):
+            _car_cache_attempted_at = time.monotonic()
+            # We use a different database (db=2) to keep car and flight caches separate.
+            _car_cache = RedisCache(
+                host=os.environ.get("REDIS_HOST", "redis"),
+                port=int(os.environ.get("REDIS_PORT", 6379)),
+                db=int(os.environ.get("REDIS_DB_CAR", 2)),
+                ttl=int(os.environ.get("CACHE_TTL_SECONDS", 120)),
+                negative_ttl=int(os.environ.get("NEGATIVE_CACHE_TTL_SECONDS", 30)),
+            )
+        return _car_cache
+
 
 class BaseCarRentalApiClient(ABC):
     """
     Abstract base class for all car rental API clients.
     """
+    # Per-provider circuit breakers shared by every client instance: key -> (retry after, current backoff).
+    # A provider without an entry is healthy (closed). Until the retry time the breaker is open; after it,
+    # the breaker is half-open and lets a single probe search through, see _breaker_allows.
+    _breakers: Dict[str, Tuple[float, float]] = {}
+    _breakers_lock = threading.Lock()
+
     def __init__(self):
-        # Reuse the same Redis cache instance logic as the flight clients
-        # We use a different database (db=2) to keep car and flight caches separate.
-        self.cache = RedisCache(
-            host=os.environ.get("REDIS_HOST", "redis"),
-            port=int(os.environ.get("REDIS_PORT", 6379)),
-            db=int(os.environ.get("REDIS_DB_CAR", 2)),
-            ttl=int(os.environ.get("CACHE_TTL_SECONDS", 120))
-        )
+        # None means the shared process-wide cache; see the `cache` property.
+        self._cache: Optional[RedisCache] = None
+        # Pooled, retrying session shared with the flight clients' connection pool.
+        self.session = create_http_session()
+
+    @property
+    def cache(self) -> RedisCache:
+        """
+        The results cache, looked up on every use rather than bound once, so a long-lived
+        client starts caching as soon as Redis becomes reachable after it was built.
+        Assigning a cache (e.g. in tests) replaces the shared one for this client.
+        """
+        return self._cache if self._cache is not None else get_car_cache()
+
+    @cache.setter
+    def cache(self, cache: RedisCache):
+        self._cache = cache
 
     def _get_env_var(self, var_name: str, default: Optional[str] = None) -> Optional[str]:
         """Helper function to get an environment variable."""
         return os.environ.get(var_name, default)
 
+    def _breaker_allows(self, key: str) -> bool:
+        """
+        Returns True if a search may be sent to the provider `key`.
+        Once an open breaker's retry time passes, exactly one caller is let through as a probe:
+        the retry time is pushed back by the current backoff, so every other search keeps being
+        skipped until the probe closes the breaker or fails and reopens it with a longer backoff.
+        """
+        if key not in self._breakers:
+            return True
+        with self._breakers_lock:
+            state = self._breakers.get(key)
+            if state is None:
+                return True
+            retry_after, backoff = state
+            now = time.monotonic()
+            if now < retry_after:
+                return False
+            self._breakers[key] = (now + backoff, backoff)
+            return True
+
+    def _record_failure(self, key: str):
+        """Opens the provider's breaker, doubling its backoff if it was already failing."""
+        with self._breakers_lock:
+            state = self._breakers.get(key)
+            backoff = min(state[1] * 2, BREAKER_MAX_BACKOFF_SECONDS) if state else BREAKER_BASE_BACKOFF_SECONDS
+            self._breakers[key] = (time.monotonic() + backoff, backoff)
+        logger.warning("Car rental provider '%s' is failing. Skipping it for %.0f seconds.", key, backoff)
+
+    def _record_success(self, key: str):
+        """Closes the provider's breaker after a successful call."""
+        if key in self._breakers:
+            with self._breakers_lock:
+                self._breakers.pop(key, None)
+
+    def _get_cache_ttl(self, var_name: str) -> int:
+        """
+        Returns the provider-specific cache TTL from `var_name`, falling back to the shared cache TTL.
+        Providers whose availability changes slowly can keep results for longer.
+        """
+        return int(self._get_env_var(var_name) or self.cache.ttl)
+
     @abstractmethod
     def search(
         self,
@@ -37,7 +161,7 @@ class BaseCarRentalApiClient(ABC):
         pickup_date: str,
         dropoff_date: str,
         car_type: str
-    ) -> Optional[List[Dict[str, Any]]]:
+    ) -> Optional[List[CarOffer]]:
         """
         Searches for rental cars based on the provided criteria.
         Must be implemented by all concrete subclasses.
@@ -54,39 +178,109 @@ class MockCarRentalApiClient(BaseCarRentalApiClient):
         pickup_date: str,
         dropoff_date: str,
         car_type: str
-    ) -> List[Dict[str, Any]]:
+    ) -> List[CarOffer]:
         logger.warning("No real car rental API provider configured. Returning mock car data.")
         return [
-            {"provider": "Hertz", "model": "Toyota Camry", "price_per_day": 55, "id": "HERTZ001"},
-            {"provider": "Avis", "model": "Ford Explorer", "price_per_day": 75, "id": "AVIS002"},
-            {"provider": "Enterprise", "model": "Nissan Versa", "price_per_day": 48, "id": "ENT003"},
+            CarOffer("Hertz", "Toyota Camry", 55, "HERTZ001"),
+            CarOffer("Avis", "Ford Explorer", 75, "AVIS002"),
+            CarOffer("Enterprise", "Nissan Versa", 48, "ENT003"),
         ]
 
 
-class HertzApiClient(BaseCarRentalApiClient):
+@dataclass(frozen=True)
+class ProviderSpec:
     """
-    A fictional client for a Hertz Car Rental API.
-    Requires HERTZ_API_KEY environment variable.
+    Everything that differs between the template-driven car rental providers.
+    Environment variables are derived from `key`, e.g. HERTZ_API_KEY, HERTZ_BASE_URL and HERTZ_CACHE_TTL.
     """
-    def __init__(self):
+    key: str
+    name: str
+    default_base_url: str
+    path: str
+    auth_header: str
+    # Query parameter names, in the order of (location, pickup_date, dropoff_date, car_type).
+    param_keys: Tuple[str, str, str, str]
+    # Key of the list of offers in the provider's response.
+    response_key: str
+    to_offer: Callable[[Dict[str, Any]], CarOffer]
+    auth_format: str = "{}"
+    uppercase_car_type: bool = False
+
+
+HERTZ_SPEC = ProviderSpec(
+    key="hertz",
+    name="Hertz",
+    default_base_url="https://api.hertz.com",
+    path="/v1/vehicles/search",
+    auth_header="Authorization",
+    auth_format="Bearer {}",
+    param_keys=("pickup_location", "pickup_date", "dropoff_date", "vehicle_class"),
+    response_key="available_vehicles",
+    to_offer=lambda car: CarOffer("Hertz", car.get("vehicle_name"), float(car.get("daily_rate_usd")), car.get("vehicle_id")),
+)
+
+AVIS_SPEC = ProviderSpec(
+    key="avis",
+    name="Avis",
+    default_base_url="https://api.avis.com",
+    path="/rentals/v2/search",
+    auth_header="X-Api-Key", # Avis might use a different auth header
+    param_keys=("pickup_loc", "start_date", "end_date", "category"),
+    response_key="cars",
+    to_offer=lambda car: CarOffer("Avis", car.get("car_model"), float(car.get("rate")), car.get("rental_id")),
+)
+
+def _enterprise_offer(option: Dict[str, Any]) -> CarOffer:
+    """Builds an offer from an Enterprise rental option, whose vehicle and price are nested."""
+    vehicle_info = option.get("vehicle_info", {})
+    return CarOffer(
+        "Enterprise",
+        f"{vehicle_info.get('make')} {vehicle_info.get('model')}",
+        float(option.get("cost", {}).get("per_day")),
+        option.get("option_id"),
+    )
+
+ENTERPRISE_SPEC = ProviderSpec(
+    key="enterprise",
+    name="Enterprise",
+    default_base_url="https://api.ehi.com",
+    path="/v1/cars/availability",
+    auth_header="Api-Token", # Enterprise might use a different auth header
+    param_keys=("location_code", "pickup", "dropoff", "car_group"),
+    response_key="rental_options",
+    to_offer=_enterprise_offer,
+    uppercase_car_type=True,
+)
+
+
+class TemplateCarApiClient(BaseCarRentalApiClient):
+    """
+    A car rental client driven entirely by a ProviderSpec.
+    Providers whose APIs are a keyed GET search returning a list of offers only need a spec.
+    """
+    SPEC: ProviderSpec
+    # Identical searches that miss the cache at the same time share one provider request.
+    _inflight = SingleFlight()
+
+    def __init__(self, spec: Optional[ProviderSpec] = None):
         super().__init__()
-        self.api_key = self._get_env_var("HERTZ_API_KEY")
-        self.base_url = self._get_env_var("HERTZ_BASE_URL", "https://api.hertz.com")
+        self.spec = spec or self.SPEC
+        env_prefix = self.spec.key.upper()
+        self._api_key_var = f"{env_prefix}_API_KEY"
+        self.api_key = self._get_env_var(self._api_key_var)
+        self.cache_ttl = self._get_cache_ttl(f"{env_prefix}_CACHE_TTL")
+        self.base_url = self._get_env_var(f"{env_prefix}_BASE_URL", self.spec.default_base_url)
+        self._search_url = f"{self.base_url}{self.spec.path}"
 
         if not self.api_key:
-            logger.warning("Hertz API client is not configured. Please set HERTZ_API_KEY.")
-
-    def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Transforms the fictional Hertz response into our standard format."""
-        transformed_results = []
-        for car in response.get("available_vehicles", []):
-            transformed_results.append({
-                "provider": "Hertz",
-                "model": car.get("vehicle_name"),
-                "price_per_day": float(car.get("daily_rate_usd")),
-                "id": car.get("vehicle_id")
-            })
-        return transformed_results
+            logger.warning("%s API client is not configured. Please set %s.", self.spec.name, self._api_key_var)
+        else:
+            self.session.headers[self.spec.auth_header] = self.spec.auth_format.format(self.api_key)
+
+    def _transform_response(self, response: Dict[str, Any]) -> List[CarOffer]:
+        """Transforms the provider's response into our standard format."""
+        to_offer = self.spec.to_offer
+        return [to_offer(row) for row in response.get(self.spec.response_key, ())]
 
     def search(
         self,
@@ -94,129 +288,111 @@ class HertzApiClient(BaseCarRentalApiClient):
         pickup_date: str,
         dropoff_date: str,
         car_type: str
-    ) -> Optional[List[Dict[str, Any]]]:
+    ) -> Optional[List[CarOffer]]:
         if not self.api_key:
-            logger.error("HERTZ_API_KEY not set. Cannot search.")
+            logger.error("%s not set. Cannot search.", self._api_key_var)
             return None
 
-        search_url = f"{self.base_url}/v1/vehicles/search"
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        params = {
-            "pickup_location": location,
-            "pickup_date": pickup_date,
-            "dropoff_date": dropoff_date,
-            "vehicle_class": car_type,
-        }
-
-        cache_key = tuple(sorted(params.items()))
-        if cache_key in self.cache:
-            logger.info("Returning cached Hertz car rental results.")
-            return self.cache[cache_key]
-
-        logger.info(f"Searching Hertz for cars with params: {params}")
-        try:
-            response = requests.get(search_url, params=params, headers=headers, timeout=15)
-            response.raise_for_status()
-            api_response = response.json()
-
-            transformed_response = self._transform_response(api_response)
-            self.cache[cache_key] = transformed_response
-            return transformed_response
-        except RequestException as e:
-            logger.error(f"Hertz API request failed: {e}")
-            return None
+        search_values, cache_key = self._prepare_search(location, pickup_date, dropoff_date, car_type)
+        cached_results = self.cache.get_and_touch(cache_key, ttl=self.cache_ttl)
+        if cached_results is not None:
+            logger.info("Returning cached %s car rental results.", self.spec.name)
+            return _to_offers(cached_results)
 
+        return self._search_uncached(search_values, cache_key)
 
-class AvisApiClient(BaseCarRentalApiClient):
-    """
-    A fictional client for an Avis Car Rental API.
-    Requires AVIS_API_KEY environment variable.
-    """
-    def __init__(self):
-        super().__init__()
-        self.api_key = self._get_env_var("AVIS_API_KEY")
-        self.base_url = self._get_env_var("AVIS_BASE_URL", "https://api.avis.com")
-
-        if not self.api_key:
-            logger.warning("Avis API client is not configured. Please set AVIS_API_KEY.")
-
-    def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Transforms the fictional Avis response into our standard format."""
-        transformed_results = []
-        for car in response.get("cars", []):
-            transformed_results.append({
-                "provider": "Avis",
-                "model": car.get("car_model"),
-                "price_per_day": float(car.get("rate")),
-                "id": car.get("rental_id")
-            })
-        return transformed_results
-
-    def search(
+    def _prepare_search(
         self,
         location: str,
         pickup_date: str,
         dropoff_date: str,
-        car_type: str
-    ) -> Optional[List[Dict[str, Any]]]:
-        if not self.api_key:
-            logger.error("AVIS_API_KEY not set. Cannot search.")
+        car_type: Optional[str]
+    ) -> Tuple[Tuple[str, str, str, Optional[str]], str]:
+        """Returns the values sent to the provider, in param_keys order, and their cache key."""
+        if self.spec.uppercase_car_type and car_type:
+            car_type = car_type.upper()
+        search_values = (location, pickup_date, dropoff_date, car_type)
+        # Location and car type are typed by the user, so "LAX"/"lax " or "SUV"/"suv" share one entry.
+        cache_key = _make_cache_key(self.spec.key, (
+            (location or "").strip().casefold(), pickup_date, dropoff_date, (car_type or "").strip().casefold()
+        ))
+        return search_values, cache_key
+
+    def _search_uncached(self, search_values: Tuple[str, str, str, Optional[str]], cache_key: str) -> Optional[List[CarOffer]]:
+        """Searches the provider after a cache miss, unless its breaker is open."""
+        if not self._breaker_allows(self.spec.key):
+            logger.info("%s is temporarily unavailable. Skipping search.", self.spec.name)
             return None
 
-        search_url = f"{self.base_url}/rentals/v2/search"
-        headers = {"X-Api-Key": self.api_key} # Avis might use a different auth header
-        params = {
-            "pickup_loc": location,
-            "start_date": pickup_date,
-            "end_date": dropoff_date,
-            "category": car_type,
-        }
-
-        cache_key = tuple(sorted(params.items()))
-        if cache_key in self.cache:
-            logger.info("Returning cached Avis car rental results.")
-            return self.cache[cache_key]
-
-        logger.info(f"Searching Avis for cars with params: {params}")
+        return self._inflight.do(cache_key, lambda: self._fetch(search_values, cache_key))
+
+    def _fetch(self, search_values: Tuple[str, str, str, Optional[str]], cache_key: str) -> Optional[List[CarOffer]]:
+        """Sends the search to the provider and caches the transformed offers."""
+        spec = self.spec
+        params = dict(zip(spec.param_keys, search_values))
+        logger.info("Searching %s for cars with params: %s", spec.name, params)
         try:
-            response = requests.get(search_url, params=params, headers=headers, timeout=15)
+            response = self.session.get(self._search_url, params=params, timeout=CAR_SEARCH_TIMEOUT)
             response.raise_for_status()
-            api_response = response.json()
+            api_response = parse_json_response(response)
+        except RequestException as e:
+            logger.error("%s API request failed: %s", spec.name, e)
+            # A 4xx means the request was bad, not that the provider is down.
+            if isinstance(e, HTTPError) and e.response is not None and e.response.status_code < 500:
+                self._record_success(spec.key)
+            else:
+                self._record_failure(spec.key)
+            return None
 
+        self._record_success(spec.key)
+        try:
             transformed_response = self._transform_response(api_response)
-            self.cache[cache_key] = transformed_response
-            return transformed_response
-        except RequestException as e:
-            logger.error(f"Avis API request failed: {e}")
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            # A malformed offer (e.g. a missing rate) fails this provider's search, not the caller.
+            logger.error("Could not read the %s response: %s", spec.name, e)
             return None
+        self.cache.set(cache_key, transformed_response, ttl=self.cache_ttl)
+        return transformed_response
+
+
+class HertzApiClient(TemplateCarApiClient):
+    """
+    A fictional client for a Hertz Car Rental API.
+    Requires HERTZ_API_KEY environment variable.
+    """
+    SPEC = HERTZ_SPEC
 
 
-class EnterpriseApiClient(BaseCarRentalApiClient):
+class AvisApiClient(TemplateCarApiClient):
+    """
+    A fictional client for an Avis Car Rental API.
+    Requires AVIS_API_KEY environment variable.
+    """
+    SPEC = AVIS_SPEC
+
+
+class EnterpriseApiClient(TemplateCarApiClient):
     """
     A fictional client for an Enterprise Rent-A-Car API.
     Requires ENTERPRISE_API_KEY environment variable.
     """
-    def __init__(self):
-        super().__init__()
-        self.api_key = self._get_env_var("ENTERPRISE_API_KEY")
-        self.base_url = self._get_env_var("ENTERPRISE_BASE_URL", "https://api.ehi.com")
+    SPEC = ENTERPRISE_SPEC
 
-        if not self.api_key:
-            logger.warning("Enterprise API client is not configured. Please set ENTERPRISE_API_KEY.")
-
-    def _transform_response(self, response: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Transforms the fictional Enterprise response into our standard format."""
-        transformed_results = []
-        for option in response.get("rental_options", []):
-            vehicle_info = option.get("vehicle_info", {})
-            cost_info = option.get("cost", {})
-            transformed_results.append({
-                "provider": "Enterprise",
-                "model": f"{vehicle_info.get('make')} {vehicle_info.get('model')}",
-                "price_per_day": float(cost_info.get("per_day")),
-                "id": option.get("option_id")
-            })
-        return transformed_results
+
+class AllProvidersCarRentalApiClient(BaseCarRentalApiClient):
+    """
+    Searches every configured car rental provider concurrently and merges their results,
+    so a search takes as long as the slowest provider rather than the sum of all of them.
+    """
+    PROVIDERS = (HertzApiClient, AvisApiClient, EnterpriseApiClient)
+
+    def __init__(self):
+        # No session of its own: each provider client pools its own calls.
+        self.clients = [client for client in (provider() for provider in self.PROVIDERS) if client.api_key]
+        # Every provider client shares the process-wide car cache, so all their entries are read in one round-trip.
+        self._cache = None
+        if not self.clients:
+            logger.warning("No car rental providers are configured. Please set at least one provider API key.")
 
     def search(
         self,
@@ -224,37 +400,34 @@ class EnterpriseApiClient(BaseCarRentalApiClient):
         pickup_date: str,
         dropoff_date: str,
         car_type: str
-    ) -> Optional[List[Dict[str, Any]]]:
-        if not self.api_key:
-            logger.error("ENTERPRISE_API_KEY not set. Cannot search.")
+    ) -> Optional[List[CarOffer]]:
+        if not self.clients:
+            logger.error("No car rental providers are configured. Cannot search.")
             return None
 
-        search_url = f"{self.base_url}/v1/cars/availability"
-        headers = {"Api-Token": self.api_key} # Enterprise might use a different auth header
-        params = {
-            "location_code": location,
-            "pickup": pickup_date,
-            "dropoff": dropoff_date,
-            "car_group": car_type.upper(),
-        }
-
-        cache_key = tuple(sorted(params.items()))
-        if cache_key in self.cache:
-            logger.info("Returning cached Enterprise car rental results.")
-            return self.cache[cache_key]
-
-        logger.info(f"Searching Enterprise for cars with params: {params}")
-        try:
-            response = requests.get(search_url, params=params, headers=headers, timeout=15)
-            response.raise_for_status()
-            api_response = response.json()
-
-            transformed_response = self._transform_response(api_response)
-            self.cache[cache_key] = transformed_response
-            return transformed_response
-        except RequestException as e:
-            logger.error(f"Enterprise API request failed: {e}")
+        searches = [client._prepare_search(location, pickup_date, dropoff_date, car_type) for client in self.clients]
+        cached_results = self.cache.get_many([cache_key for _, cache_key in searches])
+        results = [None if cached is None else _to_offers(cached) for cached in cached_results]
+        misses = [i for i, cached in enumerate(cached_results) if cached is None]
+
+        if misses:
+            # Each provider caches its own fresh results from its worker thread, so those writes overlap too.
+            with ThreadPoolExecutor(max_workers=len(misses)) as executor:
+                futures = {
+                    i: executor.submit(self.clients[i]._search_uncached, *searches[i])
+                    for i in misses
+                }
+            for i, future in futures.items():
+                try:
+                    results[i] = future.result()
+                except Exception:
+                    logger.exception("%s car rental search failed.", self.clients[i].spec.name)
+
+        # A provider that failed is left out; the search only fails if every provider did.
+        successful_results = [result for result in results if result is not None]
+        if not successful_results:
             return None
+        return [car for result in successful_results for car in result]
 
 
 # --- Factory Function ---
@@ -263,22 +436,28 @@ CAR_RENTAL_API_CLIENTS = {
     "hertz": HertzApiClient,
     "avis": AvisApiClient,
     "enterprise": EnterpriseApiClient,
+    "all": AllProvidersCarRentalApiClient,
     "mock": MockCarRentalApiClient,
 }
 
+@lru_cache(maxsize=None)
 def get_car_rental_api_client() -> BaseCarRentalApiClient:
     """
     Factory function to get the appropriate car rental API client.
+    The client is built once per process, so provider configuration is read and any
+    missing-key warnings are logged once rather than on every search. Call
+    get_car_rental_api_client.cache_clear() after changing CAR_RENTAL_API_PROVIDER.
     """
     provider = os.environ.get("CAR_RENTAL_API_PROVIDER", "mock").lower()
     client_class = CAR_RENTAL_API_CLIENTS.get(provider)
 
     if client_class:
-        logger.info(f"Using {provider.capitalize()} car rental API client.")
+        logger.info("Using %s car rental API client.", provider.capitalize())
         return client_class()
 
     logger.warning(
-        f"Unknown CAR_RENTAL_API_PROVIDER '{provider}'. "
-        "Defaulting to Mock car rental API client."
+        "Unknown CAR_RENTAL_API_PROVIDER '%s'. "
+        "Defaulting to Mock car rental API client.",
+        provider,
     )
     return MockCarRentalApiClient()
\ No newline at end of file
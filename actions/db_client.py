@@ -1,42 +1,187 @@
 import logging
-from typing import Optional, Set, List, Dict
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Iterator, Optional, Set, List, Dict
 
 import psycopg2
-from psycopg2.pool import SimpleConnectionPool
+from cachetools import TTLCache
+from psycopg2.extras import execute_values
+from psycopg2.extensions import connection
+from psycopg2.pool import ThreadedConnectionPool
 
 logger = logging.getLogger(__name__)
 
+# Reference data loaded into a fresh database by initialize_schema().
+SEED_CITIES = ['London', 'Paris', 'New York', 'Tokyo', 'Berlin', 'San Francisco']
+SEED_AIRPORTS = [
+    ('London', 'Heathrow Airport', 'LHR'),
+    ('London', 'Gatwick Airport', 'LGW'),
+    ('Paris', 'Charles de Gaulle Airport', 'CDG'),
+    ('New York', 'John F. Kennedy Intl.', 'JFK'),
+    ('New York', 'LaGuardia Airport', 'LGA'),
+    ('Tokyo', 'Haneda Airport', 'HND'),
+    ('Berlin', 'Berlin Brandenburg Airport', 'BER'),
+    ('San Francisco', 'San Francisco Intl.', 'SFO'),
+]
+
+# Hot-path statements are prepared on each pooled connection the first time they are used there,
+# so the server skips parsing and planning afterwards.
+PREPARED_STATEMENTS = {
+    "store_pref": """
+        PREPARE store_pref (text, text, text) AS
+        INSERT INTO user_preferences (user_id, preference_key, preference_value) VALUES ($1, $2, $3)
+        ON CONFLICT (user_id, preference_key) DO UPDATE SET preference_value = EXCLUDED.preference_value
+        RETURNING preference_value;
+    """,
+    "get_prefs": """
+        PREPARE get_prefs (text, text[]) AS
+        SELECT preference_key, preference_value FROM user_preferences
+        WHERE user_id = $1 AND preference_key = ANY($2);
+    """,
+    "airports_for_city": """
+        PREPARE airports_for_city (text) AS
+        SELECT ap.airport_name, ap.iata_code
+        FROM airports ap
+        JOIN cities c ON ap.city_id = c.id
+        WHERE c.name = $1::citext;
+    """,
+}
+
+# City and airport reference data changes rarely, so lookups are served from memory for a while.
+LOCATION_CACHE_TTL_SECONDS = 300
+
 class DatabaseClient:
     """
     A client to interact with the PostgreSQL database.
     It encapsulates all database-related logic.
     """
 
-    def __init__(self, pool: Optional[SimpleConnectionPool]):
+    def __init__(self, pool: Optional[ThreadedConnectionPool]):
         self.pool = pool
+        # The action server handles requests concurrently, so cache access is serialized.
+        self._cache_lock = threading.Lock()
+        self._city_cache = TTLCache(maxsize=1, ttl=LOCATION_CACHE_TTL_SECONDS)
+        # Also filled for every city at once by prewarm_airports(), so prewarmed entries expire like any other.
+        self._airports_cache = TTLCache(maxsize=256, ttl=LOCATION_CACHE_TTL_SECONDS)
+        # The PREPARED_STATEMENTS names prepared on each connection; entries vanish when the pool drops a connection.
+        self._prepared: "weakref.WeakKeyDictionary[connection, Set[str]]" = weakref.WeakKeyDictionary()
+
+    @contextmanager
+    def _conn(self, prepare: Optional[str] = None) -> Iterator[connection]:
+        """
+        Borrows a connection from the pool and always hands it back, even on errors.
+        With `prepare` set to a PREPARED_STATEMENTS name, that statement is guaranteed to be prepared.
+        """
+        conn = self.pool.getconn()
+        try:
+            if prepare and prepare not in self._prepared.get(conn, ()):
+                self._prepare_statement(conn, prepare)
+            yield conn
+        finally:
+            self.pool.putconn(conn)
+
+    def _prepare_statement(self, conn: connection, name: str):
+        """
+        Prepares one hot-path statement on a connection that has not seen it yet.
+        Statements are prepared one at a time, so a statement that fails to prepare
+        only fails its own callers and is retried on the next use.
+        """
+        with conn.cursor() as cur:
+            cur.execute(PREPARED_STATEMENTS[name])
+        conn.commit()
+        self._prepared.setdefault(conn, set()).add(name)
+
+    def clear_location_caches(self):
+        """Drops cached city and airport lookups, e.g. after the reference data changed."""
+        with self._cache_lock:
+            self._city_cache.clear()
+            self._airports_cache.clear()
+
+    def prewarm_airports(self) -> bool:
+        """
+        Loads the airports of every city with a single query into the airport cache, so
+        get_airports_for_city calls are answered from memory until the entries expire after
+        LOCATION_CACHE_TTL_SECONDS. Returns False if the airports could not be loaded.
+        """
+        if not self.pool:
+            return False
+
+        try:
+            with self._conn() as conn, conn.cursor() as cur:
+                cur.execute("""
+                    SELECT c.name, ap.airport_name, ap.iata_code
+                    FROM airports ap
+                    JOIN cities c ON ap.city_id = c.id;
+                """)
+                airport_by_city: Dict[str, List[Dict[str, str]]] = {}
+                for city_name, airport_name, iata_code in cur.fetchall():
+                    airport_by_city.setdefault(city_name.lower(), []).append({"name": airport_name, "iata": iata_code})
+        except psycopg2.Error as e:
+            logger.error(f"Database error in prewarm_airports: {e}")
+            return False
+
+        with self._cache_lock:
+            self._airports_cache.update(airport_by_city)
+        logger.info(f"Prewarmed airports for {len(airport_by_city)} cities.")
+        return True
+
+    @staticmethod
+    def _migrate_city_names(cur) -> bool:
+        """
+        Brings a database created before cities.name became CITEXT up to date: creates the
+        citext extension, converts the column and drops the LOWER(name) index it replaces.
+        Returns False, without changing anything, when the column is already CITEXT.
+        """
+        cur.execute("""
+            SELECT t.typname
+            FROM pg_attribute a
+            JOIN pg_type t ON t.oid = a.atttypid
+            WHERE a.attrelid = 'cities'::regclass AND a.attname = 'name';
+        """)
+        if cur.fetchone()[0] == "citext":
+            return False
+
+        cur.execute("CREATE EXTENSION IF NOT EXISTS citext;")
+        cur.execute("ALTER TABLE cities ALTER COLUMN name TYPE CITEXT;")
+        cur.execute("DROP INDEX IF EXISTS idx_cities_name_lower;")
+        # The composite index covers the airport lookup by city, making the single-column one redundant.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_airports_city_id_name ON airports (city_id, airport_name);")
+        cur.execute("DROP INDEX IF EXISTS idx_airports_city_id;")
+        return True
 
     def initialize_schema(self):
         """
-        Creates necessary tables if they don't exist.
+        Creates necessary tables and seeds reference data on a fresh database.
         In a production environment, this should be handled by a dedicated migration tool.
+        An existing schema is detected up front and only has pending column migrations applied.
         """
         if not self.pool:
             logger.error("Database pool not available, cannot initialize schema.")
             return
 
-        conn = None
         try:
-            conn = self.pool.getconn()
-            with conn.cursor() as cur:
+            with self._conn() as conn, conn.cursor() as cur:
+                cur.execute("SELECT to_regclass('airports');")
+                if cur.fetchone()[0] is not None:
+                    if self._migrate_city_names(cur):
+                        conn.commit()
+                        self.clear_location_caches()
+                        logger.info("Migrated cities.name to CITEXT.")
+                    logger.info("Database schema already exists. Skipping initialization.")
+                    return
+
+                # citext makes city name comparisons case-insensitive without a LOWER() expression index
+                cur.execute("CREATE EXTENSION IF NOT EXISTS citext;")
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS cities (
                         id SERIAL PRIMARY KEY,
-                        name VARCHAR(100) UNIQUE NOT NULL
+                        name CITEXT UNIQUE NOT NULL
                     );
                 """)
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS user_preferences (
-                        user_id VARCHAR(255) PRIMARY KEY,
+                        user_id VARCHAR(255) NOT NULL,
                         preference_key VARCHAR(50) NOT NULL,
                         preference_value VARCHAR(255) NOT NULL,
                         PRIMARY KEY (user_id, preference_key)
@@ -50,133 +195,120 @@ class DatabaseClient:
                         iata_code VARCHAR(3) UNIQUE NOT NULL
                     );
                 """)
-                # Add an index on the city name for faster lookups
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_cities_name_lower ON cities (LOWER(name));")
-                cur.execute("CREATE INDEX IF NOT EXISTS idx_airports_city_id ON airports (city_id);")
+                # Covers the airport lookup by city; the unique constraint already indexes cities.name
+                cur.execute("CREATE INDEX IF NOT EXISTS idx_airports_city_id_name ON airports (city_id, airport_name);")
 
                 # Separate data loading from schema creation for better maintainability
-                cities_to_add = ['London', 'Paris', 'New York', 'Tokyo', 'Berlin', 'San Francisco']
                 cur.execute("""
                     INSERT INTO cities (name)
                     SELECT unnest(%s::text[])
                     ON CONFLICT (name) DO NOTHING;
-                """, (cities_to_add,))
+                """, (SEED_CITIES,))
 
-                cur.execute("""
-                    INSERT INTO airports (city_id, airport_name, iata_code) VALUES
-                    ((SELECT id FROM cities WHERE name = 'London'), 'Heathrow Airport', 'LHR'),
-                    ((SELECT id FROM cities WHERE name = 'London'), 'Gatwick Airport', 'LGW'),
-                    ((SELECT id FROM cities WHERE name = 'Paris'), 'Charles de Gaulle Airport', 'CDG'),
-                    ((SELECT id FROM cities WHERE name = 'New York'), 'John F. Kennedy Intl.', 'JFK'),
-                    ((SELECT id FROM cities WHERE name = 'New York'), 'LaGuardia Airport', 'LGA'),
-                    ((SELECT id FROM cities WHERE name = 'Tokyo'), 'Haneda Airport', 'HND'),
-                    ((SELECT id FROM cities WHERE name = 'Berlin'), 'Berlin Brandenburg Airport', 'BER'),
-                    ((SELECT id FROM cities WHERE name = 'San Francisco'), 'San Francisco Intl.', 'SFO')
+                # One statement joins every airport row to its city, instead of a subquery per row.
+                execute_values(cur, """
+                    INSERT INTO airports (city_id, airport_name, iata_code)
+                    SELECT c.id, v.airport_name, v.iata_code
+                    FROM (VALUES %s) AS v (city, airport_name, iata_code)
+                    JOIN cities c ON c.name = v.city
                     ON CONFLICT (iata_code) DO NOTHING;
-                """)
+                """, SEED_AIRPORTS, template="(%s, %s, %s)")
 
                 conn.commit()
+                self.clear_location_caches()
                 logger.info("Database schema initialized or already exists.")
         except psycopg2.Error as e:
             logger.error(f"Failed to initialize database schema: {e}")
-        finally:
-            if conn:
-                self.pool.putconn(conn)
 
-    def store_user_preference(self, user_id: str, key: str, value: str) -> bool:
-        """Stores or updates a user's preference for a given key (e.g., 'seat')."""
+    def store_user_preference(self, user_id: str, key: str, value: str) -> Optional[str]:
+        """
+        Stores or updates a user's preference for a given key (e.g., 'seat').
+        Returns the stored value, so callers can confirm it without a second query, or None on failure.
+        """
         if not self.pool:
-            return False
+            return None
 
-        conn = None
         try:
-            conn = self.pool.getconn()
-            with conn.cursor() as cur:
-                cur.execute("""
-                    INSERT INTO user_preferences (user_id, preference_key, preference_value) VALUES (%s, %s, %s)
-                    ON CONFLICT (user_id, preference_key) DO UPDATE SET preference_value = EXCLUDED.preference_value;
-                """, (user_id, key, value))
+            with self._conn(prepare="store_pref") as conn, conn.cursor() as cur:
+                cur.execute("EXECUTE store_pref (%s, %s, %s);", (user_id, key, value))
+                stored_value = cur.fetchone()[0]
                 conn.commit()
-                logger.info(f"Stored preference for user '{user_id}': {key}={value}")
-                return True
+                logger.info(f"Stored preference for user '{user_id}': {key}={stored_value}")
+                return stored_value
         except psycopg2.Error as e:
             logger.error(f"Database error in store_user_preference: {e}")
-            return False
-        finally:
-            if conn:
-                self.pool.putconn(conn)
+            return None
 
     def get_user_preference(self, user_id: str, key: str) -> Optional[str]:
         """Retrieves a user's preference for a given key."""
-        if not self.pool:
-            return None
+        return self.get_user_preferences(user_id, [key]).get(key)
+
+    def get_user_preferences(self, user_id: str, keys: List[str]) -> Dict[str, str]:
+        """Retrieves several of a user's preferences in one query. Keys without a stored value are omitted."""
+        if not self.pool or not keys:
+            return {}
 
-        conn = None
         try:
-            conn = self.pool.getconn()
-            with conn.cursor() as cur:
-                cur.execute("SELECT preference_value FROM user_preferences WHERE user_id = %s AND preference_key = %s", (user_id, key))
-                result = cur.fetchone()
-                return result[0] if result else None
+            with self._conn(prepare="get_prefs") as conn, conn.cursor() as cur:
+                cur.execute("EXECUTE get_prefs (%s, %s);", (user_id, list(keys)))
+                return dict(cur.fetchall())
         except psycopg2.Error as e:
-            logger.error(f"Database error in get_user_preference: {e}")
-            return None
-        finally:
-            if conn:
-                self.pool.putconn(conn)
+            logger.error(f"Database error in get_user_preferences: {e}")
+            return {}
 
     def get_airports_for_city(self, city_name: str) -> List[Dict[str, str]]:
         """Retrieves all airports for a given city name (case-insensitive)."""
         if not self.pool:
             return []
 
-        conn = None
+        cache_key = city_name.lower()
+        with self._cache_lock:
+            cached = self._airports_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         try:
-            conn = self.pool.getconn()
-            with conn.cursor() as cur:
-                # Join with the cities table to search by name
-                cur.execute("""
-                    SELECT ap.airport_name, ap.iata_code
-                    FROM airports ap
-                    JOIN cities c ON ap.city_id = c.id
-                    WHERE LOWER(c.name) = LOWER(%s)""", (city_name,))
+            with self._conn(prepare="airports_for_city") as conn, conn.cursor() as cur:
+                # Joins with the cities table to search by name
+                cur.execute("EXECUTE airports_for_city (%s);", (city_name,))
                 results = cur.fetchall()
-                return [{"name": row[0], "iata": row[1]} for row in results]
+                airports = [{"name": row[0], "iata": row[1]} for row in results]
+                with self._cache_lock:
+                    self._airports_cache[cache_key] = airports
+                return list(airports)
         except psycopg2.Error as e:
             logger.error(f"Database error in get_airports_for_city: {e}")
             return []
-        finally:
-            if conn:
-                self.pool.putconn(conn)
 
     def get_all_city_names(self) -> List[str]:
         """Retrieves a list of all unique city names from the database."""
         if not self.pool:
             return []
 
-        conn = None
+        with self._cache_lock:
+            cached = self._city_cache.get("all")
+        if cached is not None:
+            return list(cached)
+
         try:
-            conn = self.pool.getconn()
-            with conn.cursor() as cur:
+            with self._conn() as conn, conn.cursor() as cur:
                 cur.execute("SELECT name FROM cities;")
                 results = cur.fetchall()
-                return [row[0] for row in results]
+                city_names = [row[0] for row in results]
+                with self._cache_lock:
+                    self._city_cache["all"] = city_names
+                return list(city_names)
         except psycopg2.Error as e:
             logger.error(f"Database error in get_all_city_names: {e}")
             return []
-        finally:
-            if conn:
-                self.pool.putconn(conn)
 
     def delete_user_preference(self, user_id: str, key: str) -> bool:
         """Deletes a specific preference for a user."""
         if not self.pool:
             return False
 
-        conn = None
         try:
-            conn = self.pool.getconn()
-            with conn.cursor() as cur:
+            with self._conn() as conn, conn.cursor() as cur:
                 cur.execute("DELETE FROM user_preferences WHERE user_id = %s AND preference_key = %s", (user_id, key))
                 # Check if any row was actually deleted
                 deleted_rows = cur.rowcount
@@ -186,6 +318,3 @@ class DatabaseClient:
         except psycopg2.Error as e:
             logger.error(f"Database error in delete_user_preference: {e}")
             return False
-        finally:
-            if conn:
-                self.pool.putconn(conn)
\ No newline at end of file
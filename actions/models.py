@@ -7,6 +7,7 @@ from sqlalchemy import (
     Index,
     UniqueConstraint,
 )
+from sqlalchemy.dialects.postgresql import CITEXT
 from sqlalchemy.orm import relationship, declarative_base
 
 # The declarative base is a factory for creating model classes.
@@ -15,11 +16,11 @@ Base = declarative_base()
 class City(Base):
     __tablename__ = 'cities'
     id = Column(Integer, primary_key=True)
-    name = Column(String(100), unique=True, nullable=False)
+    # CITEXT compares case-insensitively, so lookups can use the unique index directly.
+    name = Column(CITEXT, unique=True, nullable=False)
 
     # This creates a one-to-many relationship: one city can have many airports.
     airports = relationship("Airport", back_populates="city")
-    __table_args__ = (Index('idx_cities_name_lower', 'name', postgresql_using='btree', postgresql_ops={'name': 'text_pattern_ops'}),)
 
 class UserPreference(Base):
     __tablename__ = 'user_preferences'
@@ -30,9 +31,10 @@ class UserPreference(Base):
 class Airport(Base):
     __tablename__ = 'airports'
     id = Column(Integer, primary_key=True)
-    city_id = Column(Integer, ForeignKey('cities.id', ondelete='CASCADE'), nullable=False, index=True)
+    city_id = Column(Integer, ForeignKey('cities.id', ondelete='CASCADE'), nullable=False)
     airport_name = Column(String(100), nullable=False)
     iata_code = Column(String(3), unique=True, nullable=False)
 
     # This creates the other side of the relationship.
-    city = relationship("City", back_populates="airports")
\ No newline at end of file
+    city = relationship("City", back_populates="airports")
+    __table_args__ = (Index('idx_airports_city_id_name', 'city_id', 'airport_name'),)
\ No newline at end of file
@@ -0,0 +1,44 @@
+"""Shared pytest configuration for the action server tests.
+
+The client modules that every test file depends on are imported here, once per
+session (and once per xdist worker), before any test module is collected.
+``actions.actions`` is deliberately left to ``test_actions.py``: it pulls in the
+Rasa SDK, dateparser and thefuzz and tries to open the database pool, so runs
+limited to the client tests (``pytest tests/test_db_client.py``) never load it.
+"""
+import logging
+
+import pytest
+
+import actions.api_client  # noqa: F401
+import actions.car_rental_api_client  # noqa: F401
+import actions.db_client  # noqa: F401
+
+
+@pytest.fixture(scope="session")
+def silence_rasa_logging():
+    """Raises the rasa_sdk logger to CRITICAL for the session so its messages aren't formatted."""
+    rasa_logger = logging.getLogger("rasa_sdk")
+    previous_level = rasa_logger.level
+    rasa_logger.setLevel(logging.CRITICAL)
+    yield
+    rasa_logger.setLevel(previous_level)
+
+
+class FakeDispatcher:
+    """A minimal stand-in for CollectingDispatcher that records each utter_message call."""
+    __slots__ = ("messages",)
+
+    def __init__(self):
+        self.messages = []
+
+    def utter_message(self, text=None, buttons=None, response=None, **kwargs):
+        self.messages.append({"text": text, "buttons": buttons or [], "response": response, **kwargs})
+
+
+@pytest.fixture
+def dispatcher():
+    """Provides a fresh FakeDispatcher for each test, emptied at teardown so its messages are released early."""
+    fake_dispatcher = FakeDispatcher()
+    yield fake_dispatcher
+    fake_dispatcher.messages.clear()
@@ -1,77 +1,251 @@
+import asyncio
 import datetime
-from unittest.mock import MagicMock
+from types import MappingProxyType, SimpleNamespace
 
 import pytest
 from rasa_sdk import Tracker
-from rasa_sdk.executor import CollectingDispatcher
-from rasa_sdk.events import SlotSet, ActiveLoop, AllSlotsReset, FollowupAction
+from rasa_sdk.events import SlotSet, ActiveLoop, AllSlotsReset
 
-from actions.actions import ValidateFlightBookingForm, ActionSearchFlights, ActionSetAirportFromClarification, ActionStorePreference, ActionDeletePreference, ActionFlexibleSearch, ActionFlightStatus, ActionSetFlightAndAskConfirm, ActionConfirmBooking, ActionCancelBooking, ActionAskConfirmCancellation, ActionResumeBooking, ActionReviewAndConfirm, ActionHandleCorrection, ValidateCarBookingForm, ActionHandleCitySuggestion
+import actions.actions as _actions_mod
+from actions.actions import ValidateFlightBookingForm, ActionSearchFlights, ActionStorePreference, ActionDeletePreference, ActionFlexibleSearch, ActionFlightStatus, ActionSetFlightAndAskConfirm, ActionConfirmBooking, ActionCancelBooking, ActionAskConfirmCancellation, ActionResumeBooking, ActionReviewAndConfirm, ActionHandleCorrection, ValidateCarBookingForm, _build_summary_sentence
 from actions.api_client import BaseFlightApiClient
 from actions.db_client import DatabaseClient
 
+# Attribute names for spec'd mocks, introspected once per module rather than once per mock.
+DB_CLIENT_SPEC = dir(DatabaseClient)
+FLIGHT_CLIENT_SPEC = dir(BaseFlightApiClient)
+FLIGHT_VALIDATOR_SPEC = dir(ValidateFlightBookingForm)
+
+pytestmark = [pytest.mark.usefixtures("silence_rasa_logging")]
+
+# Slots for a one-way, single-passenger JFK -> LHR search, shared by the ActionSearchFlights tests.
+SEARCH_SLOTS = {
+    "departure_city": "New York", "destination_city": "London",
+    "departure_city_iata": "JFK", "destination_city_iata": "LHR",
+    "departure_date": "2025-02-10", "number_of_passengers": 1,
+}
+
+# Entity payloads for latest_message, built once at import. Tracker.from_dict stores them without mutating.
+SEAT_WINDOW_ENTITY = [{"entity": "seat_preference", "value": "window"}]
+SEAT_AISLE_ENTITY = [{"entity": "seat_preference", "value": "aisle"}]
+FLIGHT_FH456_ENTITY = [{"entity": "flight_id", "value": "FH456"}]
+BERLIN_DESTINATION_ENTITY = [{"entity": "city", "value": "Berlin", "role": "destination"}]
+SECOND_DESTINATION_BERLIN_ENTITIES = [{"entity": "ordinal", "value": "second"}, *BERLIN_DESTINATION_ENTITY]
+DEPARTURE_DATE_MARCH_11_ENTITY = [{"entity": "departure_date", "value": "March 11th 2025"}]
+
+# Summary sentences expected for the "resume_filled" and "review" tracker cases below.
+EXPECTED_RESUME_SUMMARY = "a one-way trip for 2 passenger(s) from London"
+EXPECTED_REVIEW_SUMMARY = "a one-way trip for 1 passenger(s) from London to Paris departing on 2025-03-10"
+
+# Tracker payloads keyed by shape, for tests that take the indirectly parametrized `tracker` fixture.
+TRACKER_CASES = {
+    "preference_owner": {"sender_id": "test_user"},
+    "cancel_pending": {"slots": {"cancellation_pending": True}},
+    "resume_filled": {
+        "slots": {
+            "booking_trip_type": "one-way",
+            "departure_city": "London",
+            "number_of_passengers": 2,
+            "cancellation_pending": True
+        }
+    },
+    "review": {
+        "slots": {
+            "booking_trip_type": "one-way",
+            "departure_city": "London",
+            "destination_city": "Paris",
+            "number_of_passengers": 1,
+            "departure_date": "2025-03-10"
+        }
+    },
+    "correction_destination": {
+        "slots": {
+            "departure_city": "London",
+            "destination_city": "Paris"
+        },
+        "latest_message": {
+            "intent": {"name": "correct_info"},
+            "entities": BERLIN_DESTINATION_ENTITY
+        }
+    },
+    "correction_last_destination": {
+        "slots": {
+            "booking_trip_type": "multi-city",
+            "departure_city": "London",
+            "destinations": ["Paris", "Rome"],
+            "destinations_iata": ["CDG", "FCO"]
+        },
+        "latest_message": {
+            "intent": {"name": "correct_info"},
+            "entities": BERLIN_DESTINATION_ENTITY
+        }
+    },
+    "correction_second_destination": {
+        "slots": {
+            "booking_trip_type": "multi-city",
+            "departure_city": "London",
+            "destinations": ["Paris", "Rome"],
+            "destinations_iata": ["CDG", "FCO"]
+        },
+        "latest_message": {
+            "intent": {"name": "correct_info"},
+            "entities": SECOND_DESTINATION_BERLIN_ENTITIES
+        }
+    },
+    "correction_date": {
+        "slots": {
+            "departure_date": "2025-03-10"
+        },
+        "latest_message": {
+            "intent": {"name": "correct_info"},
+            "entities": DEPARTURE_DATE_MARCH_11_ENTITY
+        }
+    },
+}
+
+class _MockDate20250115(datetime.date):
+    """Mock date class for deterministic testing. Today is Jan 15, 2025."""
+    @classmethod
+    def today(cls):
+        return cls(2025, 1, 15)
 
 @pytest.fixture
+def frozen_today(mocker):
+    """Freezes `date.today()` in actions.actions at Jan 15, 2025 to make date tests deterministic."""
+    mocker.patch.object(_actions_mod, 'date', _MockDate20250115)
+    return _MockDate20250115
+
+class FakeDBClient:
+    """A hand-written stand-in for DatabaseClient covering what the preference actions use."""
+    def __init__(self, pool=True, store_result=None, delete_result=False):
+        self.pool = pool
+        self._store_result = store_result
+        self._delete_result = delete_result
+        self.calls = []
+        self.delete_calls = []
+
+    def store_user_preference(self, user_id, key, value):
+        self.calls.append((user_id, key, value))
+        return self._store_result
+
+    def delete_user_preference(self, user_id, key):
+        self.delete_calls.append((user_id, key))
+        return self._delete_result
+
+def _index_events(events):
+    """Splits rasa_sdk event dicts into {slot name: value} and the list of follow-up action names, in one pass."""
+    slot_values, followups = {}, []
+    for event in events:
+        if event["event"] == "slot":
+            slot_values[event["name"]] = event["value"]
+        elif event["event"] == "followup":
+            followups.append(event["name"])
+    return slot_values, followups
+
+def _shared_tracker(state):
+    """Builds a tracker whose slots are read-only, so a shared tracker can't carry writes between tests or xdist workers."""
+    return Tracker.from_dict({**state, "slots": MappingProxyType(dict(state.get("slots", {})))})
+
+@pytest.fixture(scope="module")
+def empty_tracker():
+    """An empty tracker shared by the module's tests; none of them modify it."""
+    return _shared_tracker({})
+
+@pytest.fixture(scope="module")
+def tracker_factory():
+    """Builds a tracker holding the given slots, e.g. tracker_factory(pickup_date="2025-06-12")."""
+    return lambda **slots: Tracker.from_dict({"slots": slots})
+
+@pytest.fixture(scope="module")
+def tracker(request):
+    """Builds the TRACKER_CASES tracker named by the test's indirect parameter, once per module; actions only read it."""
+    return _shared_tracker(TRACKER_CASES[request.param])
+
+@pytest.fixture(scope="module")
+def search_tracker():
+    """A tracker holding SEARCH_SLOTS; ActionSearchFlights only reads it."""
+    return _shared_tracker({"slots": SEARCH_SLOTS})
+
+@pytest.fixture(scope="module")
 def flight_booking_validator():
-    """Provides a clean instance of the form validator for each test."""
+    """Provides a form validator shared by the module's tests; its validate_* methods hold no state."""
     return ValidateFlightBookingForm()
 
+@pytest.fixture(scope="module")
+def shared_actions():
+    """Provides one instance of each stateless action, shared by the module's tests."""
+    return SimpleNamespace(
+        search_flights=ActionSearchFlights(),
+        flight_status=ActionFlightStatus(),
+        flexible_search=ActionFlexibleSearch(),
+        store_preference=ActionStorePreference(),
+        confirm_booking=ActionConfirmBooking(),
+        set_flight_and_ask_confirm=ActionSetFlightAndAskConfirm(),
+        delete_preference=ActionDeletePreference(),
+        ask_confirm_cancellation=ActionAskConfirmCancellation(),
+        resume_booking=ActionResumeBooking(),
+        cancel_booking=ActionCancelBooking(),
+        review_and_confirm=ActionReviewAndConfirm(),
+    )
+
 @pytest.fixture
-def mock_db_client(mocker):
-    """Mocks the db_client used in actions.py."""
-    mock_client = mocker.MagicMock(spec=DatabaseClient)
-    mocker.patch('actions.actions.db_client', mock_client)
+def mock_db_client(mocker, monkeypatch):
+    """Mocks the db_client used in actions.py, with a live pool."""
+    mock_client = mocker.MagicMock(spec=DB_CLIENT_SPEC)
+    mock_client.pool = True
+    monkeypatch.setattr(_actions_mod, 'db_client', mock_client)
     return mock_client
 
 @pytest.fixture
 def mock_api_client(mocker):
     """Mocks the get_api_client factory function."""
-    mock_client_instance = mocker.MagicMock(spec=BaseFlightApiClient)
-    mocker.patch('actions.actions.get_api_client', return_value=mock_client_instance)
+    mock_client_instance = mocker.MagicMock(spec=FLIGHT_CLIENT_SPEC)
+    mocker.patch.object(_actions_mod, 'get_api_client', return_value=mock_client_instance)
     return mock_client_instance
 
-def test_validate_departure_date_valid_future(flight_booking_validator, monkeypatch):
+@pytest.fixture
+def mock_flight_validator(mocker):
+    """A spec'd stand-in for the ValidateFlightBookingForm that ActionHandleCorrection delegates to."""
+    return mocker.MagicMock(spec=FLIGHT_VALIDATOR_SPEC)
+
+@pytest.fixture
+def handle_correction_action(mock_flight_validator):
+    """Provides an ActionHandleCorrection wired to mock_flight_validator; it holds a validator, so it isn't shared."""
+    action = ActionHandleCorrection()
+    action.validator = mock_flight_validator
+    return action
+
+@pytest.mark.parametrize("user_input,expected_slot,expected_msg", [
+    ("tomorrow", "2025-01-16", None),
+    ("yesterday", None, "You can't book a flight in the past!"),
+    ("a week from whenever", None, "couldn't understand"),
+])
+def test_validate_departure_date(dispatcher, flight_booking_validator, frozen_today, empty_tracker, user_input, expected_slot, expected_msg):
     """
-    Tests that a valid future date string is parsed and set correctly.
+    Tests that a future date is parsed and set, while past and nonsensical dates are rejected.
     """
     # Arrange
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
 
-    # We mock `datetime.date.today()` to make the test deterministic.
-    # Let's pretend today is Jan 15, 2025.
-    class MockDate(datetime.date):
-        """Mock date class for deterministic testing."""
-        @classmethod
-        def today(cls):
-            return cls(2025, 1, 15)
-
-    monkeypatch.setattr(datetime, 'date', MockDate)
-
-    # Act: Validate "tomorrow"
-    result = flight_booking_validator.validate_departure_date("tomorrow", dispatcher, tracker, {})
+    # Act
+    result = flight_booking_validator.validate_departure_date(user_input, dispatcher, tracker, {})
 
-    # Assert: The result should be the next day in the correct format.
-    assert result == {"departure_date": "2025-01-16"}
-    assert len(dispatcher.messages) == 0  # No error messages should be sent
+    # Assert
+    assert result == {"departure_date": expected_slot}
+    if expected_msg is None:
+        assert len(dispatcher.messages) == 0
+    else:
+        assert len(dispatcher.messages) == 1
+        assert expected_msg in dispatcher.messages[0]["text"]
 
-def test_validate_departure_date_correction(flight_booking_validator, monkeypatch):
+def test_validate_departure_date_correction(dispatcher, flight_booking_validator, frozen_today):
     """
     Tests that correcting a departure date is acknowledged.
     """
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
         "slots": { "departure_date": "2025-01-20" }
     })
 
-    class MockDate(datetime.date):
-        """Mock date class for deterministic testing."""
-        @classmethod
-        def today(cls):
-            return cls(2025, 1, 15)
-
-    monkeypatch.setattr(datetime, 'date', MockDate)
-
     # Act: Validate a new date
     result = flight_booking_validator.validate_departure_date("January 22nd 2025", dispatcher, tracker, {})
 
@@ -80,162 +254,83 @@ def test_validate_departure_date_correction(flight_booking_validator, monkeypatc
     assert len(dispatcher.messages) == 1
     assert "Okay, I've updated the departure date to 2025-01-22." in dispatcher.messages[0]["text"]
 
-def test_validate_departure_date_past_date(flight_booking_validator, monkeypatch):
-    """
-    Tests that a date in the past is rejected.
-    """
-    # Arrange
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
-
-    # Pretend today is Jan 15, 2025.
-    class MockDate(datetime.date):
-        """Mock date class for deterministic testing."""
-        @classmethod
-        def today(cls):
-            return cls(2025, 1, 15)
-
-    monkeypatch.setattr(datetime, 'date', MockDate)
-
-    # Act: Validate "yesterday"
-    result = flight_booking_validator.validate_departure_date("yesterday", dispatcher, tracker, {})
-
-    # Assert: The slot should be rejected (set to None) and an error message sent.
-    assert result == {"departure_date": None}
-    assert len(dispatcher.messages) == 1
-    assert "You can't book a flight in the past!" in dispatcher.messages[0]["text"]
-
-
-def test_validate_departure_date_invalid_string(flight_booking_validator):
-    """
-    Tests that a nonsensical date string is rejected.
-    """
-    # Arrange
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
-    # Act
-    result = flight_booking_validator.validate_departure_date("a week from whenever", dispatcher, tracker, {})
-    # Assert
-    assert result == {"departure_date": None}
-    assert len(dispatcher.messages) == 1
-    assert "couldn't understand" in dispatcher.messages[0]["text"]
-
-
-def test_validate_return_date_valid(flight_booking_validator):
-    """
-    Tests that a return date after the departure date is validated correctly.
-    """
-    # Arrange
-    dispatcher = CollectingDispatcher()
-    # Simulate a tracker where the departure_date has already been set.
-    tracker = Tracker.from_dict({
-        "slots": {
-            "departure_date": "2025-01-20"
-        }
-    })
-
-    # Act
-    result = flight_booking_validator.validate_return_date("January 25th 2025", dispatcher, tracker, {})
-
-    # Assert
-    assert result == {"return_date": "2025-01-25"}
-    assert len(dispatcher.messages) == 0
-
-
-def test_validate_return_date_before_departure(flight_booking_validator):
+@pytest.mark.parametrize("slots,user_input,expected_slot,expected_msg", [
+    ({"departure_date": "2025-01-20"}, "January 25th 2025", "2025-01-25", None),
+    ({"departure_date": "2025-01-20"}, "January 19th 2025", None, "must be after the departure date"),
+    ({}, "any date", None, "I need to know the departure date first"),
+])
+def test_validate_return_date(dispatcher, flight_booking_validator, slots, user_input, expected_slot, expected_msg):
     """
-    Tests that a return date on or before the departure date is rejected.
+    Tests that a return date after the departure date is accepted, and one on or before it,
+    or one given before any departure date is known, is rejected.
     """
     # Arrange
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {
-            "departure_date": "2025-01-20"
-        }
-    })
+    tracker = Tracker.from_dict({"slots": slots})
 
     # Act
-    result = flight_booking_validator.validate_return_date("January 19th 2025", dispatcher, tracker, {})
+    result = flight_booking_validator.validate_return_date(user_input, dispatcher, tracker, {})
 
     # Assert
-    assert result == {"return_date": None}
-    assert len(dispatcher.messages) == 1
-    assert "must be after the departure date" in dispatcher.messages[0]["text"]
-
-
-def test_validate_return_date_without_departure_date(flight_booking_validator):
-    """
-    Tests the safeguard that rejects a return date if departure_date is not set.
-    """
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"slots": {}})  # No departure_date
-    result = flight_booking_validator.validate_return_date("any date", dispatcher, tracker, {})
-    assert result == {"return_date": None}
-    assert "I need to know the departure date first" in dispatcher.messages[0]["text"]
+    assert result == {"return_date": expected_slot}
+    if expected_msg is None:
+        assert len(dispatcher.messages) == 0
+    else:
+        assert len(dispatcher.messages) == 1
+        assert expected_msg in dispatcher.messages[0]["text"]
 
-def test_action_store_preference_success(mocker):
+def test_action_store_preference_success(dispatcher, shared_actions, monkeypatch):
     """
     Tests ActionStorePreference when the database operation is successful.
     """
     # Arrange
-    action = ActionStorePreference()
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
         "sender_id": "test_user_123",
         "latest_message": {
-            "entities": [{"entity": "seat_preference", "value": "window"}]
+            "entities": SEAT_WINDOW_ENTITY
         }
     })
 
-    # Mock the DatabaseClient to simulate a successful write
-    mock_db_client = mocker.MagicMock(spec=DatabaseClient)
-    mock_db_client.pool = True # Simulate that a pool exists
-    mock_db_client.store_user_preference.return_value = True
-    mocker.patch('actions.actions.db_client', mock_db_client)
+    # Simulate a successful write
+    fake_db_client = FakeDBClient(store_result="window")
+    monkeypatch.setattr(_actions_mod, 'db_client', fake_db_client)
 
     # Act
-    action.run(dispatcher, tracker, {})
+    shared_actions.store_preference.run(dispatcher, tracker, {})
 
     # Assert
-    mock_db_client.store_user_preference.assert_called_once_with("test_user_123", "seat_preference", "window")
-    assert "I've saved your preference" in dispatcher.messages[0]["text"]
+    assert fake_db_client.calls == [("test_user_123", "seat_preference", "window")]
+    assert "I've saved your preference for a window seat" in dispatcher.messages[0]["text"]
 
 
-def test_action_store_preference_db_error(mocker):
+def test_action_store_preference_db_error(dispatcher, shared_actions, monkeypatch):
     """
     Tests ActionStorePreference when the database throws an error.
     """
     # Arrange
-    action = ActionStorePreference()
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
         "sender_id": "test_user_456",
         "latest_message": {
-            "entities": [{"entity": "seat_preference", "value": "aisle"}]
+            "entities": SEAT_AISLE_ENTITY
         }
     })
 
-    # Mock the DatabaseClient to simulate a failed write
-    mock_db_client = mocker.MagicMock(spec=DatabaseClient)
-    mock_db_client.pool = True # Simulate that a pool exists
-    mock_db_client.store_user_preference.return_value = False
-    mocker.patch('actions.actions.db_client', mock_db_client)
+    # Simulate a failed write
+    fake_db_client = FakeDBClient(store_result=None)
+    monkeypatch.setattr(_actions_mod, 'db_client', fake_db_client)
 
     # Act
-    action.run(dispatcher, tracker, {})
+    shared_actions.store_preference.run(dispatcher, tracker, {})
 
     # Assert
-    mock_db_client.store_user_preference.assert_called_once_with("test_user_456", "seat_preference", "aisle")
+    assert fake_db_client.calls == [("test_user_456", "seat_preference", "aisle")]
     assert "couldn't save your preference due to a technical issue" in dispatcher.messages[0]["text"]
 
 
-def test_action_store_preference_no_entity(mocker):
+def test_action_store_preference_no_entity(dispatcher, shared_actions, monkeypatch):
     """
     Tests ActionStorePreference when no seat_preference entity is found.
     """
     # Arrange
-    action = ActionStorePreference()
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
         "sender_id": "test_user_789",
         "latest_message": {
@@ -243,120 +338,91 @@ def test_action_store_preference_no_entity(mocker):
         }
     })
 
-    # Mock the db_client to ensure its methods are not called.
-    mock_db_client = mocker.MagicMock(spec=DatabaseClient)
-    mocker.patch('actions.actions.db_client', mock_db_client)
+    # The fake records any write, so we can check that none happened.
+    fake_db_client = FakeDBClient()
+    monkeypatch.setattr(_actions_mod, 'db_client', fake_db_client)
 
     # Act
-    action.run(dispatcher, tracker, {})
+    shared_actions.store_preference.run(dispatcher, tracker, {})
 
     # Assert
     assert "I didn't catch that preference" in dispatcher.messages[0]["text"]
-    mock_db_client.store_user_preference.assert_not_called()
+    assert fake_db_client.calls == []
 
 
-def test_action_flexible_search_beach_with_budget():
+@pytest.mark.parametrize("entities, expected_search_message, expected_suggestion", [
+    (
+        [{"entity": "trip_type", "value": "beach"}, {"entity": "budget", "value": "500"}],
+        "I am searching for a beach trip with a budget of $500...",
+        "Cancun",
+    ),
+    # Without a budget, any budget is assumed.
+    (
+        [{"entity": "trip_type", "value": "adventure"}],
+        "I am searching for a adventure trip with a budget of $any...",
+        "Costa Rica",
+    ),
+    # Without any entities, the default suggestion is used.
+    ([], "I am searching for a any trip with a budget of $any...", "Prague"),
+], ids=["beach_with_budget", "adventure_no_budget", "default_no_entities"])
+def test_action_flexible_search(dispatcher, shared_actions, entities, expected_search_message, expected_suggestion):
     """
-    Tests ActionFlexibleSearch when user provides 'beach' trip_type and a budget.
+    Tests ActionFlexibleSearch with different combinations of trip_type and budget entities.
     """
     # Arrange
-    action = ActionFlexibleSearch()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "latest_message": {
-            "entities": [
-                {"entity": "trip_type", "value": "beach"},
-                {"entity": "budget", "value": "500"}
-            ]
-        }
-    })
+    tracker = Tracker.from_dict({"latest_message": {"entities": entities}})
 
     # Act
-    action.run(dispatcher, tracker, {})
+    shared_actions.flexible_search.run(dispatcher, tracker, {})
 
     # Assert
     assert len(dispatcher.messages) == 2
-    assert dispatcher.messages[0]["text"] == "I am searching for a beach trip with a budget of $500..."
-    assert "Cancun" in dispatcher.messages[1]["text"]
+    assert dispatcher.messages[0]["text"] == expected_search_message
+    assert expected_suggestion in dispatcher.messages[1]["text"]
 
 
-def test_action_flexible_search_adventure_no_budget():
-    """
-    Tests ActionFlexibleSearch when user provides 'adventure' trip_type without a budget.
-    """
-    action = ActionFlexibleSearch()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "latest_message": {"entities": [{"entity": "trip_type", "value": "adventure"}]}
-    })
-    action.run(dispatcher, tracker, {})
-    assert len(dispatcher.messages) == 2
-    assert dispatcher.messages[0]["text"] == "I am searching for a adventure trip with a budget of $any..."
-    assert "Costa Rica" in dispatcher.messages[1]["text"]
-
-
-def test_action_flexible_search_default_no_entities():
-    """
-    Tests ActionFlexibleSearch when user provides no entities.
-    """
-    action = ActionFlexibleSearch()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"latest_message": {"entities": []}}) # No entities
-    action.run(dispatcher, tracker, {})
-    assert len(dispatcher.messages) == 2
-    assert dispatcher.messages[0]["text"] == "I am searching for a any trip with a budget of $any..."
-    assert "Prague" in dispatcher.messages[1]["text"]
-
-
-def test_action_flight_status_with_id():
+@pytest.mark.parametrize("entities, expected_messages", [
+    # Happy path: a flight_id is present in the tracker.
+    (
+        [{"entity": "flight_id", "value": "UA456"}],
+        ["Checking status for flight UA456...", "Flight UA456 is on time. It will depart at 11:30."],
+    ),
+    # Unhappy path: no flight_id is provided.
+    ([], ["I need a flight ID to check the status."]),
+], ids=["with_id", "without_id"])
+def test_action_flight_status(dispatcher, shared_actions, entities, expected_messages):
     """
-    Tests the 'happy path' where a flight_id is present in the tracker.
+    Tests ActionFlightStatus with and without a flight_id entity.
     """
-    action = ActionFlightStatus()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "latest_message": {
-            "entities": [{"entity": "flight_id", "value": "UA456"}]
-        }
-    })
-    action.run(dispatcher, tracker, {})
-    assert len(dispatcher.messages) == 2
-    assert dispatcher.messages[0]["text"] == "Checking status for flight UA456..."
-    assert dispatcher.messages[1]["text"] == "Flight UA456 is on time. It will depart at 11:30."
+    # Arrange
+    tracker = Tracker.from_dict({"latest_message": {"entities": entities}})
 
+    # Act
+    shared_actions.flight_status.run(dispatcher, tracker, {})
 
-def test_action_flight_status_without_id():
-    """
-    Tests the 'unhappy path' where no flight_id is provided.
-    """
-    action = ActionFlightStatus()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"latest_message": {"entities": []}})
-    action.run(dispatcher, tracker, {})
-    assert len(dispatcher.messages) == 1
-    assert dispatcher.messages[0]["text"] == "I need a flight ID to check the status."
+    # Assert
+    assert [message["text"] for message in dispatcher.messages] == expected_messages
 
 
-def test_validate_city_unambiguous(flight_booking_validator, mock_db_client):
+def test_validate_city_unambiguous(dispatcher, flight_booking_validator, mock_db_client, empty_tracker):
     """Tests city validation when the DB returns a single, unambiguous airport."""
-    dispatcher = CollectingDispatcher()
     mock_db_client.get_airports_for_city.return_value = [{"name": "Paris Charles de Gaulle", "iata": "CDG"}]
 
-    result = flight_booking_validator.validate_departure_city("Paris", dispatcher, Tracker.from_dict({}), {})
+    result = flight_booking_validator.validate_departure_city("Paris", dispatcher, empty_tracker, {})
 
     assert result == {"departure_city": "Paris", "departure_city_iata": "CDG"}
-    mock_db_client.get_airports_for_city.assert_called_once_with("Paris")
+    assert mock_db_client.get_airports_for_city.call_count == 1
+    assert mock_db_client.get_airports_for_city.call_args.args == ("Paris",)
     assert len(dispatcher.messages) == 0
 
-def test_validate_city_ambiguous(flight_booking_validator, mock_db_client):
+def test_validate_city_ambiguous(dispatcher, flight_booking_validator, mock_db_client, empty_tracker):
     """Tests city validation when the DB returns multiple airports, triggering clarification."""
-    dispatcher = CollectingDispatcher()
     mock_db_client.get_airports_for_city.return_value = [
         {"name": "John F. Kennedy Intl.", "iata": "JFK"},
         {"name": "LaGuardia Airport", "iata": "LGA"}
     ]
 
-    result = flight_booking_validator.validate_departure_city("New York", dispatcher, Tracker.from_dict({}), {})
+    result = flight_booking_validator.validate_departure_city("New York", dispatcher, empty_tracker, {})
 
     # The form should pause and ask for clarification
     assert result == {
@@ -371,12 +437,11 @@ def test_validate_city_ambiguous(flight_booking_validator, mock_db_client):
     assert len(dispatcher.messages[0]["buttons"]) == 2
     assert dispatcher.messages[0]["buttons"][0]["payload"] == '/select_airport{"selected_iata_code": "JFK"}'
 
-def test_validate_city_invalid(flight_booking_validator, mock_db_client):
+def test_validate_city_invalid(dispatcher, flight_booking_validator, mock_db_client, empty_tracker):
     """Tests city validation for an unknown city."""
-    dispatcher = CollectingDispatcher()
     mock_db_client.get_airports_for_city.return_value = []
 
-    result = flight_booking_validator.validate_departure_city("Atlantis", dispatcher, Tracker.from_dict({}), {})
+    result = flight_booking_validator.validate_departure_city("Atlantis", dispatcher, empty_tracker, {})
 
     assert result == {"departure_city": None, "departure_city_iata": None}
     assert len(dispatcher.messages) == 1
@@ -402,22 +467,13 @@ def test_validate_city_invalid(flight_booking_validator, mock_db_client):
         False
     ),
 ])
-def test_action_search_flights_api_responses(mock_api_client, api_return_value, expected_message, expect_buttons):
+def test_action_search_flights_api_responses(dispatcher, shared_actions, mock_api_client, search_tracker, api_return_value, expected_message, expect_buttons):
     """Tests how ActionSearchFlights handles various API responses."""
     # Arrange
-    action = ActionSearchFlights()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {
-            "departure_city": "New York", "destination_city": "London",
-            "departure_city_iata": "JFK", "destination_city_iata": "LHR",
-            "departure_date": "2025-02-10", "number_of_passengers": 1,
-        }
-    })
     mock_api_client.search.return_value = api_return_value
 
     # Act
-    action.run(dispatcher, tracker, {})
+    asyncio.run(shared_actions.search_flights.run(dispatcher, search_tracker, {}))
 
     # Assert
     mock_api_client.search.assert_called_once()
@@ -433,11 +489,9 @@ def test_action_search_flights_api_responses(mock_api_client, api_return_value,
     else:
         assert "buttons" not in final_message or not final_message["buttons"]
 
-def test_action_search_flights_multi_city(mock_api_client):
+def test_action_search_flights_multi_city(dispatcher, shared_actions, mock_api_client):
     """Tests that multi-city trips are handled as a special case without calling the API."""
     # Arrange
-    action = ActionSearchFlights()
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
         "slots": {
             "booking_trip_type": "multi-city",
@@ -449,7 +503,7 @@ def test_action_search_flights_multi_city(mock_api_client):
     })
 
     # Act
-    action.run(dispatcher, tracker, {})
+    asyncio.run(shared_actions.search_flights.run(dispatcher, tracker, {}))
 
     # Assert
     mock_api_client.search.assert_not_called()
@@ -458,49 +512,36 @@ def test_action_search_flights_multi_city(mock_api_client):
     assert "London -> Paris -> Berlin" in dispatcher.messages[0]["text"]
     assert "Multi-city searches are complex" in dispatcher.messages[1]["text"]
 
-def test_action_search_flights_with_seat_preference(mock_api_client, mock_db_client):
+def test_action_search_flights_with_seat_preference(dispatcher, shared_actions, mock_api_client, mock_db_client):
     """Tests that a stored seat preference is retrieved and used in the search."""
     # Arrange
-    action = ActionSearchFlights()
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
         "sender_id": "test_user",
-        "slots": {
-            "departure_city": "New York", "destination_city": "London",
-            "departure_city_iata": "JFK", "destination_city_iata": "LHR",
-            "departure_date": "2025-02-10", "number_of_passengers": 1,
-        }
+        "slots": SEARCH_SLOTS,
     })
-    mock_db_client.pool = True
-    mock_db_client.get_user_preference.return_value = "window"
+    mock_db_client.get_user_preferences.return_value = {"seat_preference": "window"}
     mock_api_client.search.return_value = [{"airline": "TestAir", "time": "10:00", "price": 500, "flight_id": "TA100"}]
 
     # Act
-    action.run(dispatcher, tracker, {})
+    asyncio.run(shared_actions.search_flights.run(dispatcher, tracker, {}))
 
     # Assert
-    mock_db_client.get_user_preference.assert_called_once_with("test_user", "seat_preference")
+    assert mock_db_client.get_user_preferences.call_count == 1
+    assert mock_db_client.get_user_preferences.call_args.args == ("test_user", ["seat_preference", "preferred_airline"])
     assert "I'll keep in mind you prefer a window seat." in dispatcher.messages[0]["text"]
     call_args, call_kwargs = mock_api_client.search.call_args
     assert call_kwargs["seat_preference"] == "window"
 
-def test_action_search_flights_round_trip_message(mock_api_client):
+def test_action_search_flights_round_trip_message(dispatcher, shared_actions, mock_api_client):
     """Tests the search message construction for a round trip."""
     # Arrange
-    action = ActionSearchFlights()
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
-        "slots": {
-            "departure_city": "New York", "destination_city": "London",
-            "departure_city_iata": "JFK", "destination_city_iata": "LHR",
-            "departure_date": "2025-02-10", "return_date": "2025-02-20",
-            "number_of_passengers": 2,
-        }
+        "slots": {**SEARCH_SLOTS, "return_date": "2025-02-20", "number_of_passengers": 2}
     })
     mock_api_client.search.return_value = []
 
     # Act
-    action.run(dispatcher, tracker, {})
+    asyncio.run(shared_actions.search_flights.run(dispatcher, tracker, {}))
 
     # Assert
     search_message = dispatcher.messages[0]["text"]
@@ -510,22 +551,10 @@ def test_action_search_flights_round_trip_message(mock_api_client):
     assert "departing on 2025-02-10" in search_message
     assert "and returning on 2025-02-20" in search_message
 
-def test_required_slots_no_trip_type(flight_booking_validator):
-    """
-    Tests that 'booking_trip_type' is the only required slot initially.
-    """
-    tracker = Tracker.from_dict({"slots": {}})
-    required = flight_booking_validator.required_slots(tracker)
-    assert required == ["booking_trip_type"]
-
-
-def test_required_slots_one_way(flight_booking_validator):
-    """
-    Tests the required slots for a 'one-way' trip.
-    """
-    tracker = Tracker.from_dict({"slots": {"booking_trip_type": "one-way"}})
-    required = flight_booking_validator.required_slots(tracker)
-    expected = [
+@pytest.mark.parametrize("slots, expected", [
+    # Only the trip type is asked for initially.
+    ({}, ["booking_trip_type"]),
+    ({"booking_trip_type": "one-way"}, [
         "booking_trip_type",
         "departure_city",
         "destination_city",
@@ -533,68 +562,9 @@ def test_required_slots_one_way(flight_booking_validator):
         "number_of_passengers",
         "preferred_airline",
         "frequent_flyer_number",
-    ]
-    assert required == expected
-
-
-def test_validate_number_of_passengers_valid(flight_booking_validator):
-    """
-    Tests that a valid number of passengers is accepted and converted to an integer.
-    """
-    # Arrange
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
-
-    # Act
-    result = flight_booking_validator.validate_number_of_passengers("3", dispatcher, tracker, {})
-
-    # Assert
-    assert result == {"number_of_passengers": 3}
-    assert len(dispatcher.messages) == 0
-
-def test_validate_number_of_passengers_correction(flight_booking_validator):
-    """
-    Tests that correcting the number of passengers is acknowledged.
-    """
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": { "number_of_passengers": 1 }
-    })
-    result = flight_booking_validator.validate_number_of_passengers("2", dispatcher, tracker, {})
-    assert result == {"number_of_passengers": 2}
-    assert len(dispatcher.messages) == 1
-    assert "Okay, I've updated the number of passengers to 2." in dispatcher.messages[0]["text"]
-
-
-def test_validate_number_of_passengers_invalid_string(flight_booking_validator):
-    """
-    Tests that a non-numeric string is rejected.
-    """
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
-    result = flight_booking_validator.validate_number_of_passengers("a couple", dispatcher, tracker, {})
-    assert result == {"number_of_passengers": None}
-    assert "don't understand 'a couple' as a number" in dispatcher.messages[0]["text"]
-
-
-def test_validate_number_of_passengers_zero(flight_booking_validator):
-    """
-    Tests that zero or a negative number of passengers is rejected.
-    """
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
-    result = flight_booking_validator.validate_number_of_passengers("0", dispatcher, tracker, {})
-    assert result == {"number_of_passengers": None}
-    assert "must be at least 1" in dispatcher.messages[0]["text"]
-
-
-def test_required_slots_round_trip(flight_booking_validator):
-    """
-    Tests the required slots for a 'round trip', ensuring 'return_date' is included.
-    """
-    tracker = Tracker.from_dict({"slots": {"booking_trip_type": "round trip"}})
-    required = flight_booking_validator.required_slots(tracker)
-    expected = [
+    ]),
+    # A round trip also needs the return date.
+    ({"booking_trip_type": "round trip"}, [
         "booking_trip_type",
         "departure_city",
         "destination_city",
@@ -603,46 +573,73 @@ def test_required_slots_round_trip(flight_booking_validator):
         "number_of_passengers",
         "preferred_airline",
         "frequent_flyer_number",
-    ]
-    assert required == expected
-
-
-def test_required_slots_multi_city_adding_more(flight_booking_validator):
-    """
-    Tests required slots for 'multi-city' when the user is still adding destinations.
-    """
-    tracker = Tracker.from_dict({"slots": {"booking_trip_type": "multi-city", "add_more_destinations": True}})
-    required = flight_booking_validator.required_slots(tracker)
-    expected = [
+    ]),
+    # Multi-city while the user is still adding destinations.
+    ({"booking_trip_type": "multi-city", "add_more_destinations": True}, [
         "booking_trip_type",
         "departure_city",
         "next_destination",
         "add_more_destinations",
         "departure_date",
         "number_of_passengers",
-        "travel_class", # Added new slot
+        "travel_class",
         "preferred_airline",
         "frequent_flyer_number",
-    ]
-    assert required == expected
-
-def test_required_slots_multi_city_done(flight_booking_validator):
-    """
-    Tests required slots for 'multi-city' after the user has finished adding destinations.
-    """
-    tracker = Tracker.from_dict({"slots": {"booking_trip_type": "multi-city", "add_more_destinations": False}})
-    required = flight_booking_validator.required_slots(tracker)
-    expected = [
+    ]),
+    # Multi-city after the user has finished adding destinations.
+    ({"booking_trip_type": "multi-city", "add_more_destinations": False}, [
         "booking_trip_type",
         "departure_city",
         "departure_date",
         "number_of_passengers",
-        "travel_class", # Added new slot
+        "travel_class",
         "preferred_airline",
         "frequent_flyer_number",
-    ]
+    ]),
+], ids=["no_trip_type", "one_way", "round_trip", "multi_city_adding_more", "multi_city_done"])
+def test_required_slots(flight_booking_validator, tracker_factory, slots, expected):
+    """Tests the required slots for each trip type and multi-city stage."""
+    required = flight_booking_validator.required_slots(tracker_factory(**slots))
     assert required == expected
 
+
+@pytest.mark.parametrize("user_input,expected_slot,expected_msg", [
+    ("3", 3, None),
+    ("a couple", None, "don't understand 'a couple' as a number"),
+    ("0", None, "must be at least 1"),
+])
+def test_validate_number_of_passengers(dispatcher, flight_booking_validator, empty_tracker, user_input, expected_slot, expected_msg):
+    """
+    Tests that a valid number of passengers is converted to an integer, and that
+    non-numeric or non-positive values are rejected.
+    """
+    # Arrange
+    tracker = empty_tracker
+
+    # Act
+    result = flight_booking_validator.validate_number_of_passengers(user_input, dispatcher, tracker, {})
+
+    # Assert
+    assert result == {"number_of_passengers": expected_slot}
+    if expected_msg is None:
+        assert len(dispatcher.messages) == 0
+    else:
+        assert len(dispatcher.messages) == 1
+        assert expected_msg in dispatcher.messages[0]["text"]
+
+def test_validate_number_of_passengers_correction(dispatcher, flight_booking_validator):
+    """
+    Tests that correcting the number of passengers is acknowledged.
+    """
+    tracker = Tracker.from_dict({
+        "slots": { "number_of_passengers": 1 }
+    })
+    result = flight_booking_validator.validate_number_of_passengers("2", dispatcher, tracker, {})
+    assert result == {"number_of_passengers": 2}
+    assert len(dispatcher.messages) == 1
+    assert "Okay, I've updated the number of passengers to 2." in dispatcher.messages[0]["text"]
+
+
 def test_required_slots_one_way_many_passengers(flight_booking_validator):
     """Tests that 'travel_class' is required for a one-way trip with > 4 passengers."""
     tracker = Tracker.from_dict({
@@ -666,103 +663,61 @@ def test_required_slots_one_way_few_passengers(flight_booking_validator):
     assert "travel_class" not in required
 
 
-def test_validate_preferred_airline_valid(flight_booking_validator):
+def test_validate_preferred_airline_valid(dispatcher, flight_booking_validator):
     """Tests that a valid airline is accepted."""
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({"latest_message": {"intent": {"name": "inform"}}})
     result = flight_booking_validator.validate_preferred_airline("AwesomeAirlines", dispatcher, tracker, {})
     assert result == {"preferred_airline": "AwesomeAirlines"}
     assert "Okay, I'll look for flights on AwesomeAirlines." in dispatcher.messages[0]["text"]
 
 
-def test_validate_preferred_airline_deny(flight_booking_validator):
+def test_validate_preferred_airline_deny(dispatcher, flight_booking_validator):
     """Tests that the user can deny having a preferred airline."""
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({"latest_message": {"intent": {"name": "deny"}}})
     result = flight_booking_validator.validate_preferred_airline("no", dispatcher, tracker, {})
     assert result == {"preferred_airline": None}
     assert "Okay, I'll search all available airlines." in dispatcher.messages[0]["text"]
 
 
-def test_validate_preferred_airline_no_entity(flight_booking_validator):
+def test_validate_preferred_airline_no_entity(dispatcher, flight_booking_validator):
     """Tests that the form moves on if no airline is extracted and it's not a deny."""
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({"latest_message": {"intent": {"name": "inform"}}})
     result = flight_booking_validator.validate_preferred_airline(None, dispatcher, tracker, {})
     assert result == {"preferred_airline": None}
     assert len(dispatcher.messages) == 0
 
 
-def test_validate_frequent_flyer_number_deny(flight_booking_validator):
-    """Tests that the user can deny providing a frequent flyer number."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"latest_message": {"intent": {"name": "deny"}}})
-    result = flight_booking_validator.validate_frequent_flyer_number("no", dispatcher, tracker, {})
-    assert result == {"frequent_flyer_number": None}
-    assert "Okay, no problem." in dispatcher.messages[0]["text"]
-
-
-def test_validate_frequent_flyer_number_no_airline(flight_booking_validator):
-    """Tests validation fails if preferred_airline is not set."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {"preferred_airline": None},
-        "latest_message": {"intent": {"name": "inform"}}
-    })
-    result = flight_booking_validator.validate_frequent_flyer_number("12345", dispatcher, tracker, {})
-    assert result == {"frequent_flyer_number": None}
-    assert "I need to know your preferred airline" in dispatcher.messages[0]["text"]
-
-
-def test_validate_frequent_flyer_number_no_value(flight_booking_validator):
-    """Tests validation when no frequent flyer number is provided by the user."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {"preferred_airline": "AwesomeAirlines"},
-        "latest_message": {"intent": {"name": "inform"}}
-    })
-    result = flight_booking_validator.validate_frequent_flyer_number(None, dispatcher, tracker, {})
-    assert result == {"frequent_flyer_number": None}
-    assert len(dispatcher.messages) == 0
-
-
-def test_validate_frequent_flyer_number_unknown_airline(flight_booking_validator):
-    """Tests that any number is accepted for an airline with no defined format."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {"preferred_airline": "UnknownAir"},
-        "latest_message": {"intent": {"name": "inform"}}
-    })
-    result = flight_booking_validator.validate_frequent_flyer_number("any-format-123", dispatcher, tracker, {})
-    assert result == {"frequent_flyer_number": "any-format-123"}
-    assert "Great, I've added your frequent flyer number" in dispatcher.messages[0]["text"]
-
-
-@pytest.mark.parametrize("airline, number, is_valid", [
-    ("AwesomeAirlines", "AA12345678", True),
-    ("AwesomeAirlines", "aa12345678", False),
-    ("AwesomeAirlines", "AA1234567", False),
-    ("AwesomeAirlines", "1234567890", False),
-    ("FlyHigh", "F-1234567", True),
-    ("FlyHigh", "F-123456", False),
-    ("FlyHigh", "f-1234567", False),
+@pytest.mark.parametrize("airline, intent, number, expected, message", [
+    # The user declines to give a number.
+    (None, "deny", "no", None, "Okay, no problem."),
+    # Safeguard: the airline must be known before its format can be checked.
+    (None, "inform", "12345", None, "I need to know your preferred airline"),
+    # Nothing was extracted, so the form just moves on.
+    ("AwesomeAirlines", "inform", None, None, None),
+    # Airlines without a known format accept any number.
+    ("UnknownAir", "inform", "any-format-123", "any-format-123", "Great, I've added your frequent flyer number"),
+    # Airline-specific formats.
+    ("AwesomeAirlines", "inform", "AA12345678", "AA12345678", "Great, I've added your frequent flyer number"),
+    ("AwesomeAirlines", "inform", "aa12345678", None, "That doesn't look like a valid frequent flyer number for AwesomeAirlines"),
+    ("AwesomeAirlines", "inform", "AA1234567", None, "That doesn't look like a valid frequent flyer number for AwesomeAirlines"),
+    ("AwesomeAirlines", "inform", "1234567890", None, "That doesn't look like a valid frequent flyer number for AwesomeAirlines"),
+    ("FlyHigh", "inform", "F-1234567", "F-1234567", "Great, I've added your frequent flyer number"),
+    ("FlyHigh", "inform", "F-123456", None, "That doesn't look like a valid frequent flyer number for FlyHigh"),
+    ("FlyHigh", "inform", "f-1234567", None, "That doesn't look like a valid frequent flyer number for FlyHigh"),
 ])
-def test_validate_frequent_flyer_number_specific_formats(flight_booking_validator, airline, number, is_valid):
-    """Tests validation against specific airline formats."""
-    dispatcher = CollectingDispatcher()
+def test_validate_frequent_flyer_number(dispatcher, flight_booking_validator, airline, intent, number, expected, message):
+    """Tests frequent flyer number validation across denials, safeguards and airline-specific formats."""
     tracker = Tracker.from_dict({
         "slots": {"preferred_airline": airline},
-        "latest_message": {"intent": {"name": "inform"}}
+        "latest_message": {"intent": {"name": intent}}
     })
     result = flight_booking_validator.validate_frequent_flyer_number(number, dispatcher, tracker, {})
 
-    if is_valid:
-        assert result == {"frequent_flyer_number": number}
-        assert "Great, I've added your frequent flyer number" in dispatcher.messages[0]["text"]
+    assert result == {"frequent_flyer_number": expected}
+    if message is None:
+        assert len(dispatcher.messages) == 0
     else:
-        assert result == {"frequent_flyer_number": None}
-        assert "That doesn't look like a valid frequent flyer number" in dispatcher.messages[0]["text"]
-        assert f"for {airline}" in dispatcher.messages[0]["text"]
+        assert message in dispatcher.messages[0]["text"]
 
 
 @pytest.mark.parametrize("user_input, expected_result", [
@@ -776,13 +731,12 @@ def test_validate_frequent_flyer_number_specific_formats(flight_booking_validato
         "destinations_iata": []
     }),
 ])
-def test_validate_booking_trip_type_valid(flight_booking_validator, user_input, expected_result):
+def test_validate_booking_trip_type_valid(dispatcher, flight_booking_validator, empty_tracker, user_input, expected_result):
     """
     Tests that various valid trip type inputs are normalized correctly.
     """
     # Arrange
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
 
     # Act
     result = flight_booking_validator.validate_booking_trip_type(user_input, dispatcher, tracker, {})
@@ -792,10 +746,9 @@ def test_validate_booking_trip_type_valid(flight_booking_validator, user_input,
     assert len(dispatcher.messages) == 0
 
 
-def test_validate_booking_trip_type_invalid(flight_booking_validator):
+def test_validate_booking_trip_type_invalid(dispatcher, flight_booking_validator, empty_tracker):
     """Tests that an invalid trip type is rejected."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
     result = flight_booking_validator.validate_booking_trip_type("a return ticket", dispatcher, tracker, {})
     assert result == {"booking_trip_type": None}
     assert "I didn't understand the trip type" in dispatcher.messages[0]["text"]
@@ -806,14 +759,13 @@ def test_validate_booking_trip_type_invalid(flight_booking_validator):
     (False, False), # Corresponds to 'deny' intent
     (None, False)   # Corresponds to any other intent or no input
 ])
-def test_validate_add_more_destinations(flight_booking_validator, slot_value, expected_bool):
+def test_validate_add_more_destinations(dispatcher, flight_booking_validator, empty_tracker, slot_value, expected_bool):
     """
     Tests that the add_more_destinations validation correctly handles boolean inputs
     from the from_intent mapping.
     """
     # Arrange
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
 
     # Act
     result = flight_booking_validator.validate_add_more_destinations(
@@ -825,38 +777,34 @@ def test_validate_add_more_destinations(flight_booking_validator, slot_value, ex
     assert len(dispatcher.messages) == 0
 
 
-def test_action_confirm_booking():
+def test_action_confirm_booking(dispatcher, shared_actions, empty_tracker):
     """
     Tests that the ActionConfirmBooking sends the correct confirmation message.
     """
     # Arrange
-    action = ActionConfirmBooking()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})  # State doesn't matter for this simple action
+    tracker = empty_tracker  # State doesn't matter for this simple action
 
     # Act
-    action.run(dispatcher, tracker, {})
+    shared_actions.confirm_booking.run(dispatcher, tracker, {})
 
     # Assert
     assert len(dispatcher.messages) == 1
     assert dispatcher.messages[0]["response"] == "utter_booking_confirmed"
 
 
-def test_action_set_flight_and_ask_confirm_with_id():
+def test_action_set_flight_and_ask_confirm_with_id(dispatcher, shared_actions):
     """
     Tests that the confirmation action works correctly when a flight_id is present.
     """
     # Arrange
-    action = ActionSetFlightAndAskConfirm()
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
         "latest_message": {
-            "entities": [{"entity": "flight_id", "value": "FH456"}]
+            "entities": FLIGHT_FH456_ENTITY
         }
     })
 
     # Act
-    action.run(dispatcher, tracker, {})
+    shared_actions.set_flight_and_ask_confirm.run(dispatcher, tracker, {})
 
     # Assert
     assert len(dispatcher.messages) == 1
@@ -867,275 +815,192 @@ def test_action_set_flight_and_ask_confirm_with_id():
     assert message["buttons"][0]["payload"] == "/confirm_booking"
 
 
-def test_action_set_flight_and_ask_confirm_without_id():
+def test_action_set_flight_and_ask_confirm_without_id(dispatcher, shared_actions, empty_tracker):
     """
     Tests that the confirmation action handles the case where no flight_id is found.
     """
     # Arrange
-    action = ActionSetFlightAndAskConfirm()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"latest_message": {"entities": []}})
+    tracker = empty_tracker  # A message without entities carries no flight_id
 
     # Act
-    action.run(dispatcher, tracker, {})
+    shared_actions.set_flight_and_ask_confirm.run(dispatcher, tracker, {})
 
     # Assert
     assert len(dispatcher.messages) == 1
     assert "something went wrong" in dispatcher.messages[0]["text"]
 
 
-def test_action_delete_preference_success(mocker):
+@pytest.mark.parametrize("tracker", ["preference_owner"], indirect=True)
+@pytest.mark.parametrize("deleted, expected_response", [
+    (True, "utter_preference_deleted"),
+    # No record was found to delete.
+    (False, "utter_no_preference_to_delete"),
+], ids=["success", "not_found"])
+def test_action_delete_preference(shared_actions, dispatcher, tracker, monkeypatch, deleted, expected_response):
     """
-    Tests that ActionDeletePreference works when a preference is successfully deleted.
+    Tests that ActionDeletePreference reports whether a stored preference was deleted.
     """
     # Arrange
-    action = ActionDeletePreference()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"sender_id": "test_user"})
-
-    mock_db_client = mocker.MagicMock(spec=DatabaseClient)
-    mock_db_client.pool = True
-    mock_db_client.delete_user_preference.return_value = True # Simulate successful deletion
-    mocker.patch('actions.actions.db_client', mock_db_client)
+    fake_db_client = FakeDBClient(delete_result=deleted)
+    monkeypatch.setattr(_actions_mod, 'db_client', fake_db_client)
 
     # Act
-    action.run(dispatcher, tracker, {})
+    shared_actions.delete_preference.run(dispatcher, tracker, {})
 
     # Assert
-    mock_db_client.delete_user_preference.assert_called_once_with("test_user", "seat_preference")
-    assert dispatcher.messages[0]["response"] == "utter_preference_deleted"
-
-
-def test_action_delete_preference_not_found(mocker):
-    """
-    Tests that ActionDeletePreference works when there is no preference to delete.
-    """
-    action = ActionDeletePreference()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"sender_id": "test_user"})
-
-    mock_db_client = mocker.MagicMock(spec=DatabaseClient)
-    mock_db_client.pool = True
-    mock_db_client.delete_user_preference.return_value = False # Simulate no record was found/deleted
-    mocker.patch('actions.actions.db_client', mock_db_client)
+    assert fake_db_client.delete_calls == [("test_user", "seat_preference")]
+    assert dispatcher.messages[0]["response"] == expected_response
 
-    action.run(dispatcher, tracker, {})
-
-    mock_db_client.delete_user_preference.assert_called_once_with("test_user", "seat_preference")
-    assert dispatcher.messages[0]["response"] == "utter_no_preference_to_delete"
-    
-def test_action_ask_confirm_cancellation():
+def test_action_ask_confirm_cancellation(shared_actions, dispatcher, empty_tracker):
     """Tests that the ask confirmation action sends a message and sets a slot."""
-    action = ActionAskConfirmCancellation()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
-    events = action.run(dispatcher, tracker, {})
+    tracker = empty_tracker
+    events = shared_actions.ask_confirm_cancellation.run(dispatcher, tracker, {})
     assert len(dispatcher.messages) == 1
     assert dispatcher.messages[0]["response"] == "utter_ask_confirm_cancellation"
     assert events == [SlotSet("cancellation_pending", True)]
 
 
-def test_action_resume_booking():
-    """Tests that the resume action sends a generic message if no slots are filled."""
-    action = ActionResumeBooking()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": { "cancellation_pending": True }
-    })
-    events = action.run(dispatcher, tracker, {})
-    assert len(dispatcher.messages) == 1
-    assert dispatcher.messages[0]["response"] == "utter_resume_booking"
-    assert events == [SlotSet("cancellation_pending", None)]
-
-
-def test_action_resume_booking_with_filled_slots():
-    """Tests that the resume action summarizes filled slots in a sentence."""
-    action = ActionResumeBooking()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {
-            "booking_trip_type": "one-way",
-            "departure_city": "London",
-            "number_of_passengers": 2,
-            "cancellation_pending": True
-        }
-    })
-    events = action.run(dispatcher, tracker, {})
+@pytest.mark.parametrize("tracker, expected_response, expected_summary", [
+    # With no slots filled, a generic message is sent.
+    ("cancel_pending", "utter_resume_booking", None),
+    # Filled slots are summarized in a sentence.
+    ("resume_filled", "utter_form_summary_sentence", EXPECTED_RESUME_SUMMARY),
+], indirect=["tracker"], ids=["no_slots", "filled_slots"])
+def test_action_resume_booking(shared_actions, dispatcher, tracker, expected_response, expected_summary):
+    """Tests that the resume action either resumes generically or summarizes the filled slots."""
+    events = shared_actions.resume_booking.run(dispatcher, tracker, {})
     assert len(dispatcher.messages) == 1
     message = dispatcher.messages[0]
-    assert message["response"] == "utter_form_summary_sentence"
-    summary = message["template_vars"]["summary"]
-    assert summary == "a one-way trip for 2 passenger(s) from London"
+    assert message["response"] == expected_response
+    if expected_summary:
+        assert message["template_vars"]["summary"] == expected_summary
     assert events == [SlotSet("cancellation_pending", None)]
 
 
-def test_action_cancel_booking():
+def test_action_cancel_booking(shared_actions, dispatcher, empty_tracker):
     """Tests that the cancellation action deactivates the loop and resets slots."""
-    action = ActionCancelBooking()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
-    events = action.run(dispatcher, tracker, {})
+    tracker = empty_tracker
+    events = shared_actions.cancel_booking.run(dispatcher, tracker, {})
     assert len(dispatcher.messages) == 1
     assert dispatcher.messages[0]["response"] == "utter_ok_cancelled"
-    assert any(isinstance(e, ActiveLoop) and e.name is None for e in events)
-    assert any(isinstance(e, AllSlotsReset) for e in events)
-
-
-def test_action_review_and_confirm(mocker):
+    # rasa_sdk events are plain dicts, so index them by their "event" type in one pass.
+    events_by_type = {e["event"]: e for e in events}
+    assert events_by_type["active_loop"] == ActiveLoop(None)
+    assert events_by_type["reset_slots"] == AllSlotsReset()
+
+
+@pytest.mark.parametrize("slots, expected_summary", [
+    ({}, ""),
+    ({"booking_trip_type": "one-way", "departure_city": "London", "number_of_passengers": 2},
+     EXPECTED_RESUME_SUMMARY),
+    ({"booking_trip_type": "round-trip", "departure_city": "New York", "destination_city": "London",
+      "departure_date": "2025-02-10", "return_date": "2025-02-20", "number_of_passengers": 1},
+     "a round-trip trip for 1 passenger(s) from New York to London departing on 2025-02-10 and returning on 2025-02-20"),
+    # Multi-city routes are chained, and the destination_city slot is ignored.
+    ({"booking_trip_type": "multi-city", "departure_city": "London", "destination_city": "Rome",
+      "destinations": ["Paris", "Berlin"]},
+     "a multi-city trip from London to Paris -> Berlin"),
+    ({"departure_city": "London", "travel_class": "business", "preferred_airline": "FlyHigh"},
+     "from London in business class on FlyHigh"),
+], ids=["empty", "one_way", "round_trip", "multi_city", "class_and_airline"])
+def test_build_summary_sentence(tracker_factory, slots, expected_summary):
+    """Tests the booking summary sentence built from the filled slots, without running an action."""
+    assert _build_summary_sentence(tracker_factory(**slots)) == expected_summary
+
+
+@pytest.mark.parametrize("tracker", ["review"], indirect=True)
+def test_action_review_and_confirm(shared_actions, dispatcher, tracker, mocker):
     """Tests that the review action summarizes details and provides confirmation buttons."""
-    action = ActionReviewAndConfirm()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {
-            "booking_trip_type": "one-way",
-            "departure_city": "London",
-            "destination_city": "Paris",
-            "number_of_passengers": 1,
-            "departure_date": "2025-03-10"
-        }
-    })
 
-    action.run(dispatcher, tracker, {})
+    shared_actions.review_and_confirm.run(dispatcher, tracker, {})
 
     assert len(dispatcher.messages) == 1
     message = dispatcher.messages[0]
     assert message["response"] == "utter_ask_confirm_details"
     summary = message["template_vars"]["summary"]
-    assert summary == "a one-way trip for 1 passenger(s) from London to Paris departing on 2025-03-10"
+    assert summary == EXPECTED_REVIEW_SUMMARY
     assert len(message["buttons"]) == 2
     assert message["buttons"][0]["payload"] == "/confirm_details"
     assert message["buttons"][1]["payload"] == "/deny_details"
     assert message["buttons"][1]["title"] == "No, something's wrong"
 
-def test_action_handle_correction(mocker):
+@pytest.mark.parametrize("tracker", ["correction_destination"], indirect=True)
+def test_action_handle_correction(dispatcher, tracker, handle_correction_action, mock_flight_validator):
     """Tests that the correction action validates and sets the new slot value."""
-    action = ActionHandleCorrection()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {
-            "departure_city": "London",
-            "destination_city": "Paris"
-        },
-        "latest_message": {
-            "intent": {"name": "correct_info"},
-            "entities": [{"entity": "city", "value": "Berlin", "role": "destination"}]
-        }
-    })
-
-    # Mock the validator and its method
-    mock_validator = mocker.patch('actions.actions.ValidateFlightBookingForm', autospec=True).return_value
-    mock_validator.validate_destination_city.return_value = {
+    mock_flight_validator.validate_destination_city.return_value = {
         "destination_city": "Berlin",
         "destination_city_iata": "BER"
     }
 
-    events = action.run(dispatcher, tracker, {})
+    events = handle_correction_action.run(dispatcher, tracker, {})
 
-    assert SlotSet("destination_city", "Berlin") in events
-    assert SlotSet("destination_city_iata", "BER") in events
-    assert FollowupAction("action_review_and_confirm") in events
-    mock_validator.validate_destination_city.assert_called_once()
+    slot_values, followups = _index_events(events)
+    assert slot_values["destination_city"] == "Berlin"
+    assert slot_values["destination_city_iata"] == "BER"
+    assert followups == ["action_review_and_confirm"]
+    mock_flight_validator.validate_destination_city.assert_called_once()
 
-def test_action_handle_correction_multi_city(mocker):
+@pytest.mark.parametrize("tracker", ["correction_last_destination"], indirect=True)
+def test_action_handle_correction_multi_city(dispatcher, tracker, handle_correction_action, mock_flight_validator):
     """Tests correcting the last destination of a multi-city trip."""
-    action = ActionHandleCorrection()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {
-            "booking_trip_type": "multi-city",
-            "departure_city": "London",
-            "destinations": ["Paris", "Rome"],
-            "destinations_iata": ["CDG", "FCO"]
-        },
-        "latest_message": {
-            "intent": {"name": "correct_info"},
-            "entities": [{"entity": "city", "value": "Berlin", "role": "destination"}]
-        }
-    })
-
-    # Mock the validator and its _validate_city helper method
-    mock_validator = mocker.patch('actions.actions.ValidateFlightBookingForm', autospec=True).return_value
-    mock_validator._validate_city.return_value = {
+    mock_flight_validator._validate_city.return_value = {
         "next_destination": "Berlin",
         "next_destination_iata": "BER"
     }
 
-    events = action.run(dispatcher, tracker, {})
+    events = handle_correction_action.run(dispatcher, tracker, {})
 
-    mock_validator._validate_city.assert_called_once_with("next_destination", "Berlin", dispatcher)
-    assert SlotSet("destinations", ["Paris", "Berlin"]) in events
-    assert SlotSet("destinations_iata", ["CDG", "BER"]) in events
-    assert FollowupAction("action_review_and_confirm") in events
+    assert mock_flight_validator._validate_city.call_count == 1
+    assert mock_flight_validator._validate_city.call_args.args == ("next_destination", "Berlin", dispatcher)
+    slot_values, followups = _index_events(events)
+    assert slot_values["destinations"] == ["Paris", "Berlin"]
+    assert slot_values["destinations_iata"] == ["CDG", "BER"]
+    assert followups == ["action_review_and_confirm"]
 
-def test_action_handle_correction_specific_multi_city_destination(mocker):
+@pytest.mark.parametrize("tracker", ["correction_second_destination"], indirect=True)
+def test_action_handle_correction_specific_multi_city_destination(dispatcher, tracker, handle_correction_action, mock_flight_validator):
     """Tests correcting a specific destination (e.g., the second) of a multi-city trip."""
-    action = ActionHandleCorrection()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {
-            "booking_trip_type": "multi-city",
-            "departure_city": "London",
-            "destinations": ["Paris", "Rome"],
-            "destinations_iata": ["CDG", "FCO"]
-        },
-        "latest_message": {
-            "intent": {"name": "correct_info"},
-            "entities": [
-                {"entity": "ordinal", "value": "second"},
-                {"entity": "city", "value": "Berlin", "role": "destination"}
-            ]
-        }
-    })
-
-    # Mock the validator and its _validate_city helper method
-    mock_validator = mocker.patch('actions.actions.ValidateFlightBookingForm', autospec=True).return_value
-    mock_validator._validate_city.return_value = {
+    mock_flight_validator._validate_city.return_value = {
         "next_destination": "Berlin",
         "next_destination_iata": "BER"
     }
 
-    events = action.run(dispatcher, tracker, {})
+    events = handle_correction_action.run(dispatcher, tracker, {})
 
     # Assert that the second destination (index 1) was changed
-    assert SlotSet("destinations", ["Paris", "Berlin"]) in events
-    assert SlotSet("destinations_iata", ["CDG", "BER"]) in events
-    assert FollowupAction("action_review_and_confirm") in events
+    slot_values, followups = _index_events(events)
+    assert slot_values["destinations"] == ["Paris", "Berlin"]
+    assert slot_values["destinations_iata"] == ["CDG", "BER"]
+    assert followups == ["action_review_and_confirm"]
 
-def test_validate_travel_class_valid(flight_booking_validator):
+def test_validate_travel_class_valid(dispatcher, flight_booking_validator, empty_tracker):
     """Tests that a valid travel class is accepted."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
     result = flight_booking_validator.validate_travel_class("economy", dispatcher, tracker, {})
     assert result == {"travel_class": "economy"}
     assert "Okay, searching for flights in economy class." in dispatcher.messages[0]["text"]
 
-def test_validate_travel_class_invalid(flight_booking_validator):
+def test_validate_travel_class_invalid(dispatcher, flight_booking_validator, empty_tracker):
     """Tests that an invalid travel class is rejected."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
     result = flight_booking_validator.validate_travel_class("premium economy", dispatcher, tracker, {})
     assert result == {"travel_class": None}
     assert "is not a valid travel class" in dispatcher.messages[0]["text"]
     assert "Please choose from: economy, business, first" in dispatcher.messages[0]["text"]
 
-def test_action_search_flights_with_travel_class(mock_api_client):
+def test_action_search_flights_with_travel_class(dispatcher, shared_actions, mock_api_client):
     """Tests ActionSearchFlights passes travel_class to the API client."""
-    action = ActionSearchFlights()
-    dispatcher = CollectingDispatcher()
     tracker = Tracker.from_dict({
-        "slots": {
-            "departure_city_iata": "JFK", "destination_city_iata": "LHR",
-            "departure_date": "2025-02-10", "number_of_passengers": 1,
-            "travel_class": "business" # New slot value
-        }
+        "slots": {**SEARCH_SLOTS, "travel_class": "business"} # New slot value
     })
     mock_api_client.search.return_value = [
         {"airline": "TestAir", "time": "10:00", "price": 1500, "flight_id": "TA100B"}
     ]
 
-    action.run(dispatcher, tracker, {})
+    asyncio.run(shared_actions.search_flights.run(dispatcher, tracker, {}))
 
-    mock_api_client.search.assert_called_once_with(
+    assert mock_api_client.search.call_count == 1
+    assert mock_api_client.search.call_args.kwargs == dict(
         departure_city="JFK", destination_city="LHR", departure_date="2025-02-10",
         return_date=None, passengers=1, preferred_airline=None,
         frequent_flyer_number=None, seat_preference=None, destinations=None,
@@ -1143,31 +1008,19 @@ def test_action_search_flights_with_travel_class(mock_api_client):
     )
     assert "Here are some flights I found:" in dispatcher.messages[1]["text"]
 
-def test_action_handle_correction_date(mocker):
+@pytest.mark.parametrize("tracker", ["correction_date"], indirect=True)
+def test_action_handle_correction_date(dispatcher, tracker, handle_correction_action, mock_flight_validator):
     """Tests that correcting a date entity is handled correctly."""
-    action = ActionHandleCorrection()
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({
-        "slots": {
-            "departure_date": "2025-03-10"
-        },
-        "latest_message": {
-            "intent": {"name": "correct_info"},
-            "entities": [{"entity": "departure_date", "value": "March 11th 2025"}]
-        }
-    })
-
-    # Mock the validator and its method
-    mock_validator = mocker.patch('actions.actions.ValidateFlightBookingForm', autospec=True).return_value
-    mock_validator.validate_departure_date.return_value = {
+    mock_flight_validator.validate_departure_date.return_value = {
         "departure_date": "2025-03-11"
     }
 
-    events = action.run(dispatcher, tracker, {})
+    events = handle_correction_action.run(dispatcher, tracker, {})
 
-    assert SlotSet("departure_date", "2025-03-11") in events
-    assert FollowupAction("action_review_and_confirm") in events
-    mock_validator.validate_departure_date.assert_called_once()
+    slot_values, followups = _index_events(events)
+    assert slot_values["departure_date"] == "2025-03-11"
+    assert followups == ["action_review_and_confirm"]
+    mock_flight_validator.validate_departure_date.assert_called_once()
 
 
 @pytest.fixture
@@ -1184,62 +1037,56 @@ def car_booking_validator():
 
 # --- Tests for ValidateCarBookingForm ---
 
-def test_validate_pickup_location(car_booking_validator):
+def test_validate_pickup_location(dispatcher, car_booking_validator, empty_tracker):
     """Tests that a valid pickup location is accepted."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
     result = car_booking_validator.validate_pickup_location("Los Angeles", dispatcher, tracker, {})
     assert result == {"pickup_location": "Los Angeles"}
     assert len(dispatcher.messages) == 0
     
-def test_validate_pickup_date_future(car_booking_validator, monkeypatch):
+def test_validate_pickup_date_future(dispatcher, car_booking_validator, mocker, empty_tracker):
     """Tests that a valid future pickup date is accepted."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
 
     class MockDate(datetime.date):
         @classmethod
         def today(cls):
             return cls(2025, 6, 10)
-    monkeypatch.setattr(datetime, 'date', MockDate)
+    mocker.patch.object(_actions_mod, 'date', MockDate)
 
     result = car_booking_validator.validate_pickup_date("June 12th 2025", dispatcher, tracker, {})
     assert result == {"pickup_date": "2025-06-12"}
 
-def test_validate_pickup_date_past(car_booking_validator, monkeypatch):
+def test_validate_pickup_date_past(dispatcher, car_booking_validator, mocker, empty_tracker):
     """Tests that a past pickup date is rejected."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
 
     class MockDate(datetime.date):
         @classmethod
         def today(cls):
             return cls(2025, 6, 10)
-    monkeypatch.setattr(datetime, 'date', MockDate)
+    mocker.patch.object(_actions_mod, 'date', MockDate)
 
     result = car_booking_validator.validate_pickup_date("yesterday", dispatcher, tracker, {})
     assert result == {"pickup_date": None}
     assert "You can't rent a car in the past!" in dispatcher.messages[0]["text"]
 
-def test_validate_dropoff_date_valid(car_booking_validator):
+def test_validate_dropoff_date_valid(dispatcher, car_booking_validator, tracker_factory):
     """Tests that a valid dropoff date is accepted."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"slots": {"pickup_date": "2025-06-12"}})
+    tracker = tracker_factory(pickup_date="2025-06-12")
     result = car_booking_validator.validate_dropoff_date("June 15th 2025", dispatcher, tracker, {})
     assert result == {"dropoff_date": "2025-06-15"}
 
-def test_validate_dropoff_date_before_pickup(car_booking_validator):
+def test_validate_dropoff_date_before_pickup(dispatcher, car_booking_validator, tracker_factory):
     """Tests that a dropoff date before the pickup date is rejected."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({"slots": {"pickup_date": "2025-06-12"}})
+    tracker = tracker_factory(pickup_date="2025-06-12")
     result = car_booking_validator.validate_dropoff_date("June 10th 2025", dispatcher, tracker, {})
     assert result == {"dropoff_date": None}
     assert "The drop-off date must be after the pickup date." in dispatcher.messages[0]["text"]
 
-def test_validate_pickup_location_typo(car_booking_validator, mock_db_client_car):
+def test_validate_pickup_location_typo(dispatcher, car_booking_validator, mock_db_client_car, empty_tracker):
     """Tests that a pickup location with a typo is corrected."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
     mock_db_client_car.get_all_city_names.return_value = ["Los Angeles", "New York"]
 
     result = car_booking_validator.validate_pickup_location("Los Angles", dispatcher, tracker, {})
@@ -1259,26 +1106,23 @@ def test_validate_pickup_location_typo(car_booking_validator, mock_db_client_car
     ("I want a mid-size car", "mid-size"),
     ("luxury", "luxury"),
 ])
-def test_validate_car_type_valid(car_booking_validator, user_input, expected_value):
+def test_validate_car_type_valid(dispatcher, car_booking_validator, empty_tracker, user_input, expected_value):
     """Tests that various valid car types are accepted and normalized."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
     result = car_booking_validator.validate_car_type(user_input, dispatcher, tracker, {})
     assert result == {"car_type": expected_value}
 
-def test_validate_car_type_invalid(car_booking_validator):
+def test_validate_car_type_invalid(dispatcher, car_booking_validator, empty_tracker):
     """Tests that an invalid car type is rejected."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
     result = car_booking_validator.validate_car_type("a minivan", dispatcher, tracker, {})
     assert result == {"car_type": None}
     assert "is not a valid car type" in dispatcher.messages[0]["text"]
     assert "economy, compact, mid-size" in dispatcher.messages[0]["text"]
 
-def test_validate_pickup_location_invalid(car_booking_validator, mock_db_client_car):
+def test_validate_pickup_location_invalid(dispatcher, car_booking_validator, mock_db_client_car, empty_tracker):
     """Tests that an invalid pickup location is rejected."""
-    dispatcher = CollectingDispatcher()
-    tracker = Tracker.from_dict({})
+    tracker = empty_tracker
     mock_db_client_car.get_all_city_names.return_value = ["Los Angeles", "New York"]
 
     result = car_booking_validator.validate_pickup_location("Atlantis", dispatcher, tracker, {})
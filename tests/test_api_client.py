@@ -1,12 +1,40 @@
-import datetime
-import json
+import threading
+import time
+import orjson
 import pytest
 import redis
+import requests
 from unittest.mock import MagicMock
 from requests.exceptions import RequestException
 
-from actions.api_client import AeroDataApiClient, SkyscannerApiClient, RedisCache, SabreApiClient, BaseFlightApiClient
-from actions.car_rental_api_client import HertzApiClient, AvisApiClient, EnterpriseApiClient
+from actions import api_client, car_rental_api_client
+from actions.api_client import AeroDataApiClient, AllProvidersFlightApiClient, SkyscannerApiClient, RedisCache, SabreApiClient, BaseFlightApiClient, DuffelApiClient, KiwiApiClient, _format_hhmm
+from actions.car_rental_api_client import HertzApiClient, AvisApiClient, EnterpriseApiClient, AllProvidersCarRentalApiClient, CarOffer
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_client_state():
+    """Ensures OAuth tokens, shared caches, breakers and the memoized clients don't leak between tests."""
+    api_client._TOKEN_CACHE.clear()
+    api_client._flight_cache = None
+    car_rental_api_client._car_cache = None
+    car_rental_api_client.BaseCarRentalApiClient._breakers.clear()
+    api_client.get_api_client.cache_clear()
+    car_rental_api_client.get_car_rental_api_client.cache_clear()
+    yield
+    api_client._TOKEN_CACHE.clear()
+    api_client._flight_cache = None
+    car_rental_api_client._car_cache = None
+    car_rental_api_client.BaseCarRentalApiClient._breakers.clear()
+    api_client.get_api_client.cache_clear()
+    car_rental_api_client.get_car_rental_api_client.cache_clear()
+
+def _response(content: bytes, status_code: int = 200) -> requests.Response:
+    """Builds a real requests.Response with the given body, cheaper than configuring a MagicMock."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = content
+    return response
 
 # Sample raw response from the fictional AeroData API
 MOCK_AERODATA_RESPONSE = {
@@ -74,11 +102,9 @@ def test_aerodata_search_success(monkeypatch, mocker):
     # Arrange
     monkeypatch.setenv("AERODATA_API_KEY", "test-key-123")
     
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = MOCK_AERODATA_RESPONSE
+    mock_response = _response(orjson.dumps(MOCK_AERODATA_RESPONSE))
     
-    mock_requests_get = mocker.patch("requests.get", return_value=mock_response)
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=mock_response)
     
     client = AeroDataApiClient()
     
@@ -97,7 +123,7 @@ def test_aerodata_search_success(monkeypatch, mocker):
         "to": "JFK",
         "date": "2025-03-10"
     }
-    assert call_kwargs["headers"] == {"X-API-Key": "test-key-123"}
+    assert client.session.headers["X-API-Key"] == "test-key-123"
     assert results == EXPECTED_TRANSFORMED_DATA
 
 def test_aerodata_search_api_failure(monkeypatch, mocker):
@@ -105,7 +131,7 @@ def test_aerodata_search_api_failure(monkeypatch, mocker):
     # Arrange
     monkeypatch.setenv("AERODATA_API_KEY", "test-key-123")
     
-    mocker.patch("requests.get", side_effect=RequestException("API is down"))
+    mocker.patch("requests.Session.get", side_effect=RequestException("API is down"))
     
     client = AeroDataApiClient()
     
@@ -164,6 +190,7 @@ EXPECTED_SABRE_TRANSFORMED_DATA = [
     }
 ]
 
+
 def test_sabre_client_init_without_keys(monkeypatch, caplog):
     """Tests that the Sabre client logs a warning if API keys are not set."""
     monkeypatch.delenv("SABRE_CLIENT_ID", raising=False)
@@ -179,16 +206,21 @@ def test_sabre_transform_response():
     transformed = client._transform_response(MOCK_SABRE_RESPONSE)
     assert transformed == EXPECTED_SABRE_TRANSFORMED_DATA
 
+def test_sabre_transform_response_skips_malformed_itinerary():
+    """Tests that itineraries without a flight segment are skipped instead of crashing."""
+    client = SabreApiClient()
+    response = {"PricedItineraries": [{"AirItinerary": {}}] + MOCK_SABRE_RESPONSE["PricedItineraries"]}
+    transformed = client._transform_response(response)
+    assert transformed == EXPECTED_SABRE_TRANSFORMED_DATA
+
 def test_sabre_get_access_token_success(monkeypatch, mocker):
     """Tests successful retrieval of a Sabre access token."""
     # Arrange
     monkeypatch.setenv("SABRE_CLIENT_ID", "test-id")
     monkeypatch.setenv("SABRE_CLIENT_SECRET", "test-secret")
 
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = MOCK_SABRE_TOKEN_RESPONSE
-    mock_post = mocker.patch("requests.post", return_value=mock_response)
+    mock_response = _response(orjson.dumps(MOCK_SABRE_TOKEN_RESPONSE))
+    mock_post = mocker.patch("requests.Session.post", return_value=mock_response)
 
     client = SabreApiClient()
 
@@ -202,12 +234,88 @@ def test_sabre_get_access_token_success(monkeypatch, mocker):
     assert "Authorization" in call_kwargs["headers"]
     assert call_kwargs["headers"]["Authorization"].startswith("Basic ")
 
+def test_sabre_token_request_is_not_retried(monkeypatch, mocker):
+    """Tests that token requests use a non-retrying session and a short timeout, since searches queue behind them."""
+    # Arrange
+    monkeypatch.setenv("SABRE_CLIENT_ID", "test-id")
+    monkeypatch.setenv("SABRE_CLIENT_SECRET", "test-secret")
+    mock_post = mocker.patch("requests.Session.post", return_value=_response(orjson.dumps(MOCK_SABRE_TOKEN_RESPONSE)))
+    client = SabreApiClient()
+
+    # Act
+    client._get_access_token()
+
+    # Assert
+    assert client._token_session.get_adapter("https://").max_retries.total == 0
+    assert client.session.get_adapter("https://").max_retries.total == 3
+    assert mock_post.call_args.kwargs["timeout"] == api_client.TOKEN_REQUEST_TIMEOUT
+
+def test_sabre_access_token_shared_across_instances(monkeypatch, mocker):
+    """Tests that a valid token fetched by one client instance is reused by the next."""
+    # Arrange
+    monkeypatch.setenv("SABRE_CLIENT_ID", "test-id")
+    monkeypatch.setenv("SABRE_CLIENT_SECRET", "test-secret")
+
+    mock_response = _response(orjson.dumps(MOCK_SABRE_TOKEN_RESPONSE))
+    mock_post = mocker.patch("requests.Session.post", return_value=mock_response)
+
+    # Act
+    first_token = SabreApiClient()._get_access_token()
+    second_token = SabreApiClient()._get_access_token()
+
+    # Assert
+    assert first_token == second_token == "mock-sabre-token"
+    mock_post.assert_called_once()
+
+def test_sabre_token_fetch_serialized(monkeypatch, mocker):
+    """Tests that concurrent token requests on a cold cache send a single auth request."""
+    # Arrange
+    monkeypatch.setenv("SABRE_CLIENT_ID", "test-id")
+    monkeypatch.setenv("SABRE_CLIENT_SECRET", "test-secret")
+
+    def slow_post(*args, **kwargs):
+        time.sleep(0.1)
+        return _response(orjson.dumps(MOCK_SABRE_TOKEN_RESPONSE))
+
+    mock_post = mocker.patch("requests.Session.post", side_effect=slow_post)
+    client = SabreApiClient()
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(client._get_access_token())) for _ in range(10)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert mock_post.call_count == 1
+    assert tokens == ["mock-sabre-token"] * 10
+
+def test_sabre_search_cache_hit_skips_token_request(monkeypatch, mocker):
+    """Tests that a cached Sabre search returns without fetching a token or sending a request."""
+    # Arrange
+    monkeypatch.setenv("SABRE_CLIENT_ID", "test-id")
+    monkeypatch.setenv("SABRE_CLIENT_SECRET", "test-secret")
+    mock_post = mocker.patch("requests.Session.post")
+    client = SabreApiClient()
+    client.cache = DictCache()
+    cache_key = client._cache_key("DFW", "LAX", "2025-09-15")
+    client.cache[cache_key] = EXPECTED_SABRE_TRANSFORMED_DATA
+
+    # Act
+    results = client.search(departure_city="DFW", destination_city="LAX", departure_date="2025-09-15")
+
+    # Assert
+    assert results == EXPECTED_SABRE_TRANSFORMED_DATA
+    mock_post.assert_not_called()
+
 def test_sabre_search_token_failure(monkeypatch, mocker):
     """Tests that search fails if it cannot get an access token."""
     # Arrange
     monkeypatch.setenv("SABRE_CLIENT_ID", "test-id")
     monkeypatch.setenv("SABRE_CLIENT_SECRET", "test-secret")
-    mocker.patch("requests.post", side_effect=RequestException("Auth failed"))
+    mocker.patch("requests.Session.post", side_effect=RequestException("Auth failed"))
     client = SabreApiClient()
 
     # Act
@@ -274,22 +382,44 @@ def test_skyscanner_client_init_without_key(monkeypatch, caplog):
     assert "SKYSCRANNER_API_KEY" in caplog.text
     assert "not configured" in caplog.text
 
+def test_aerodata_search_malformed_body(monkeypatch, mocker):
+    """Tests that a response body that is not valid JSON is handled like any other request failure."""
+    # Arrange
+    monkeypatch.setenv("AERODATA_API_KEY", "test-key-123")
+    mock_response = _response(b"<html>Bad Gateway</html>")
+    mocker.patch("requests.Session.get", return_value=mock_response)
+
+    # Act
+    results = AeroDataApiClient().search(departure_city="LHR", destination_city="JFK", departure_date="2025-03-10")
+
+    # Assert
+    assert results is None
+
 def test_skyscanner_transform_response():
     """Tests the Skyscanner response transformation logic."""
     client = SkyscannerApiClient()
     transformed = client._transform_response(MOCK_SKYSCANNER_RESPONSE)
     assert transformed == EXPECTED_SKYSCANNER_TRANSFORMED_DATA
 
+def test_skyscanner_transform_skips_incomplete_itineraries():
+    """Tests that Skyscanner itineraries without legs or pricing are skipped and missing names defaulted."""
+    client = SkyscannerApiClient()
+    response = {"itineraries": [
+        {"pricingOptions": [{"price": {"amount": "99.00"}}], "legs": []},
+        {"legs": [{"id": "leg_3", "departure": "2025-05-20T09:15:00"}]},
+        {"pricingOptions": [{}], "legs": [{"id": "leg_4", "departure": "2025-05-20T18:45:00"}]},
+    ]}
+    transformed = client._transform_response(response)
+    assert transformed == [{"airline": "Unknown Airline", "time": "18:45", "price": 0.0, "flight_id": "leg_4"}]
+
 def test_skyscanner_search_success(monkeypatch, mocker):
     """Tests a successful Skyscanner search call."""
     # Arrange
     monkeypatch.setenv("SKYSCRANNER_API_KEY", "test-sky-key")
     
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = MOCK_SKYSCANNER_RESPONSE
+    mock_response = _response(orjson.dumps(MOCK_SKYSCANNER_RESPONSE))
     
-    mock_requests_post = mocker.patch("requests.post", return_value=mock_response)
+    mock_requests_post = mocker.patch("requests.Session.post", return_value=mock_response)
     
     client = SkyscannerApiClient()
     
@@ -305,20 +435,225 @@ def test_skyscanner_search_success(monkeypatch, mocker):
     # Assert
     mock_requests_post.assert_called_once()
     call_args, call_kwargs = mock_requests_post.call_args
+    query = orjson.loads(call_kwargs["data"])["query"]
     
-    assert call_kwargs["json"]["query"]["adults"] == 2
-    assert call_kwargs["json"]["query"]["cabinClass"] == "business"
-    assert call_kwargs["headers"] == {"x-api-key": "test-sky-key"}
+    assert call_kwargs["headers"]["Content-Type"] == "application/json"
+    assert query["adults"] == 2
+    assert query["cabinClass"] == "business"
+    assert query["currency"] == "USD"
+    assert query["queryLegs"][0]["date"] == {"year": 2025, "month": 5, "day": 20}
+    assert client.session.headers["x-api-key"] == "test-sky-key"
     assert results == EXPECTED_SKYSCANNER_TRANSFORMED_DATA
 
 def test_skyscanner_search_api_failure(monkeypatch, mocker):
     """Tests the Skyscanner search call when the API request fails."""
     monkeypatch.setenv("SKYSCRANNER_API_KEY", "test-sky-key")
-    mocker.patch("requests.post", side_effect=RequestException("Network Error"))
+    mocker.patch("requests.Session.post", side_effect=RequestException("Network Error"))
     client = SkyscannerApiClient()
     results = client.search(departure_city="JFK", destination_city="LHR", departure_date="2025-05-20")
     assert results is None
 
+# --- Tests for AllProvidersFlightApiClient ---
+
+def test_all_providers_flight_search_merges_configured_providers(monkeypatch, mocker):
+    """Tests that every configured flight provider is searched and a failing one is left out of the results."""
+    # Arrange
+    monkeypatch.setenv("AERODATA_API_KEY", "test-aerodata-key")
+    monkeypatch.setenv("SKYSCRANNER_API_KEY", "test-skyscanner-key")
+    monkeypatch.delenv("SABRE_CLIENT_ID", raising=False)
+    mocker.patch.object(AeroDataApiClient, "search", return_value=EXPECTED_TRANSFORMED_DATA)
+    mocker.patch.object(SkyscannerApiClient, "search", return_value=None)
+    mock_sabre_search = mocker.patch.object(SabreApiClient, "search")
+
+    # Act
+    results = AllProvidersFlightApiClient().search(departure_city="JFK", destination_city="LHR", departure_date="2025-03-10")
+
+    # Assert
+    assert results == EXPECTED_TRANSFORMED_DATA
+    mock_sabre_search.assert_not_called()
+
+def test_all_providers_flight_search_survives_a_provider_exception(monkeypatch, mocker, caplog):
+    """Tests that a provider raising unexpectedly is left out instead of discarding the other providers' results."""
+    # Arrange
+    monkeypatch.setenv("AERODATA_API_KEY", "test-aerodata-key")
+    monkeypatch.setenv("SKYSCRANNER_API_KEY", "test-skyscanner-key")
+    monkeypatch.delenv("SABRE_CLIENT_ID", raising=False)
+    mocker.patch.object(AeroDataApiClient, "search", side_effect=KeyError("price_usd"))
+    mocker.patch.object(SkyscannerApiClient, "search", return_value=EXPECTED_TRANSFORMED_DATA)
+
+    # Act
+    results = AllProvidersFlightApiClient().search(departure_city="JFK", destination_city="LHR", departure_date="2025-03-10")
+
+    # Assert
+    assert results == EXPECTED_TRANSFORMED_DATA
+    assert "AeroDataApiClient flight search failed" in caplog.text
+
+def test_all_providers_flight_search_skips_half_configured_sabre(monkeypatch):
+    """Tests that Sabre is only searched when both its client id and secret are set."""
+    # Arrange
+    monkeypatch.delenv("AERODATA_API_KEY", raising=False)
+    monkeypatch.delenv("SKYSCRANNER_API_KEY", raising=False)
+    monkeypatch.setenv("SABRE_CLIENT_ID", "test-sabre-id")
+    monkeypatch.delenv("SABRE_CLIENT_SECRET", raising=False)
+
+    # Act / Assert
+    assert AllProvidersFlightApiClient().clients == []
+
+def test_all_providers_flight_search_runs_providers_concurrently(monkeypatch, mocker):
+    """Tests that provider searches overlap: each waits on a barrier only passable if all run at once."""
+    # Arrange
+    monkeypatch.setenv("AERODATA_API_KEY", "test-aerodata-key")
+    monkeypatch.setenv("SABRE_CLIENT_ID", "test-sabre-id")
+    monkeypatch.setenv("SABRE_CLIENT_SECRET", "test-sabre-secret")
+    monkeypatch.setenv("SKYSCRANNER_API_KEY", "test-skyscanner-key")
+    barrier = threading.Barrier(3, timeout=5)
+
+    def search(**kwargs):
+        barrier.wait()
+        return EXPECTED_TRANSFORMED_DATA[:1]
+
+    for client_class in (AeroDataApiClient, SabreApiClient, SkyscannerApiClient):
+        mocker.patch.object(client_class, "search", side_effect=search)
+
+    # Act
+    results = AllProvidersFlightApiClient().search(departure_city="JFK", destination_city="LHR", departure_date="2025-03-10")
+
+    # Assert
+    assert results == EXPECTED_TRANSFORMED_DATA[:1] * 3
+
+def test_all_providers_flight_search_without_providers(monkeypatch):
+    """Tests that the combined flight search fails cleanly when no provider is configured."""
+    # Arrange
+    for env_var in ("AERODATA_API_KEY", "SABRE_CLIENT_ID", "SKYSCRANNER_API_KEY"):
+        monkeypatch.delenv(env_var, raising=False)
+
+    # Act / Assert
+    assert AllProvidersFlightApiClient().search(departure_city="JFK", destination_city="LHR", departure_date="2025-03-10") is None
+
+# --- Tests for spec-driven transforms (Duffel, Kiwi) ---
+
+MOCK_DUFFEL_RESPONSE = {
+    "data": {
+        "offers": [
+            {
+                "total_amount": "199.99",
+                "slices": [
+                    {
+                        "segments": [
+                            {
+                                "departing_at": "2025-06-01T07:45:00",
+                                "operating_carrier": {"name": "Duffel Airways", "iata_code": "ZZ"},
+                                "operating_carrier_flight_number": "101"
+                            }
+                        ]
+                    }
+                ]
+            }
+        ]
+    }
+}
+
+MOCK_KIWI_RESPONSE = {
+    "data": [
+        {
+            "airlines": ["FR"],
+            "price": 89,
+            "route": [{"local_departure": "2025-06-01T18:05:00.000Z", "airline": "FR", "flight_no": 2201}]
+        }
+    ]
+}
+
+def test_amadeus_transform_response():
+    """Tests the Amadeus transformation, including carrier names from the response dictionaries."""
+    response = {
+        "data": [
+            {"price": {"total": "420.10"}, "itineraries": [{"segments": [{"carrierCode": "BA", "number": "117", "departure": {"at": "2025-04-01T08:30:00"}}]}]},
+            {"price": {"total": "390.00"}, "itineraries": [{"segments": [{"carrierCode": "ZZ", "number": "9", "departure": {"at": "2025-04-01T13:05:00"}}]}]},
+        ],
+        "dictionaries": {"carriers": {"BA": "British Airways"}},
+    }
+    transformed = api_client.AmadeusApiClient()._transform_response(response)
+    assert transformed == [
+        {"airline": "British Airways", "time": "08:30", "price": 420.10, "flight_id": "BA117"},
+        {"airline": "Unknown Airline", "time": "13:05", "price": 390.00, "flight_id": "ZZ9"},
+    ]
+
+def test_duffel_transform_response():
+    """Tests the Duffel response transformation logic."""
+    client = DuffelApiClient()
+    transformed = client._transform_response(MOCK_DUFFEL_RESPONSE)
+    assert transformed == [{"airline": "Duffel Airways", "time": "07:45", "price": 199.99, "flight_id": "ZZ101"}]
+
+def test_duffel_transform_response_caps_offers():
+    """Tests that only the first MAX_RESULTS Duffel offers are transformed."""
+    client = DuffelApiClient()
+    offer = MOCK_DUFFEL_RESPONSE["data"]["offers"][0]
+    transformed = client._transform_response({"data": {"offers": [offer] * (api_client.MAX_RESULTS + 3)}})
+    assert len(transformed) == api_client.MAX_RESULTS
+
+def test_duffel_search_legs_sends_one_request_for_all_legs(monkeypatch, mocker):
+    """Tests that a multi-leg Duffel search is priced with a single offer request."""
+    # Arrange
+    monkeypatch.setenv("DUFFEL_API_KEY", "test-duffel-key")
+    mock_response = _response(orjson.dumps(MOCK_DUFFEL_RESPONSE))
+    mock_requests_post = mocker.patch("requests.Session.post", return_value=mock_response)
+    legs = [("LHR", "CDG", "2025-06-01"), ("CDG", "BER", "2025-06-05"), ("BER", "LHR", "2025-06-09")]
+
+    # Act
+    results = DuffelApiClient()._search_legs(legs, passengers=2, travel_class=None)
+
+    # Assert
+    mock_requests_post.assert_called_once()
+    slices = orjson.loads(mock_requests_post.call_args.kwargs["data"])["data"]["slices"]
+    assert [(s["origin"], s["destination"], s["departure_date"]) for s in slices] == legs
+    assert orjson.loads(mock_requests_post.call_args.kwargs["data"])["data"]["passengers"] == [{"type": "adult"}] * 2
+    assert results == [{"airline": "Duffel Airways", "time": "07:45", "price": 199.99, "flight_id": "ZZ101"}]
+
+def test_kiwi_transform_response():
+    """Tests the Kiwi.com response transformation logic."""
+    client = KiwiApiClient()
+    transformed = client._transform_response(MOCK_KIWI_RESPONSE)
+    assert transformed == [{"airline": "FR", "time": "18:05", "price": 89.0, "flight_id": "FR2201"}]
+
+def test_kiwi_search_formats_dates(monkeypatch, mocker):
+    """Tests that Kiwi.com search dates are sent in the DD/MM/YYYY format the API expects."""
+    # Arrange
+    monkeypatch.setenv("KIWI_API_KEY", "test-kiwi-key")
+    mock_response = _response(orjson.dumps(MOCK_KIWI_RESPONSE))
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=mock_response)
+    client = KiwiApiClient()
+    client.cache = MagicMock()
+    client.cache.__contains__.return_value = False
+
+    # Act
+    client.search(departure_city="STN", destination_city="DUB", departure_date="2025-06-01", return_date="2025-06-08")
+
+    # Assert
+    call_args, call_kwargs = mock_requests_get.call_args
+    assert call_kwargs["params"]["date_from"] == "01/06/2025"
+    assert call_kwargs["params"]["return_to"] == "08/06/2025"
+
+@pytest.mark.parametrize("timestamp, expected", [
+    ("2025-06-01T18:05:00", "18:05"),
+    ("2025-06-01T18:05:00.000Z", "18:05"),
+    ("2025-06-01T18:05:00+02:00", "18:05"),
+    ("2025-06-01 18:05:00", "18:05"),
+    ("2025-06-01", "00:00"),
+])
+def test_format_hhmm(timestamp, expected):
+    """Tests HH:MM extraction for the timestamp shapes providers return."""
+    assert _format_hhmm(timestamp) == expected
+
+class DictCache(dict):
+    """An in-memory stand-in for RedisCache that round-trips values through JSON like Redis does."""
+    ttl = 120
+
+    def get_and_touch(self, key, ttl=None):
+        return self.get(key)
+
+    def set(self, key, value, ttl=None):
+        self[key] = orjson.loads(orjson.dumps(value))
+
 # --- Tests for HertzApiClient ---
 
 MOCK_HERTZ_RESPONSE = {
@@ -329,8 +664,8 @@ MOCK_HERTZ_RESPONSE = {
 }
 
 EXPECTED_HERTZ_TRANSFORMED_DATA = [
-    {"provider": "Hertz", "model": "Tesla Model 3", "price_per_day": 95.0, "id": "HTZ-T3-01"},
-    {"provider": "Hertz", "model": "Ford Mustang", "price_per_day": 80.5, "id": "HTZ-M5-02"}
+    CarOffer("Hertz", "Tesla Model 3", 95.0, "HTZ-T3-01"),
+    CarOffer("Hertz", "Ford Mustang", 80.5, "HTZ-M5-02")
 ]
 
 def test_hertz_client_init_with_key(monkeypatch):
@@ -358,14 +693,12 @@ def test_hertz_search_success(monkeypatch, mocker):
     # Arrange
     monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
 
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = MOCK_HERTZ_RESPONSE
+    mock_response = _response(orjson.dumps(MOCK_HERTZ_RESPONSE))
 
-    mock_requests_get = mocker.patch("requests.get", return_value=mock_response)
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
     client = HertzApiClient()
-    client.cache = {} # Use a simple dict to isolate cache testing
+    client.cache = DictCache() # Use a simple dict to isolate cache testing
 
     # Act
     results = client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
@@ -375,30 +708,44 @@ def test_hertz_search_success(monkeypatch, mocker):
     call_args, call_kwargs = mock_requests_get.call_args
     assert call_kwargs["params"]["pickup_location"] == "LAX"
     assert call_kwargs["params"]["vehicle_class"] == "suv"
-    assert call_kwargs["headers"] == {"Authorization": "Bearer test-hertz-key"}
+    assert client.session.headers["Authorization"] == "Bearer test-hertz-key"
     assert results == EXPECTED_HERTZ_TRANSFORMED_DATA
 
 def test_hertz_search_api_failure(monkeypatch, mocker):
     """Tests the Hertz search call when the API request fails."""
     monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
-    mocker.patch("requests.get", side_effect=RequestException("Network Error"))
+    mocker.patch("requests.Session.get", side_effect=RequestException("Network Error"))
+    client = HertzApiClient()
+    results = client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
+    assert results is None
+
+def test_hertz_search_malformed_offer(monkeypatch, mocker, caplog):
+    """Tests that an offer missing its rate fails the Hertz search with None instead of raising."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    malformed = {"available_vehicles": [{"vehicle_id": "HTZ-X", "vehicle_name": "Mystery Car"}]}
+    mocker.patch("requests.Session.get", return_value=_response(orjson.dumps(malformed)))
     client = HertzApiClient()
+    client.cache = DictCache()
+
+    # Act
     results = client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
+
+    # Assert
     assert results is None
+    assert "Could not read the Hertz response" in caplog.text
 
 def test_hertz_search_uses_cache(monkeypatch, mocker):
     """Tests that a successful search result is cached and reused."""
     # Arrange
     monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
 
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = MOCK_HERTZ_RESPONSE
+    mock_response = _response(orjson.dumps(MOCK_HERTZ_RESPONSE))
 
-    mock_requests_get = mocker.patch("requests.get", return_value=mock_response)
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
     client = HertzApiClient()
-    client.cache = {} # Use a simple dict as a mock cache for this test
+    client.cache = DictCache() # Use a simple dict as a mock cache for this test
 
     # Act: First call, should call the API
     first_results = client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
@@ -411,6 +758,95 @@ def test_hertz_search_uses_cache(monkeypatch, mocker):
     assert first_results == EXPECTED_HERTZ_TRANSFORMED_DATA
     assert second_results == first_results
 
+def test_hertz_search_cache_key_normalization(monkeypatch, mocker):
+    """Tests that searches differing only in location or car type case and whitespace share a cache entry."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+
+    mock_response = _response(orjson.dumps(MOCK_HERTZ_RESPONSE))
+
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=mock_response)
+
+    client = HertzApiClient()
+    client.cache = DictCache()
+
+    # Act
+    first_results = client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="SUV")
+    second_results = client.search(location=" lax", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
+
+    # Assert
+    mock_requests_get.assert_called_once()
+    assert second_results == first_results
+
+def test_car_search_without_car_type(monkeypatch, mocker):
+    """Tests that a search with no car type, including an upper-casing provider, is sent without one."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    monkeypatch.setenv("AVIS_API_KEY", "test-avis-key")
+    monkeypatch.delenv("ENTERPRISE_API_KEY", raising=False)
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=_response(orjson.dumps(MOCK_HERTZ_RESPONSE)))
+
+    hertz_client = HertzApiClient()
+    hertz_client.cache = DictCache()
+
+    # Act
+    results = hertz_client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type=None)
+    AllProvidersCarRentalApiClient().search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type=None)
+
+    # Assert
+    assert results == EXPECTED_HERTZ_TRANSFORMED_DATA
+    assert mock_requests_get.call_count == 3
+    for call in mock_requests_get.call_args_list:
+        assert list(call.kwargs["params"].values())[-1] is None
+
+def test_hertz_search_coalesces_concurrent_calls(monkeypatch, mocker):
+    """Tests that identical searches issued at the same time share a single provider request."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+
+    def slow_get(*args, **kwargs):
+        time.sleep(0.1)
+        return _response(orjson.dumps(MOCK_HERTZ_RESPONSE))
+
+    mock_requests_get = mocker.patch("requests.Session.get", side_effect=slow_get)
+    client = HertzApiClient()
+    client.cache = DictCache()
+    results = []
+
+    def search():
+        results.append(client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv"))
+
+    threads = [threading.Thread(target=search) for _ in range(5)]
+
+    # Act
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert
+    assert mock_requests_get.call_count == 1
+    assert results == [EXPECTED_HERTZ_TRANSFORMED_DATA] * 5
+
+def test_hertz_search_cache_hit_skips_request_building(monkeypatch, mocker, caplog):
+    """Tests that a cache hit returns before any request is built or logged."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    mock_requests_get = mocker.patch("requests.Session.get")
+    client = HertzApiClient()
+    client.cache = DictCache()
+    cache_key = car_rental_api_client._make_cache_key("hertz", ("lax", "2025-07-01", "2025-07-05", "suv"))
+    client.cache.set(cache_key, EXPECTED_HERTZ_TRANSFORMED_DATA)
+
+    # Act
+    with caplog.at_level("INFO"):
+        results = client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
+
+    # Assert
+    assert results == EXPECTED_HERTZ_TRANSFORMED_DATA
+    mock_requests_get.assert_not_called()
+    assert "Searching Hertz" not in caplog.text
+
 # --- Tests for AvisApiClient ---
 
 MOCK_AVIS_RESPONSE = {
@@ -421,8 +857,8 @@ MOCK_AVIS_RESPONSE = {
 }
 
 EXPECTED_AVIS_TRANSFORMED_DATA = [
-    {"provider": "Avis", "model": "Chevrolet Malibu", "price_per_day": 62.0, "id": "AVS-CM-45"},
-    {"provider": "Avis", "model": "Jeep Wrangler", "price_per_day": 88.75, "id": "AVS-JW-91"}
+    CarOffer("Avis", "Chevrolet Malibu", 62.0, "AVS-CM-45"),
+    CarOffer("Avis", "Jeep Wrangler", 88.75, "AVS-JW-91")
 ]
 
 def test_avis_client_init_with_key(monkeypatch):
@@ -450,14 +886,12 @@ def test_avis_search_success(monkeypatch, mocker):
     # Arrange
     monkeypatch.setenv("AVIS_API_KEY", "test-avis-key")
 
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = MOCK_AVIS_RESPONSE
+    mock_response = _response(orjson.dumps(MOCK_AVIS_RESPONSE))
 
-    mock_requests_get = mocker.patch("requests.get", return_value=mock_response)
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=mock_response)
 
     client = AvisApiClient()
-    client.cache = {}
+    client.cache = DictCache()
 
     # Act
     results = client.search(location="SFO", pickup_date="2025-08-10", dropoff_date="2025-08-15", car_type="full-size")
@@ -466,14 +900,15 @@ def test_avis_search_success(monkeypatch, mocker):
     mock_requests_get.assert_called_once()
     call_args, call_kwargs = mock_requests_get.call_args
     assert call_kwargs["params"]["pickup_loc"] == "SFO"
+    assert call_kwargs["timeout"] == car_rental_api_client.CAR_SEARCH_TIMEOUT
     assert call_kwargs["params"]["category"] == "full-size"
-    assert call_kwargs["headers"] == {"X-Api-Key": "test-avis-key"}
+    assert client.session.headers["X-Api-Key"] == "test-avis-key"
     assert results == EXPECTED_AVIS_TRANSFORMED_DATA
 
 def test_avis_search_api_failure(monkeypatch, mocker):
     """Tests the Avis search call when the API request fails."""
     monkeypatch.setenv("AVIS_API_KEY", "test-avis-key")
-    mocker.patch("requests.get", side_effect=RequestException("Network Error"))
+    mocker.patch("requests.Session.get", side_effect=RequestException("Network Error"))
     client = AvisApiClient()
     results = client.search(location="SFO", pickup_date="2025-08-10", dropoff_date="2025-08-15", car_type="full-size")
     assert results is None
@@ -496,8 +931,8 @@ MOCK_ENTERPRISE_RESPONSE = {
 }
 
 EXPECTED_ENTERPRISE_TRANSFORMED_DATA = [
-    {"provider": "Enterprise", "model": "Volkswagen Jetta", "price_per_day": 52.5, "id": "ENT-VWJ-01"},
-    {"provider": "Enterprise", "model": "Chrysler Pacifica", "price_per_day": 95.0, "id": "ENT-CRA-02"}
+    CarOffer("Enterprise", "Volkswagen Jetta", 52.5, "ENT-VWJ-01"),
+    CarOffer("Enterprise", "Chrysler Pacifica", 95.0, "ENT-CRA-02")
 ]
 
 def test_enterprise_client_init_with_key(monkeypatch):
@@ -523,28 +958,261 @@ def test_enterprise_transform_response():
 def test_enterprise_search_success(monkeypatch, mocker):
     """Tests a successful Enterprise search call."""
     monkeypatch.setenv("ENTERPRISE_API_KEY", "test-enterprise-key")
-    mock_response = MagicMock()
-    mock_response.raise_for_status.return_value = None
-    mock_response.json.return_value = MOCK_ENTERPRISE_RESPONSE
-    mock_requests_get = mocker.patch("requests.get", return_value=mock_response)
+    mock_response = _response(orjson.dumps(MOCK_ENTERPRISE_RESPONSE))
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=mock_response)
     client = EnterpriseApiClient()
-    client.cache = {}
+    client.cache = DictCache()
     results = client.search(location="MIA", pickup_date="2025-10-01", dropoff_date="2025-10-05", car_type="standard")
     mock_requests_get.assert_called_once()
     call_args, call_kwargs = mock_requests_get.call_args
     assert call_kwargs["params"]["location_code"] == "MIA"
     assert call_kwargs["params"]["car_group"] == "STANDARD"
-    assert call_kwargs["headers"] == {"Api-Token": "test-enterprise-key"}
+    assert client.session.headers["Api-Token"] == "test-enterprise-key"
     assert results == EXPECTED_ENTERPRISE_TRANSFORMED_DATA
 
 def test_enterprise_search_api_failure(monkeypatch, mocker):
     """Tests the Enterprise search call when the API request fails."""
     monkeypatch.setenv("ENTERPRISE_API_KEY", "test-enterprise-key")
-    mocker.patch("requests.get", side_effect=RequestException("Network Error"))
+    mocker.patch("requests.Session.get", side_effect=RequestException("Network Error"))
     client = EnterpriseApiClient()
     results = client.search(location="MIA", pickup_date="2025-10-01", dropoff_date="2025-10-05", car_type="standard")
     assert results is None
 
+def test_car_clients_share_one_cache(monkeypatch):
+    """Tests that every car rental client instance uses the same process-wide cache."""
+    # Arrange
+    monkeypatch.setattr(car_rental_api_client, "_car_cache", MagicMock())
+
+    # Act / Assert
+    assert HertzApiClient().cache is AvisApiClient().cache is car_rental_api_client._car_cache
+
+def test_redis_caches_share_connection_pool_per_database(mock_redis_client):
+    """Tests that caches on the same Redis database borrow from one connection pool."""
+    # Act
+    first, second, other_db = RedisCache(db=5), RedisCache(db=5), RedisCache(db=6)
+
+    # Assert
+    assert first.redis_pool is second.redis_pool
+    assert first.redis_pool is not other_db.redis_pool
+
+def test_car_client_picks_up_cache_after_redis_recovers(monkeypatch):
+    """Tests that a memoized car client built while Redis was down uses the shared cache once it reconnects."""
+    # Arrange
+    monkeypatch.setenv("CAR_RENTAL_API_PROVIDER", "hertz")
+    monkeypatch.setattr(car_rental_api_client, "_car_cache", MagicMock(redis=None, ttl=120))
+    client = car_rental_api_client.get_car_rental_api_client()
+    reconnected_cache = MagicMock()
+
+    # Act
+    monkeypatch.setattr(car_rental_api_client, "_car_cache", reconnected_cache)
+
+    # Assert
+    assert car_rental_api_client.get_car_rental_api_client().cache is client.cache is reconnected_cache
+
+def test_car_cache_key_is_hashed_and_namespaced():
+    """Tests that car cache keys are fixed-length, provider-scoped and stable for the same search."""
+    # Act
+    key = car_rental_api_client._make_cache_key("hertz", ("LAX", "2025-07-01", "2025-07-05", "suv"))
+
+    # Assert
+    assert key.startswith("car:hertz:") and len(key) == len("car:hertz:") + 32
+    assert key == car_rental_api_client._make_cache_key("hertz", ("LAX", "2025-07-01", "2025-07-05", "suv"))
+    assert key != car_rental_api_client._make_cache_key("hertz", ("LAX", "2025-07-01", "2025-07-05", "compact"))
+    assert key != car_rental_api_client._make_cache_key("avis", ("LAX", "2025-07-01", "2025-07-05", "suv"))
+
+def test_template_car_client_runs_from_spec_alone(monkeypatch, mocker):
+    """Tests that a new provider can be added with a ProviderSpec and no client subclass."""
+    # Arrange
+    monkeypatch.setenv("SIXT_API_KEY", "test-sixt-key")
+    spec = car_rental_api_client.ProviderSpec(
+        key="sixt",
+        name="Sixt",
+        default_base_url="https://api.sixt.test",
+        path="/search",
+        auth_header="X-Sixt-Key",
+        param_keys=("branch", "from", "to", "group"),
+        response_key="offers",
+        to_offer=lambda row: CarOffer("Sixt", row["model"], float(row["price"]), row["id"]),
+    )
+    mock_response = _response(orjson.dumps({"offers": [{"model": "BMW 1", "price": 70, "id": "SX1"}]}))
+    mock_requests_get = mocker.patch("requests.Session.get", return_value=mock_response)
+    client = car_rental_api_client.TemplateCarApiClient(spec)
+    client.cache = DictCache()
+
+    # Act
+    results = client.search(location="MUC", pickup_date="2025-09-01", dropoff_date="2025-09-03", car_type="compact")
+
+    # Assert
+    call_args, call_kwargs = mock_requests_get.call_args
+    assert call_args[0] == "https://api.sixt.test/search"
+    assert call_kwargs["params"] == {"branch": "MUC", "from": "2025-09-01", "to": "2025-09-03", "group": "compact"}
+    assert client.session.headers["X-Sixt-Key"] == "test-sixt-key"
+    assert results == [CarOffer("Sixt", "BMW 1", 70.0, "SX1")]
+
+def test_car_client_breaker_skips_failing_provider(monkeypatch, mocker):
+    """Tests that a provider that just failed is skipped until its backoff expires, then retried."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    mock_requests_get = mocker.patch("requests.Session.get", side_effect=RequestException("Network Error"))
+    mock_monotonic = mocker.patch("actions.car_rental_api_client.time.monotonic", return_value=1000.0)
+    client = HertzApiClient()
+    client.cache = DictCache()
+    search = dict(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
+
+    # Act
+    first = client.search(**search)
+    second = client.search(**search)
+    mock_monotonic.return_value = 1000.0 + car_rental_api_client.BREAKER_BASE_BACKOFF_SECONDS + 1
+    third = client.search(**search)
+
+    # Assert
+    assert first is second is third is None
+    assert mock_requests_get.call_count == 2
+    assert HertzApiClient._breakers["hertz"][1] == 2 * car_rental_api_client.BREAKER_BASE_BACKOFF_SECONDS
+
+def test_car_client_breaker_lets_one_probe_through_when_half_open(mocker):
+    """Tests that once the backoff expires only one search probes the provider while the rest are still skipped."""
+    # Arrange
+    mock_monotonic = mocker.patch("actions.car_rental_api_client.time.monotonic", return_value=1000.0)
+    client = HertzApiClient()
+    client._record_failure("hertz")
+
+    # Act
+    while_open = client._breaker_allows("hertz")
+    mock_monotonic.return_value = 1000.0 + car_rental_api_client.BREAKER_BASE_BACKOFF_SECONDS + 1
+    probe = client._breaker_allows("hertz")
+    during_probe = client._breaker_allows("hertz")
+    client._record_success("hertz")
+    after_probe = client._breaker_allows("hertz")
+
+    # Assert
+    assert (while_open, probe, during_probe, after_probe) == (False, True, False, True)
+
+def test_car_client_breaker_ignores_client_errors(monkeypatch, mocker):
+    """Tests that a 4xx response does not mark the provider as down."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    mocker.patch("requests.Session.get", return_value=_response(b"", status_code=400))
+    client = HertzApiClient()
+    client.cache = DictCache()
+
+    # Act
+    results = client.search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
+
+    # Assert
+    assert results is None
+    assert "hertz" not in HertzApiClient._breakers
+
+def test_car_client_uses_provider_cache_ttl(monkeypatch, mocker):
+    """Tests that a provider-specific TTL is used for both cache reads and writes."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    monkeypatch.setenv("HERTZ_CACHE_TTL", "600")
+    mock_response = _response(orjson.dumps(MOCK_HERTZ_RESPONSE))
+    mocker.patch("requests.Session.get", return_value=mock_response)
+    mock_cache = MagicMock(ttl=120)
+    mock_cache.get_and_touch.return_value = None
+    monkeypatch.setattr(car_rental_api_client, "_car_cache", mock_cache)
+
+    # Act
+    HertzApiClient().search(location="LAX", pickup_date="2025-07-01", dropoff_date="2025-07-05", car_type="suv")
+
+    # Assert
+    assert mock_cache.get_and_touch.call_args.kwargs["ttl"] == 600
+    assert mock_cache.set.call_args.kwargs["ttl"] == 600
+
+def test_car_client_defaults_to_shared_cache_ttl(monkeypatch):
+    """Tests that providers without their own TTL fall back to the shared cache TTL."""
+    # Arrange
+    monkeypatch.delenv("AVIS_CACHE_TTL", raising=False)
+    monkeypatch.setattr(car_rental_api_client, "_car_cache", MagicMock(ttl=120))
+
+    # Act / Assert
+    assert AvisApiClient().cache_ttl == 120
+
+# --- Tests for AllProvidersCarRentalApiClient ---
+
+def test_all_providers_search_merges_configured_providers(monkeypatch, mocker):
+    """Tests that every configured provider is searched and a failing one is left out of the results."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    monkeypatch.setenv("AVIS_API_KEY", "test-avis-key")
+    monkeypatch.delenv("ENTERPRISE_API_KEY", raising=False)
+    mocker.patch.object(HertzApiClient, "_search_uncached", return_value=EXPECTED_HERTZ_TRANSFORMED_DATA)
+    mocker.patch.object(AvisApiClient, "_search_uncached", return_value=None)
+    mock_enterprise_search = mocker.patch.object(EnterpriseApiClient, "_search_uncached")
+
+    # Act
+    results = AllProvidersCarRentalApiClient().search(location="LAX", pickup_date="2025-10-01", dropoff_date="2025-10-05", car_type="suv")
+
+    # Assert
+    assert results == EXPECTED_HERTZ_TRANSFORMED_DATA
+    mock_enterprise_search.assert_not_called()
+
+def test_all_providers_search_survives_a_provider_exception(monkeypatch, mocker):
+    """Tests that an unexpected error from one provider leaves it out instead of failing the combined search."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    monkeypatch.setenv("AVIS_API_KEY", "test-avis-key")
+    monkeypatch.delenv("ENTERPRISE_API_KEY", raising=False)
+    mocker.patch.object(HertzApiClient, "_search_uncached", side_effect=RuntimeError("boom"))
+    mocker.patch.object(AvisApiClient, "_search_uncached", return_value=EXPECTED_AVIS_TRANSFORMED_DATA)
+
+    # Act
+    results = AllProvidersCarRentalApiClient().search(location="LAX", pickup_date="2025-10-01", dropoff_date="2025-10-05", car_type="suv")
+
+    # Assert
+    assert results == EXPECTED_AVIS_TRANSFORMED_DATA
+
+def test_all_providers_search_fails_when_every_provider_fails(monkeypatch, mocker):
+    """Tests that the combined search returns None only when no provider succeeded."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    monkeypatch.delenv("AVIS_API_KEY", raising=False)
+    monkeypatch.delenv("ENTERPRISE_API_KEY", raising=False)
+    mocker.patch.object(HertzApiClient, "_search_uncached", return_value=None)
+
+    # Act
+    results = AllProvidersCarRentalApiClient().search(location="LAX", pickup_date="2025-10-01", dropoff_date="2025-10-05", car_type="suv")
+
+    # Assert
+    assert results is None
+
+def test_get_car_rental_api_client_reuses_one_client(monkeypatch, caplog):
+    """Tests that repeated factory calls share one client, so a missing key is only warned about once."""
+    # Arrange
+    monkeypatch.setenv("CAR_RENTAL_API_PROVIDER", "hertz")
+    monkeypatch.delenv("HERTZ_API_KEY", raising=False)
+
+    # Act
+    first = car_rental_api_client.get_car_rental_api_client()
+    second = car_rental_api_client.get_car_rental_api_client()
+
+    # Assert
+    assert first is second
+    assert caplog.text.count("HERTZ_API_KEY") == 1
+
+def test_all_providers_search_reads_cache_in_one_batch(monkeypatch, mocker):
+    """Tests that every provider's cache entry is read with one get_many and only the misses are searched."""
+    # Arrange
+    monkeypatch.setenv("HERTZ_API_KEY", "test-hertz-key")
+    monkeypatch.setenv("AVIS_API_KEY", "test-avis-key")
+    monkeypatch.delenv("ENTERPRISE_API_KEY", raising=False)
+    mock_hertz_search = mocker.patch.object(HertzApiClient, "_search_uncached")
+    mock_avis_search = mocker.patch.object(AvisApiClient, "_search_uncached", return_value=EXPECTED_AVIS_TRANSFORMED_DATA)
+    client = AllProvidersCarRentalApiClient()
+    client.cache = MagicMock()
+    client.cache.get_many.return_value = [orjson.loads(orjson.dumps(EXPECTED_HERTZ_TRANSFORMED_DATA)), None]
+
+    # Act
+    results = client.search(location="LAX", pickup_date="2025-10-01", dropoff_date="2025-10-05", car_type="suv")
+
+    # Assert
+    assert results == EXPECTED_HERTZ_TRANSFORMED_DATA + EXPECTED_AVIS_TRANSFORMED_DATA
+    assert client.cache.get_many.call_count == 1
+    mock_hertz_search.assert_not_called()
+    assert mock_avis_search.call_count == 1
+
 # --- Tests for RedisCache Error Handling ---
 
 @pytest.fixture
@@ -597,7 +1265,7 @@ def test_redis_cache_getitem_redis_error(mock_redis_client, caplog):
 def test_redis_cache_getitem_json_decode_error(mock_redis_client, caplog):
     """Tests that __getitem__ handles corrupt data from Redis."""
     # Arrange
-    mock_redis_client.get.return_value = '{"key": "value", "malformed"}' # Invalid JSON
+    mock_redis_client.get.return_value = b'{"key": "value", "malformed"}' # Invalid JSON
     cache = RedisCache()
 
     # Act
@@ -607,6 +1275,55 @@ def test_redis_cache_getitem_json_decode_error(mock_redis_client, caplog):
     assert result is None
     assert "Failed to decode JSON from Redis cache" in caplog.text
 
+def test_redis_cache_get_and_touch_refreshes_ttl(mock_redis_client):
+    """Tests that get_and_touch reads and re-arms the TTL with a single GETEX."""
+    # Arrange
+    cache = RedisCache(ttl=120)
+    mock_redis_client.getex.return_value = b'{"data":"good"}'
+
+    # Act
+    value = cache.get_and_touch("some_key")
+
+    # Assert
+    assert value == {"data": "good"}
+    mock_redis_client.getex.assert_called_once_with("some_key", ex=120)
+    mock_redis_client.exists.assert_not_called()
+
+def test_redis_cache_get_and_touch_miss(mock_redis_client):
+    """Tests that get_and_touch returns None for a missing key."""
+    # Arrange
+    cache = RedisCache()
+    mock_redis_client.getex.return_value = None
+
+    # Act / Assert
+    assert cache.get_and_touch("missing_key") is None
+
+def test_redis_cache_get_and_touch_empty_result_keeps_negative_ttl(mock_redis_client):
+    """Tests that a get_and_touch hit on an empty result cuts its TTL back to the negative TTL."""
+    # Arrange
+    cache = RedisCache(ttl=120, negative_ttl=30)
+    mock_redis_client.getex.return_value = b'[]'
+
+    # Act
+    value = cache.get_and_touch("some_key")
+
+    # Assert
+    assert value == []
+    mock_redis_client.expire.assert_called_once_with("some_key", 30)
+
+def test_redis_cache_setitem_empty_result_uses_negative_ttl(mock_redis_client):
+    """Tests that an empty result is stored for the negative TTL instead of the full TTL."""
+    # Arrange
+    cache = RedisCache(ttl=120, negative_ttl=30)
+
+    # Act
+    cache['empty_key'] = []
+    cache['full_key'] = [{"data": "good"}]
+
+    # Assert
+    assert mock_redis_client.setex.call_args_list[0].args == ('empty_key', 30, b'[]')
+    assert mock_redis_client.setex.call_args_list[1].args[1] == 120
+
 def test_redis_cache_setitem_redis_error(mock_redis_client, caplog):
     """Tests that __setitem__ handles a runtime RedisError."""
     # Arrange
@@ -619,12 +1336,40 @@ def test_redis_cache_setitem_redis_error(mock_redis_client, caplog):
     # Assert
     assert "Redis cache 'set' operation failed" in caplog.text
 
+def test_redis_cache_setitem_stores_bytes(mock_redis_client):
+    """Tests that values are written to Redis as UTF-8 encoded JSON bytes."""
+    # Arrange
+    cache = RedisCache(ttl=60)
+
+    # Act
+    cache['some_key'] = {"data": "good"}
+
+    # Assert
+    mock_redis_client.setex.assert_called_once_with('some_key', 60, b'{"data":"good"}')
+
+def test_redis_cache_car_offers_read_back_as_json(mock_redis_client):
+    """Tests that car offers are stored as orjson bytes and read back as the same dicts from either cache tier."""
+    # Arrange
+    cache = RedisCache(ttl=60)
+    offers = [CarOffer("Hertz", "Tesla Model 3", 95.0, "HTZ-T3-01")]
+    expected = [{"provider": "Hertz", "model": "Tesla Model 3", "price_per_day": 95.0, "id": "HTZ-T3-01"}]
+
+    # Act
+    cache.set("car:hertz:abc", offers)
+    near_hit = cache.get_and_touch("car:hertz:abc")
+
+    # Assert
+    stored_bytes = mock_redis_client.setex.call_args.args[2]
+    assert orjson.loads(stored_bytes) == expected
+    assert near_hit == expected
+    assert car_rental_api_client._to_offers(near_hit) == offers
+
 def test_redis_cache_setitem_type_error(mock_redis_client, caplog):
     """Tests that __setitem__ handles non-serializable data."""
     # Arrange
     cache = RedisCache()
-    # A datetime object is not directly JSON serializable without a custom encoder
-    non_serializable_object = datetime.datetime.now()
+    # A plain object has no JSON representation
+    non_serializable_object = object()
 
     # Act
     cache['some_key'] = non_serializable_object
@@ -634,6 +1379,146 @@ def test_redis_cache_setitem_type_error(mock_redis_client, caplog):
     # Ensure we didn't even try to send the corrupt data to Redis
     mock_redis_client.setex.assert_not_called()
 
+def test_redis_cache_setitem_non_string_keys(mock_redis_client):
+    """Tests that __setitem__ stores dicts with non-string keys, which round-trip with string keys."""
+    # Arrange
+    cache = RedisCache()
+
+    # Act
+    cache['some_key'] = {1: "one"}
+
+    # Assert
+    mock_redis_client.setex.assert_called_once_with('some_key', 60, b'{"1":"one"}')
+    assert cache['some_key'] == {"1": "one"}
+
+def test_redis_cache_getitem_uses_local_cache(mock_redis_client):
+    """Tests that a repeated lookup is served from the in-process cache without a Redis GET."""
+    # Arrange
+    mock_redis_client.get.return_value = b'{"data": "good"}'
+    cache = RedisCache()
+
+    # Act
+    first = cache['some_key']
+    second = cache['some_key']
+
+    # Assert
+    assert first == second == {"data": "good"}
+    mock_redis_client.get.assert_called_once_with('some_key')
+
+def test_redis_cache_setitem_populates_local_cache(mock_redis_client):
+    """Tests that a value written to the cache is readable without a Redis round-trip."""
+    # Arrange
+    cache = RedisCache()
+
+    # Act
+    cache['some_key'] = {"data": "good"}
+
+    # Assert
+    assert 'some_key' in cache
+    assert cache['some_key'] == {"data": "good"}
+    mock_redis_client.exists.assert_not_called()
+    mock_redis_client.get.assert_not_called()
+
+def test_redis_cache_get_many(mock_redis_client):
+    """Tests that get_many fetches all keys in one MGET and returns None for misses."""
+    # Arrange
+    mock_redis_client.mget.return_value = [b'{"data": "a"}', None]
+    cache = RedisCache()
+
+    # Act
+    results = cache.get_many(['key_a', 'key_b'])
+
+    # Assert
+    assert results == [{"data": "a"}, None]
+    mock_redis_client.mget.assert_called_once_with(['key_a', 'key_b'])
+    mock_redis_client.get.assert_not_called()
+
+def test_redis_cache_get_many_redis_error(mock_redis_client, caplog):
+    """Tests that get_many reports every key as a miss when MGET fails."""
+    # Arrange
+    mock_redis_client.mget.side_effect = redis.exceptions.RedisError("MGET failed")
+    cache = RedisCache()
+
+    # Act
+    results = cache.get_many(['key_a', 'key_b'])
+
+    # Assert
+    assert results == [None, None]
+    assert "Redis cache 'mget' operation failed" in caplog.text
+
+def test_cache_key_is_flat_string_scoped_to_provider():
+    """Tests that cache keys are prebuilt strings that differ per provider and search criteria."""
+    # Arrange
+    aerodata, skyscanner = AeroDataApiClient(), SkyscannerApiClient()
+
+    # Act
+    key = aerodata._cache_key("LHR", "JFK", "2024-12-25", None, 2)
+
+    # Assert
+    assert key == "AeroDataApiClient|LHR|JFK|2024-12-25|None|2|None"
+    assert key != skyscanner._cache_key("LHR", "JFK", "2024-12-25", None, 2)
+    assert key != aerodata._cache_key("LHR", "JFK", "2024-12-25", None, 1)
+
+def test_client_sessions_share_connection_pool_but_not_headers(monkeypatch):
+    """Tests that client sessions reuse one connection pool while keeping provider headers separate."""
+    # Arrange
+    monkeypatch.setenv("AERODATA_API_KEY", "aero_key")
+    monkeypatch.setenv("SKYSCRANNER_API_KEY", "sky_key")
+
+    # Act
+    aerodata, skyscanner = AeroDataApiClient(), SkyscannerApiClient()
+
+    # Assert
+    assert aerodata.session.get_adapter("https://") is skyscanner.session.get_adapter("https://")
+    assert aerodata.session.headers["X-API-Key"] == "aero_key"
+    assert skyscanner.session.headers["x-api-key"] == "sky_key"
+
+def test_client_sessions_retry_transient_failures():
+    """Tests that the shared connection pool retries throttled and unavailable responses."""
+    # Act
+    retry = AeroDataApiClient().session.get_adapter("https://").max_retries
+
+    # Assert
+    assert retry.total == 3
+    assert {429, 503}.issubset(retry.status_forcelist)
+    assert "POST" in retry.allowed_methods
+
+def test_flight_clients_share_one_cache(monkeypatch):
+    """Tests that every flight client instance uses the same process-wide cache."""
+    # Arrange
+    monkeypatch.setattr(api_client, "_flight_cache", MagicMock())
+
+    # Act / Assert
+    assert AeroDataApiClient().cache is SkyscannerApiClient().cache is api_client._flight_cache
+
+def test_flight_client_picks_up_cache_after_redis_recovers(monkeypatch):
+    """Tests that a client built while Redis was down uses the shared cache once it reconnects."""
+    # Arrange
+    monkeypatch.setattr(api_client, "_flight_cache", MagicMock(redis=None))
+    client = AeroDataApiClient()
+    reconnected_cache = MagicMock()
+
+    # Act
+    monkeypatch.setattr(api_client, "_flight_cache", reconnected_cache)
+
+    # Assert
+    assert client.cache is reconnected_cache
+
+def test_get_flight_cache_throttles_reconnects(monkeypatch, mocker):
+    """Tests that a dead flight cache is only rebuilt once the reconnect interval has passed."""
+    # Arrange
+    dead_cache = MagicMock(redis=None)
+    monkeypatch.setattr(api_client, "_flight_cache", dead_cache)
+    monkeypatch.setattr(api_client, "_flight_cache_attempted_at", time.monotonic())
+    mock_redis_cache = mocker.patch("actions.api_client.RedisCache")
+
+    # Act / Assert
+    assert api_client.get_flight_cache() is dead_cache
+    mock_redis_cache.assert_not_called()
+
+    monkeypatch.setattr(api_client, "_flight_cache_attempted_at", time.monotonic() - api_client.CACHE_RECONNECT_INTERVAL_SECONDS)
+    assert api_client.get_flight_cache() is mock_redis_cache.return_value
+
 def test_aerodata_search_no_api_key(monkeypatch):
     """Tests that search returns None immediately if the API key is not configured."""
     # Arrange
@@ -644,4 +1529,35 @@ def test_aerodata_search_no_api_key(monkeypatch):
     results = client.search(departure_city="LHR", destination_city="JFK", departure_date="2025-03-10")
     
     # Assert
-    assert results is None
\ No newline at end of file
+    assert results is None
+
+@pytest.mark.parametrize("provider, expected_class", [
+    ("duffel", DuffelApiClient),
+    ("Skyscanner", SkyscannerApiClient),
+    ("unknown-provider", api_client.MockApiClient),
+])
+def test_get_api_client_resolves_registered_provider(monkeypatch, provider, expected_class):
+    """Tests that get_api_client builds the configured provider's client and falls back to the mock."""
+    # Arrange
+    monkeypatch.setenv("FLIGHT_API_PROVIDER", provider)
+
+    # Act
+    client = api_client.get_api_client()
+
+    # Assert
+    assert type(client) is expected_class
+
+def test_mock_client_returns_fresh_list_of_canned_results():
+    """Tests that the mock client serves the canned results without exposing the shared constant."""
+    client = api_client.MockApiClient()
+    first = client.search(departure_city="LHR", departure_date="2025-03-10", destination_city="JFK")
+    first.clear()
+    assert client.search(departure_city="LHR", departure_date="2025-03-10") == list(api_client.MOCK_FLIGHT_RESULTS)
+
+def test_get_api_client_reuses_one_client(monkeypatch):
+    """Tests that repeated get_api_client calls share a single client instance."""
+    # Arrange
+    monkeypatch.setenv("FLIGHT_API_PROVIDER", "mock")
+
+    # Act / Assert
+    assert api_client.get_api_client() is api_client.get_api_client()
@@ -1,142 +1,382 @@
 import pytest
 import psycopg2
+from cachetools import TTLCache
 
-from actions.db_client import DatabaseClient
+from actions import db_client
+from actions.db_client import DatabaseClient, LOCATION_CACHE_TTL_SECONDS, PREPARED_STATEMENTS
+
+
+class FakeCursor:
+    """
+    A plain stand-in for a psycopg2 cursor that records every (sql, params) it executes.
+    `side_effect` follows MagicMock's convention: an exception is raised on every call,
+    and a list is consumed one item per call, raising the items that are exceptions.
+    `fetchone_result` is likewise returned on every call, or consumed one row per call if it is a list.
+    """
+    __slots__ = ("calls", "side_effect", "fetchone_result", "fetchall_result", "rowcount")
+
+    def __init__(self):
+        self.calls = []
+        self.side_effect = None
+        self.fetchone_result = None
+        self.fetchall_result = []
+        self.rowcount = -1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, sql, params=None):
+        self.calls.append((sql, params))
+        effect = self.side_effect.pop(0) if isinstance(self.side_effect, list) else self.side_effect
+        if isinstance(effect, BaseException):
+            raise effect
+
+    def fetchone(self):
+        if isinstance(self.fetchone_result, list):
+            return self.fetchone_result.pop(0)
+        return self.fetchone_result
+
+    def fetchall(self):
+        return self.fetchall_result
+
+
+class FakeConn:
+    """A plain stand-in for a pooled connection that hands out one FakeCursor and counts commits."""
+    # __weakref__ lets the connection key DatabaseClient._prepared, a WeakKeyDictionary of prepared statement names.
+    __slots__ = ("_cursor", "commits", "__weakref__")
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.commits = 0
+
+    def cursor(self):
+        return self._cursor
+
+    def commit(self):
+        self.commits += 1
+
+
+class FakePool:
+    """A plain stand-in for ThreadedConnectionPool that always lends the same FakeConn."""
+    __slots__ = ("conn", "getconn_count", "returned")
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.getconn_count = 0
+        self.returned = []
+
+    def getconn(self):
+        self.getconn_count += 1
+        return self.conn
+
+    def putconn(self, conn):
+        self.returned.append(conn)
+
+
+# Shared by the error-path tests; the client only logs it, so one instance serves every raise.
+_DB_ERROR = psycopg2.Error("Test DB Error")
+
+# Statements a fresh schema initialization must run, matched by substring against the executed SQL.
+SCHEMA_STATEMENT_FRAGMENTS = frozenset({
+    "CREATE TABLE IF NOT EXISTS cities",
+    "CREATE TABLE IF NOT EXISTS user_preferences",
+    "CREATE TABLE IF NOT EXISTS airports",
+    "CREATE INDEX IF NOT EXISTS",
+    "INSERT INTO cities",
+})
+
+
+@pytest.fixture
+def mock_pool():
+    """A fixture that provides a fake database connection pool, connection, and cursor."""
+    cursor = FakeCursor()
+    conn = FakeConn(cursor)
+    return FakePool(conn), conn, cursor
+
+
+@pytest.fixture
+def execute_values_calls(monkeypatch):
+    """Replaces psycopg2's execute_values in the DB client with a stub that records its positional arguments."""
+    calls = []
+    monkeypatch.setattr(db_client, "execute_values", lambda *args, **kwargs: calls.append(args))
+    return calls
 
 
 @pytest.fixture
-def mock_pool(mocker):
-    """A fixture that provides a mocked database connection pool, connection, and cursor."""
-    pool = mocker.MagicMock()
-    conn = mocker.MagicMock()
-    cursor = mocker.MagicMock()
-    pool.getconn.return_value = conn
-    conn.cursor.return_value.__enter__.return_value = cursor
-    return pool, conn, cursor
+def client(mock_pool):
+    """A DatabaseClient borrowing connections from the test's fake pool."""
+    return DatabaseClient(mock_pool[0])
 
 
-def test_initialize_schema_success(mock_pool, mocker):
+def test_initialize_schema_success(mock_pool, client, execute_values_calls):
     """Tests successful schema initialization."""
     pool, conn, cursor = mock_pool
-    client = DatabaseClient(pool)
+    cursor.fetchone_result = (None,)  # Simulate a fresh database
+
+    client.initialize_schema()
+
+    assert len(cursor.calls) == 7
+    seen = {fragment for sql, _ in cursor.calls for fragment in SCHEMA_STATEMENT_FRAGMENTS if fragment in sql}
+    assert seen == SCHEMA_STATEMENT_FRAGMENTS
+    assert len(execute_values_calls) == 1
+    assert "JOIN cities" in execute_values_calls[0][1]
+    assert conn.commits == 1
+    assert pool.returned == [conn]
+
+
+def test_initialize_schema_skips_existing_schema(mock_pool, client, execute_values_calls):
+    """Tests that an already-initialized, up-to-date database is not re-seeded or migrated."""
+    pool, conn, cursor = mock_pool
+    cursor.fetchone_result = [("airports",), ("citext",)]
+
+    client.initialize_schema()
+
+    assert len(cursor.calls) == 2
+    assert cursor.calls[0] == ("SELECT to_regclass('airports');", None)
+    assert not any("ALTER TABLE" in sql for sql, _ in cursor.calls)
+    assert execute_values_calls == []
+    assert conn.commits == 0
+    assert pool.returned == [conn]
+
+
+def test_initialize_schema_migrates_city_names_to_citext(mock_pool, client, execute_values_calls):
+    """Tests that an existing database with a VARCHAR cities.name is converted to CITEXT in place."""
+    pool, conn, cursor = mock_pool
+    cursor.fetchone_result = [("airports",), ("varchar",)]
 
     client.initialize_schema()
 
-    assert cursor.execute.call_count == 7
-    cursor.execute.assert_any_call(mocker.string_matching("CREATE TABLE IF NOT EXISTS cities"))
-    cursor.execute.assert_any_call(mocker.string_matching("CREATE TABLE IF NOT EXISTS user_preferences"))
-    cursor.execute.assert_any_call(mocker.string_matching("CREATE TABLE IF NOT EXISTS airports"))
-    cursor.execute.assert_any_call(mocker.string_matching("CREATE INDEX IF NOT EXISTS"))
-    cursor.execute.assert_any_call(mocker.string_matching("INSERT INTO cities"))
-    cursor.execute.assert_any_call(mocker.string_matching("INSERT INTO airports ON CONFLICT"))
-    conn.commit.assert_called_once()
-    pool.putconn.assert_called_once_with(conn)
+    executed = [sql for sql, _ in cursor.calls]
+    assert "CREATE EXTENSION IF NOT EXISTS citext;" in executed
+    assert "ALTER TABLE cities ALTER COLUMN name TYPE CITEXT;" in executed
+    assert "DROP INDEX IF EXISTS idx_cities_name_lower;" in executed
+    assert execute_values_calls == []
+    assert conn.commits == 1
+    assert pool.returned == [conn]
 
 
-def test_initialize_schema_db_error(mock_pool):
+def test_initialize_schema_db_error(mock_pool, client):
     """Tests schema initialization when a database error occurs."""
     pool, conn, cursor = mock_pool
-    cursor.execute.side_effect = psycopg2.Error("Test DB Error")
-    client = DatabaseClient(pool)
+    cursor.side_effect = _DB_ERROR
 
     client.initialize_schema()
 
-    conn.commit.assert_not_called()
-    pool.putconn.assert_called_once_with(conn)
+    assert conn.commits == 0
+    assert pool.returned == [conn]
 
 
-def test_store_user_preference_success(mock_pool, mocker):
-    """Tests storing a user preference successfully."""
+@pytest.mark.parametrize("side_effect, expected, expected_commits", [
+    (None, "window", 2),  # Once for the first-use PREPARE, once for the upsert
+    (_DB_ERROR, None, 0),
+], ids=["success", "db_error"])
+def test_store_user_preference(mock_pool, client, side_effect, expected, expected_commits):
+    """Tests storing a user preference, which yields None and commits nothing on a database error."""
     pool, conn, cursor = mock_pool
-    client = DatabaseClient(pool)
+    cursor.fetchone_result = ("window",)
+    cursor.side_effect = side_effect
 
     result = client.store_user_preference("test_user", "seat_preference", "window")
 
-    assert result is True
-    cursor.execute.assert_called_once_with(
-        mocker.string_matching("INSERT INTO user_preferences .* ON CONFLICT"),
-        ("test_user", "seat_preference", "window")
+    assert result == expected
+    if side_effect is None:
+        assert cursor.calls[-1] == (
+            "EXECUTE store_pref (%s, %s, %s);",
+            ("test_user", "seat_preference", "window")
+        )
+    assert conn.commits == expected_commits
+    assert pool.returned == [conn]
+
+
+@pytest.mark.parametrize("rows, expected", [
+    ([("seat_preference", "window")], "window"),
+    ([], None),
+], ids=["found", "not_found"])
+def test_get_user_preference(mock_pool, client, rows, expected):
+    """Tests getting a user preference, which is None when it has not been stored."""
+    pool, conn, cursor = mock_pool
+    cursor.fetchall_result = rows
+
+    result = client.get_user_preference("test_user", "seat_preference")
+
+    assert result == expected
+    assert cursor.calls[-1] == (
+        "EXECUTE get_prefs (%s, %s);",
+        ("test_user", ["seat_preference"])
     )
-    conn.commit.assert_called_once()
-    pool.putconn.assert_called_once_with(conn)
+    assert pool.returned == [conn]
 
 
-def test_store_user_preference_db_error(mock_pool):
-    """Tests storing a user preference when a database error occurs."""
+def test_get_user_preferences_batches_keys(mock_pool, client):
+    """Tests that several preferences are read with a single query."""
     pool, conn, cursor = mock_pool
-    cursor.execute.side_effect = psycopg2.Error("Test DB Error")
-    client = DatabaseClient(pool)
+    cursor.fetchall_result = [("seat_preference", "aisle"), ("preferred_airline", "TestAir")]
 
-    result = client.store_user_preference("test_user", "seat_preference", "window")
+    result = client.get_user_preferences("test_user", ["seat_preference", "preferred_airline", "meal"])
 
-    assert result is False
-    conn.commit.assert_not_called()
-    pool.putconn.assert_called_once_with(conn)
+    assert result == {"seat_preference": "aisle", "preferred_airline": "TestAir"}
+    assert cursor.calls[-1] == (
+        "EXECUTE get_prefs (%s, %s);",
+        ("test_user", ["seat_preference", "preferred_airline", "meal"])
+    )
+    assert pool.returned == [conn]
 
 
-def test_get_user_preference_found(mock_pool):
-    """Tests getting a user preference when it exists."""
+def test_statements_prepared_once_per_connection(mock_pool, client):
+    """Tests that a hot-path statement is prepared on its first use on a connection only."""
     pool, conn, cursor = mock_pool
-    cursor.fetchone.return_value = ("window",)
-    client = DatabaseClient(pool)
+    cursor.fetchall_result = []
 
-    result = client.get_user_preference("test_user", "seat_preference")
+    client.get_user_preferences("test_user", ["seat_preference"])
+    client.get_user_preferences("test_user", ["seat_preference"])
 
-    assert result == "window"
-    cursor.execute.assert_called_once_with(
-        "SELECT preference_value FROM user_preferences WHERE user_id = %s AND preference_key = %s",
-        ("test_user", "seat_preference")
-    )
-    pool.putconn.assert_called_once_with(conn)
+    prepare_calls = [sql for sql, _ in cursor.calls if sql.lstrip().startswith("PREPARE")]
+    assert prepare_calls == [PREPARED_STATEMENTS["get_prefs"]]
+    assert len(cursor.calls) == 3
+    assert conn.commits == 1
 
 
-def test_get_user_preference_not_found(mock_pool):
-    """Tests getting a user preference when it does not exist."""
+def test_failed_prepare_only_affects_its_statement(mock_pool, client):
+    """Tests that a statement that fails to prepare leaves the other prepared statements usable."""
     pool, conn, cursor = mock_pool
-    cursor.fetchone.return_value = None
-    client = DatabaseClient(pool)
+    cursor.side_effect = [_DB_ERROR, None, None]
+    cursor.fetchall_result = [("seat_preference", "aisle")]
 
-    result = client.get_user_preference("test_user", "seat_preference")
+    airports = client.get_airports_for_city("London")
+    preferences = client.get_user_preferences("test_user", ["seat_preference"])
+
+    assert airports == []
+    assert preferences == {"seat_preference": "aisle"}
+    assert cursor.calls[0] == (PREPARED_STATEMENTS["airports_for_city"], None)
+    assert cursor.calls[1] == (PREPARED_STATEMENTS["get_prefs"], None)
 
-    assert result is None
-    pool.putconn.assert_called_once_with(conn)
 
-def test_delete_user_preference_success(mock_pool, mocker):
-    """Tests deleting a user preference successfully."""
+def test_get_user_preferences_db_error(mock_pool, client):
+    """Tests that a database error while reading preferences yields an empty mapping."""
     pool, conn, cursor = mock_pool
-    cursor.rowcount = 1  # Simulate one row was deleted
-    client = DatabaseClient(pool)
+    cursor.side_effect = _DB_ERROR
+
+    result = client.get_user_preferences("test_user", ["seat_preference"])
+
+    assert result == {}
+    assert pool.returned == [conn]
+
+@pytest.mark.parametrize("rowcount, side_effect, expected, expected_commits", [
+    (1, None, True, 1),
+    (0, None, False, 1),  # No stored preference, e.g. the user does not exist
+    (1, _DB_ERROR, False, 0),
+], ids=["success", "not_found", "db_error"])
+def test_delete_user_preference(mock_pool, client, rowcount, side_effect, expected, expected_commits):
+    """Tests deleting a user preference, which only reports success when a row was deleted."""
+    pool, conn, cursor = mock_pool
+    cursor.rowcount = rowcount
+    cursor.side_effect = side_effect
 
     result = client.delete_user_preference("test_user", "seat_preference")
 
-    assert result is True
-    cursor.execute.assert_called_once_with(
+    assert result is expected
+    assert cursor.calls == [(
         "DELETE FROM user_preferences WHERE user_id = %s AND preference_key = %s",
         ("test_user", "seat_preference")
-    )
-    conn.commit.assert_called_once()
-    pool.putconn.assert_called_once_with(conn)
+    )]
+    assert conn.commits == expected_commits
+    assert pool.returned == [conn]
 
 
-def test_delete_user_preference_user_not_found(mock_pool, mocker):
-    """Tests deleting a preference for a user that does not exist."""
+def test_get_airports_for_city(mock_pool, client):
+    """Tests that airports are looked up by plain equality on the citext city name."""
     pool, conn, cursor = mock_pool
-    cursor.rowcount = 0  # Simulate no rows were deleted
-    client = DatabaseClient(pool)
+    cursor.fetchall_result = [("Heathrow Airport", "LHR"), ("Gatwick Airport", "LGW")]
 
-    result = client.delete_user_preference("non_existent_user", "seat_preference")
+    result = client.get_airports_for_city("london")
 
-    assert result is False
-    conn.commit.assert_called_once()
+    assert result == [{"name": "Heathrow Airport", "iata": "LHR"}, {"name": "Gatwick Airport", "iata": "LGW"}]
+    assert cursor.calls[-1] == ("EXECUTE airports_for_city (%s);", ("london",))
+    assert "WHERE c.name = $1::citext" in PREPARED_STATEMENTS["airports_for_city"]
+    assert "LOWER" not in PREPARED_STATEMENTS["airports_for_city"]
+    assert pool.returned == [conn]
 
 
-def test_delete_user_preference_db_error(mock_pool):
-    """Tests deleting a user preference when a database error occurs."""
+def test_get_airports_for_city_uses_cache(mock_pool, client):
+    """Tests that repeated airport lookups for a city are served from the in-process cache."""
     pool, conn, cursor = mock_pool
-    cursor.execute.side_effect = psycopg2.Error("Test DB Error")
-    client = DatabaseClient(pool)
+    cursor.fetchall_result = [("Heathrow Airport", "LHR")]
 
-    result = client.delete_user_preference("test_user", "seat_preference")
+    first = client.get_airports_for_city("London")
+    second = client.get_airports_for_city("LONDON")
+
+    assert first == second == [{"name": "Heathrow Airport", "iata": "LHR"}]
+    assert len(cursor.calls) == 2
+    assert pool.getconn_count == 1
+
+
+def test_get_all_city_names_uses_cache(mock_pool, client):
+    """Tests that the city list is fetched once and reused until the cache is cleared."""
+    pool, conn, cursor = mock_pool
+    cursor.fetchall_result = [("London",), ("Paris",)]
+
+    assert client.get_all_city_names() == ["London", "Paris"]
+    assert client.get_all_city_names() == ["London", "Paris"]
+    assert cursor.calls == [("SELECT name FROM cities;", None)]
+
+    client.clear_location_caches()
+    client.get_all_city_names()
+
+    assert len(cursor.calls) == 2
+
+
+def test_get_all_city_names_db_error_not_cached(mock_pool, client):
+    """Tests that a failed city lookup is not cached."""
+    pool, conn, cursor = mock_pool
+    cursor.side_effect = [_DB_ERROR, None]
+    cursor.fetchall_result = [("London",)]
+
+    assert client.get_all_city_names() == []
+    assert client.get_all_city_names() == ["London"]
+
+
+def test_prewarm_airports_serves_lookups_from_memory(mock_pool, client):
+    """Tests that prewarmed airports are returned without another database round trip."""
+    pool, conn, cursor = mock_pool
+    cursor.fetchall_result = [
+        ("London", "Heathrow Airport", "LHR"),
+        ("London", "Gatwick Airport", "LGW"),
+        ("Paris", "Charles de Gaulle Airport", "CDG"),
+    ]
+
+    assert client.prewarm_airports() is True
+    london = client.get_airports_for_city("LONDON")
+    paris = client.get_airports_for_city("paris")
+
+    assert london == [{"name": "Heathrow Airport", "iata": "LHR"}, {"name": "Gatwick Airport", "iata": "LGW"}]
+    assert paris == [{"name": "Charles de Gaulle Airport", "iata": "CDG"}]
+    assert len(cursor.calls) == 1
+    assert pool.getconn_count == 1
+
+
+def test_prewarmed_airports_expire_with_the_location_ttl(mock_pool, client):
+    """Tests that prewarmed airports are looked up again once LOCATION_CACHE_TTL_SECONDS has passed."""
+    pool, conn, cursor = mock_pool
+    now = [0.0]
+    client._airports_cache = TTLCache(maxsize=256, ttl=LOCATION_CACHE_TTL_SECONDS, timer=lambda: now[0])
+    cursor.fetchall_result = [("London", "Heathrow Airport", "LHR")]
+    client.prewarm_airports()
+
+    now[0] = LOCATION_CACHE_TTL_SECONDS + 1
+    cursor.fetchall_result = [("Heathrow Airport", "LHR"), ("Gatwick Airport", "LGW")]
+    london = client.get_airports_for_city("London")
+
+    assert london == [{"name": "Heathrow Airport", "iata": "LHR"}, {"name": "Gatwick Airport", "iata": "LGW"}]
+    assert cursor.calls[-1] == ("EXECUTE airports_for_city (%s);", ("London",))
+
+
+def test_prewarm_airports_db_error(mock_pool, client):
+    """Tests that a failed prewarm leaves lookups falling back to the database."""
+    pool, conn, cursor = mock_pool
+    cursor.side_effect = _DB_ERROR
 
-    assert result is False
-    conn.commit.assert_not_called()
\ No newline at end of file
+    assert client.prewarm_airports() is False
+    assert pool.returned == [conn]